@@ -0,0 +1,138 @@
+"""
+Serialization benchmark - FastAPI's response_model path vs. fast_response().
+
+Serializes lists of TaskResponse / ProjectResponse models the way a list
+route does, with no database involved, and prints the time per response.
+
+Usage (from the backend directory):
+    python benchmarks/serialization_benchmark.py [--rows 100 1000 5000] [--repeat 20]
+"""
+from pathlib import Path
+from datetime import datetime, timedelta
+from typing import List
+import argparse
+import asyncio
+import json
+import sys
+import time
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from schemas.task import TaskResponse, TaskAssigneeResponse
+from schemas.project import ProjectResponse
+from serialization import fast_response
+
+
+def make_tasks(count: int) -> List[TaskResponse]:
+    now = datetime(2024, 1, 1, 9, 30)
+    return [
+        TaskResponse(
+            id=i,
+            title=f"Task {i}: implement the thing",
+            description="Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 4,
+            project_id=1,
+            project_name="Website relaunch",
+            sprint_id=3,
+            sprint_name="Sprint 3",
+            status_key="in-progress",
+            status_name="In Progress",
+            priority_key="high",
+            priority_name="High",
+            task_type_key="backend",
+            task_type_name="Backend",
+            assignee_id=7,
+            assignees=[
+                TaskAssigneeResponse(id=i * 2 + n, user_id=7 + n, user_name="Ada Lovelace",
+                                     user_email="ada@example.com", assigned_at=now)
+                for n in range(2)
+            ],
+            links_count=1,
+            comments_count=4,
+            due_date=now + timedelta(days=i % 30),
+            estimated_hours=6.5,
+            actual_hours=2.0,
+            progress_percentage=40,
+            created_by=7,
+            creator_name="Ada Lovelace",
+            created_at=now,
+            updated_at=now,
+        )
+        for i in range(count)
+    ]
+
+
+def make_projects(count: int) -> List[ProjectResponse]:
+    now = datetime(2024, 1, 1, 9, 30)
+    return [
+        ProjectResponse(
+            id=i,
+            name=f"Project {i}",
+            description="Relaunch of the public website. " * 3,
+            company_id=1,
+            company_name="Acme",
+            project_manager_id=7,
+            project_manager_name="Ada Lovelace",
+            status_key="active",
+            status_name="Active",
+            start_date="2024-01-01",
+            end_date="2024-06-30",
+            budget=125000.0,
+            tasks_count=42,
+            sprints_count=6,
+            members_count=5,
+            created_at=now,
+            updated_at=now,
+        )
+        for i in range(count)
+    ]
+
+
+def response_model_path(items, response_type) -> bytes:
+    """What FastAPI does for `return items` with response_model=response_type"""
+    field = create_response_field(name="response", type_=response_type)
+    content = asyncio.run(serialize_response(field=field, response_content=items, is_coroutine=False))
+    return JSONResponse(content).body
+
+
+def fast_path(items, response_type) -> bytes:
+    return fast_response(items, response_type).body
+
+
+def timed(function, items, response_type, repeat: int) -> float:
+    function(items, response_type)  # Warm up (adapter compilation, imports)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function(items, response_type)
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark list response serialization")
+    parser.add_argument("--rows", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    print(f"{'payload':<28}{'response_model':>16}{'fast_response':>16}{'speedup':>10}")
+    for name, factory, response_type in (
+        ("TaskResponse", make_tasks, List[TaskResponse]),
+        ("ProjectResponse", make_projects, List[ProjectResponse]),
+    ):
+        for rows in args.rows:
+            items = factory(rows)
+            if json.loads(response_model_path(items, response_type)) != json.loads(fast_path(items, response_type)):
+                print(f"{name} x{rows}: outputs differ")
+                return 1
+            before = timed(response_model_path, items, response_type, args.repeat)
+            after = timed(fast_path, items, response_type, args.repeat)
+            print(f"{f'{name} x{rows}':<28}{before:>13.2f} ms{after:>13.2f} ms{before / after:>9.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
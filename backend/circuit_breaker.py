@@ -0,0 +1,104 @@
+"""
+Circuit breaker for the database connection.
+
+While MySQL is unreachable every new connection blocks for the connect
+timeout before failing. After `failure_threshold` consecutive failed
+connects the breaker opens: further attempts fail at once with 503 +
+Retry-After. Once the open period is over, a single probe connect is let
+through (half-open); success closes the breaker, failure opens it again for
+twice as long, up to `max_delay` seconds (with jitter, so workers do not
+probe in lockstep).
+"""
+from typing import Optional, Dict, Any
+from datetime import datetime
+from fastapi import HTTPException, status
+import logging
+import math
+import random
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(HTTPException):
+    """Raised instead of connecting while the breaker is open"""
+
+    def __init__(self, name: str, retry_after: float):
+        seconds = max(1, math.ceil(retry_after))
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"{name.capitalize()} is unavailable, please retry in {seconds}s",
+            headers={"Retry-After": str(seconds)}
+        )
+
+
+class CircuitBreaker:
+    """Closed / open / half-open breaker with exponential backoff"""
+
+    CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half_open'
+
+    def __init__(self, name: str, failure_threshold: int = 2, base_delay: float = 1.0, max_delay: float = 30.0):
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Back to closed (also used in a freshly forked worker)"""
+        self._lock = threading.Lock()  # May have been held by another thread at fork time
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened = 0  # Consecutive openings, drives the backoff
+        self.open_until = 0.0
+        self.last_error: Optional[str] = None
+        self.last_failure_at: Optional[datetime] = None
+
+    def retry_after(self) -> float:
+        return max(0.0, self.open_until - time.monotonic())
+
+    def before_call(self) -> None:
+        """Raise CircuitOpenError unless a call may go through now"""
+        if self.state == self.CLOSED:
+            return
+        with self._lock:
+            if self.state == self.OPEN and time.monotonic() >= self.open_until:
+                self.state = self.HALF_OPEN  # This caller is the probe
+                logger.info(f"{self.name} circuit half-open, probing")
+                return
+            if self.state != self.CLOSED:
+                raise CircuitOpenError(self.name, self.retry_after() or self.base_delay)
+
+    def record_success(self) -> None:
+        if self.state == self.CLOSED and not self.failures:
+            return
+        with self._lock:
+            if self.state != self.CLOSED:
+                logger.info(f"✅ {self.name} circuit closed")
+            self.state = self.CLOSED
+            self.failures = 0
+            self.opened = 0
+
+    def record_failure(self, error: BaseException) -> None:
+        with self._lock:
+            self.failures += 1
+            self.last_error = str(error)
+            self.last_failure_at = datetime.utcnow()
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                delay = min(self.max_delay, self.base_delay * 2 ** self.opened)
+                delay *= random.uniform(0.8, 1.2)
+                self.opened += 1
+                self.state = self.OPEN
+                self.open_until = time.monotonic() + delay
+                logger.warning(f"⚠️  {self.name} circuit open for {delay:.1f}s after {self.failures} failure(s): {error}")
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            'state': self.state,
+            'consecutive_failures': self.failures,
+            'retry_after_seconds': round(self.retry_after(), 1) if self.state == self.OPEN else 0,
+            'last_error': self.last_error,
+            'last_failure_at': self.last_failure_at.isoformat() if self.last_failure_at else None,
+        }
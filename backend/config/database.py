@@ -37,6 +37,7 @@ class DatabaseSettings(BaseSettings):
     mysql_max_overflow: int = Field(default=10, description="Max overflow connections")
     mysql_pool_timeout: int = Field(default=30, description="Connection pool timeout (seconds)")
     mysql_pool_recycle: int = Field(default=3600, description="Connection recycle time (seconds)")
+    mysql_connect_timeout: int = Field(default=10, description="Timeout for opening a connection (seconds)")
     
     # SSL Settings (for MySQL Enterprise Edition)
     mysql_ssl_ca: Optional[str] = Field(default=None, description="SSL CA certificate path")
@@ -0,0 +1,328 @@
+"""
+Connection Pool Manager - prewarming, background health checks and adaptive
+sizing of the SQLAlchemy connection pool.
+
+The engine uses AdaptiveQueuePool: a QueuePool (LIFO, with pre-ping) that
+times every checkout that has to wait for a connection and can be resized
+while running. PoolManager owns a background thread that
+
+- keeps PREWARM connections open and pings them every HEALTH_CHECK_INTERVAL
+  seconds, so idle periods and MySQL failovers are noticed (and reconnected)
+  before a request runs into them;
+- every ADJUST_INTERVAL seconds grows the pool by GROW_STEP when checkouts
+  timed out or the p95 wait exceeded WAIT_TARGET_MS, and shrinks it by one
+  when the peak number of checked-out connections stayed well below the
+  size, always within [MIN_SIZE, MAX_SIZE].
+
+With LIFO reuse the busy connections stay at the top of the stack; the ones
+at the bottom sit idle until pool_recycle retires them, so shrinking (and
+MySQL's wait_timeout) cost nothing. The state is served at /health/pool.
+"""
+from sqlalchemy import exc
+from sqlalchemy.pool import QueuePool
+from sqlalchemy.util import queue as sqla_queue
+from concurrent.futures import ThreadPoolExecutor
+from collections import deque
+from datetime import datetime
+from typing import Optional, Dict, Any, List
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class PoolStats:
+    """Checkout counters (lifetime) and wait times of the current adjustment window"""
+
+    def __init__(self, window_size: int = 1000):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.waits = 0
+        self.timeouts = 0
+        self._window_waits: "deque[float]" = deque(maxlen=window_size)
+        self._window_timeouts = 0
+        self._window_checkouts = 0
+        self._window_peak = 0
+
+    def record_checkout(self, checked_out: int, waited: Optional[float]) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self._window_checkouts += 1
+            self._window_peak = max(self._window_peak, checked_out)
+            if waited is not None:
+                self.waits += 1
+                self._window_waits.append(waited)
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+            self._window_timeouts += 1
+
+    def take_window(self) -> Dict[str, Any]:
+        """Summary of the window since the last call, which starts a new one"""
+        with self._lock:
+            waits = sorted(self._window_waits)
+            window = {
+                'checkouts': self._window_checkouts,
+                'waits': len(waits),
+                'timeouts': self._window_timeouts,
+                'peak_checked_out': self._window_peak,
+                'wait_p95_ms': round(waits[min(len(waits) - 1, int(len(waits) * 0.95))] * 1000, 1) if waits else 0.0,
+            }
+            self._window_waits.clear()
+            self._window_timeouts = 0
+            self._window_checkouts = 0
+            self._window_peak = 0
+            return window
+
+
+class AdaptiveQueuePool(QueuePool):
+    """QueuePool that measures checkout waits and can be resized in place"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def _do_get(self):
+        # Waiting only happens when nothing is idle and the overflow is used up
+        must_wait = self._pool.empty() and self._max_overflow > -1 and self._overflow >= self._max_overflow
+        started = time.perf_counter()
+        try:
+            record = super()._do_get()
+        except exc.TimeoutError:
+            self.stats.record_timeout()
+            raise
+        self.stats.record_checkout(self.checkedout(), time.perf_counter() - started if must_wait else None)
+        return record
+
+    def recreate(self):
+        # engine.dispose() swaps in a fresh pool (same size); keep the counters
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+    def resize(self, size: int) -> None:
+        """
+        Change the number of connections kept open. The overflow allowance
+        stays the same; shrinking closes idle connections above the new size
+        (busy ones are closed when they are returned).
+        """
+        size = max(1, size)  # A queue maxsize of 0 would mean unbounded
+        with self._overflow_lock:
+            delta = size - self._pool.maxsize
+            self._pool.maxsize = size
+            self._overflow -= delta
+        while self._pool.qsize() > size:
+            try:
+                record = self._pool.get(False)
+            except sqla_queue.Empty:
+                break
+            record.close()
+            self._dec_overflow()
+
+
+class PoolManager:
+    """Prewarms the engine's pool, health-checks it and adapts its size"""
+
+    # Configuration (overridable through the environment)
+    PREWARM = int(os.getenv("DB_POOL_PREWARM", "4"))
+    MIN_SIZE = int(os.getenv("DB_POOL_MIN_SIZE", "2"))
+    MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", "20"))
+    HEALTH_CHECK_INTERVAL = float(os.getenv("DB_POOL_HEALTH_CHECK_INTERVAL", "15"))
+    ADJUST_INTERVAL = float(os.getenv("DB_POOL_ADJUST_INTERVAL", "30"))
+    WAIT_TARGET_MS = float(os.getenv("DB_POOL_WAIT_TARGET_MS", "20"))
+    GROW_STEP = int(os.getenv("DB_POOL_GROW_STEP", "2"))
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.healthy: Optional[bool] = None
+        self.last_error: Optional[str] = None
+        self.last_health_check: Optional[datetime] = None
+        self.last_window: Optional[Dict[str, Any]] = None
+        self.resizes: "deque[Dict[str, Any]]" = deque(maxlen=10)
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+
+    @property
+    def adaptive(self) -> bool:
+        return isinstance(self.engine.pool, AdaptiveQueuePool)
+
+    @classmethod
+    def bounds(cls) -> tuple:
+        """(minimum, maximum) pool size"""
+        minimum = max(1, cls.MIN_SIZE)
+        return minimum, max(minimum, cls.MAX_SIZE)
+
+    # ---- Lifecycle -----------------------------------------------------
+
+    def start(self) -> None:
+        """Start the monitor thread (again after a fork, where threads do not survive)"""
+        if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+                return
+            self._stop_event.clear()
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name="db-pool-monitor", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        thread = self._thread
+        if thread is None or self._pid != os.getpid():
+            return
+        self._stop_event.set()
+        thread.join(timeout)
+        self._thread = None
+
+    def _run(self) -> None:
+        next_adjust = time.monotonic() + self.ADJUST_INTERVAL
+        while not self._stop_event.wait(min(self.HEALTH_CHECK_INTERVAL, max(0.0, next_adjust - time.monotonic()))):
+            try:
+                if time.monotonic() >= next_adjust:
+                    next_adjust = time.monotonic() + self.ADJUST_INTERVAL
+                    self.adjust()
+                self.health_check()
+            except Exception as e:
+                logger.error(f"Connection pool monitor failed: {e}")
+
+    # ---- Prewarming and health checks ----------------------------------
+
+    def _checkout(self, count: int) -> List[Any]:
+        """Check out `count` connections concurrently; raises if none could be"""
+        if count <= 0:
+            return []
+
+        def _open(_):
+            try:
+                return self.engine.raw_connection()
+            except Exception as e:
+                return e
+
+        with ThreadPoolExecutor(max_workers=count, thread_name_prefix="db-pool") as executor:
+            results = list(executor.map(_open, range(count)))
+        opened = [result for result in results if not isinstance(result, Exception)]
+        for connection in opened:
+            connection.close()  # Back to the pool
+        if not opened:
+            raise results[0]
+        return opened
+
+    def prewarm(self, connections: Optional[int] = None) -> int:
+        """
+        Open up to `connections` (PREWARM) pool connections concurrently so the
+        first requests do not pay for the handshakes. Returns the number opened.
+        """
+        pool = self.engine.pool
+        connections = self.PREWARM if connections is None else connections
+        count = max(1, min(connections, pool.size())) if hasattr(pool, "size") else max(1, connections)
+        opened = len(self._checkout(count))
+        self._set_health(True)
+        logger.info(f"✅ Database pool prewarmed with {opened} connection(s)")
+        return opened
+
+    def health_check(self) -> None:
+        """
+        Ping the idle connections of the warm set (pre-ping on checkout) and
+        reopen missing ones. Busy connections need no check; skipped when the
+        pool is fully in use.
+        """
+        pool = self.engine.pool
+        if not hasattr(pool, "checkedin"):
+            count = 1
+        else:
+            target = max(1, min(self.PREWARM, pool.size()))
+            idle = pool.checkedin()
+            count = min(target, idle) + max(0, target - idle - pool.checkedout())
+            if count == 0:
+                self.last_health_check = datetime.utcnow()
+                return
+        try:
+            self._checkout(count)
+            self._set_health(True)
+        except Exception as e:
+            self._set_health(False, e)
+
+    def _set_health(self, healthy: bool, error: Optional[Exception] = None) -> None:
+        if healthy and self.healthy is False:
+            logger.info("✅ Database connections healthy again")
+        elif not healthy and self.healthy is not False:
+            logger.warning(f"⚠️  Database health check failed: {error}")
+        self.healthy = healthy
+        self.last_error = None if healthy else str(error)
+        self.last_health_check = datetime.utcnow()
+
+    # ---- Adaptive sizing -----------------------------------------------
+
+    def adjust(self) -> Optional[int]:
+        """Resize the pool from the last window's waits; returns the new size if changed"""
+        if not self.adaptive:
+            return None
+        pool = self.engine.pool
+        window = pool.stats.take_window()
+        self.last_window = window
+        size = pool.size()
+        minimum, maximum = self.bounds()
+
+        if window['timeouts'] or window['wait_p95_ms'] > self.WAIT_TARGET_MS:
+            new_size, reason = size + self.GROW_STEP, f"p95 wait {window['wait_p95_ms']}ms, {window['timeouts']} timeout(s)"
+        elif not window['waits'] and window['peak_checked_out'] < size // 2:
+            new_size, reason = size - 1, f"peak {window['peak_checked_out']} of {size} in use"
+        else:
+            new_size, reason = size, None
+        new_size = min(maximum, max(minimum, new_size))
+
+        if new_size == size:
+            return None
+        pool.resize(new_size)
+        self.resizes.append({'at': datetime.utcnow().isoformat(), 'from': size, 'to': new_size, 'reason': reason})
+        logger.info(f"Database pool resized {size} -> {new_size} ({reason})")
+        return new_size
+
+    def saturated(self) -> bool:
+        """Every connection, overflow included, is checked out (new checkouts would wait)"""
+        pool = self.engine.pool
+        if not hasattr(pool, "checkedin"):
+            return False
+        return pool.checkedin() == 0 and pool._max_overflow > -1 and pool.overflow() >= pool._max_overflow
+
+    # ---- Monitoring ----------------------------------------------------
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Pool state for monitoring (/health/pool)"""
+        pool = self.engine.pool
+        state: Dict[str, Any] = {
+            'pool_class': type(pool).__name__,
+            'healthy': self.healthy,
+            'last_error': self.last_error,
+            'last_health_check': self.last_health_check.isoformat() if self.last_health_check else None,
+            'monitor_running': self._thread is not None and self._thread.is_alive() and self._pid == os.getpid(),
+        }
+        if hasattr(pool, "checkedin"):
+            state.update({
+                'size': pool.size(),
+                'max_overflow': pool._max_overflow,
+                'checked_in': pool.checkedin(),
+                'checked_out': pool.checkedout(),
+                'overflow': pool.overflow(),
+                'timeout_seconds': pool.timeout(),
+                'recycle_seconds': pool._recycle,
+                'pre_ping': pool._pre_ping,
+                'lifo': pool._pool.use_lifo,
+            })
+        if self.adaptive:
+            minimum, maximum = self.bounds()
+            state.update({
+                'min_size': minimum,
+                'max_size': maximum,
+                'checkouts': pool.stats.checkouts,
+                'waits': pool.stats.waits,
+                'timeouts': pool.stats.timeouts,
+                'last_window': self.last_window,
+                'resizes': list(self.resizes),
+            })
+        return state
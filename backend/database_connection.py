@@ -1,13 +1,24 @@
 """
 Database Connection Module
 Handles actual MySQL database connections using SQLAlchemy.
+
+Engine lifecycle: the engine is created once, sessions are bound to it on
+first use in each process (ensure_engine), a forked worker drops the pooled
+connections it inherited without closing them (they belong to the parent),
+and dispose_engine() closes the pool on shutdown. New connections go through
+a circuit breaker, so while MySQL is down requests fail fast with 503 instead
+of each waiting for the connect timeout. Statements run under the request's
+deadline (see deadlines.py).
 """
 
-from sqlalchemy import create_engine, event
+from sqlalchemy import create_engine, event, exc
 from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy.pool import QueuePool
 from config.database import db_settings, get_mysql_connection_string
+from connection_pool import AdaptiveQueuePool, PoolManager
+from circuit_breaker import CircuitBreaker
+from deadlines import attach_deadline_events
 import logging
+import os
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -16,11 +27,50 @@ logger = logging.getLogger(__name__)
 # Create database engine
 # This will connect to MySQL when first used
 engine = None
+pool_manager = None
+_process_pid = None  # Process whose sessions are bound and whose pool monitor runs
+
+# Fails connects fast after repeated failures, backing off exponentially
+breaker = CircuitBreaker(
+    "database",
+    failure_threshold=int(os.getenv("DB_CIRCUIT_FAILURE_THRESHOLD", "2")),
+    base_delay=float(os.getenv("DB_CIRCUIT_BASE_DELAY", "1")),
+    max_delay=float(os.getenv("DB_CIRCUIT_MAX_DELAY", "30"))
+)
+
+
+def attach_lifecycle_events(target_engine) -> None:
+    """Route new connections through the breaker and keep them in their own process"""
+
+    @event.listens_for(target_engine, "do_connect")
+    def _connect_through_breaker(dialect, connection_record, cargs, cparams):
+        breaker.before_call()
+        try:
+            connection = dialect.connect(*cargs, **cparams)
+        except Exception as e:
+            breaker.record_failure(e)
+            raise
+        breaker.record_success()
+        return connection
+
+    @event.listens_for(target_engine, "connect")
+    def _remember_pid(dbapi_connection, connection_record):
+        connection_record.info["pid"] = os.getpid()
 
-def get_engine():
+    @event.listens_for(target_engine, "checkout")
+    def _check_pid(dbapi_connection, connection_record, connection_proxy):
+        # Safety net for connections inherited across a fork: never share a socket
+        if connection_record.info.get("pid") != os.getpid():
+            connection_record.dbapi_connection = connection_proxy.dbapi_connection = None
+            raise exc.DisconnectionError("Connection belongs to another process")
+
+
+def get_engine(verify: bool = True):
     """
     Get or create the database engine
-    This creates a connection pool to MySQL
+    This creates a connection pool to MySQL (LIFO, pinged on checkout and
+    resized by the PoolManager, see connection_pool.py)
+    With verify=False no connection is opened (see prewarm_pool)
     """
     global engine
     if engine is None:
@@ -30,23 +80,30 @@ def get_engine():
         if db_settings.mysql_ssl_mode == "DISABLED":
             connection_string = connection_string.replace("ssl_disabled=false", "ssl_disabled=true")
         
+        minimum, maximum = PoolManager.bounds()
         try:
             engine = create_engine(
                 connection_string,
-                poolclass=QueuePool,
-                pool_size=db_settings.mysql_pool_size,
+                poolclass=AdaptiveQueuePool,
+                pool_size=min(maximum, max(minimum, db_settings.mysql_pool_size)),
                 max_overflow=db_settings.mysql_max_overflow,
+                pool_pre_ping=True,
+                pool_use_lifo=True,
                 pool_timeout=db_settings.mysql_pool_timeout,
                 pool_recycle=db_settings.mysql_pool_recycle,
                 echo=False,  # Set to True to see SQL queries in logs
-                future=True
+                future=True,
+                connect_args={"connect_timeout": db_settings.mysql_connect_timeout}
             )
+            attach_lifecycle_events(engine)
+            attach_deadline_events(engine)
             
             # Test the connection
-            with engine.connect() as conn:
-                logger.info("✅ Successfully connected to MySQL database")
-                logger.info(f"   Database: {db_settings.mysql_database}")
-                logger.info(f"   Host: {db_settings.mysql_host}:{db_settings.mysql_port}")
+            if verify:
+                with engine.connect() as conn:
+                    logger.info("✅ Successfully connected to MySQL database")
+                    logger.info(f"   Database: {db_settings.mysql_database}")
+                    logger.info(f"   Host: {db_settings.mysql_host}:{db_settings.mysql_port}")
                 
         except Exception as e:
             logger.error(f"❌ Failed to connect to MySQL: {e}")
@@ -64,17 +121,89 @@ SessionLocal = sessionmaker(
 )
 
 
-def init_db():
+def init_db(verify: bool = True):
     """
     Initialize the database connection
     Call this when your app starts
     """
-    engine = get_engine()
+    engine = get_engine(verify=verify)
     SessionLocal.configure(bind=engine)
     logger.info("Database session factory configured")
+    _start_process()
     return engine
 
 
+def _start_process() -> None:
+    global _process_pid
+    get_pool_manager().start()
+    _process_pid = os.getpid()
+
+
+def ensure_engine() -> None:
+    """
+    Make sure this process has its engine: binds the session factory on first
+    use (and first use after a fork) without opening a connection - the first
+    query connects, through the circuit breaker
+    """
+    if _process_pid == os.getpid():
+        return
+    if SessionLocal.kw.get("bind") is None:
+        init_db(verify=False)
+    else:
+        _start_process()
+
+
+def dispose_engine() -> None:
+    """Stop the pool monitor and close every pooled connection (on shutdown)"""
+    global _process_pid
+    if pool_manager is not None:
+        pool_manager.stop()
+    bound = SessionLocal.kw.get("bind")
+    if bound is not None:
+        bound.dispose()
+        logger.info("Database connection pool closed")
+    _process_pid = None
+
+
+def _after_fork_in_child() -> None:
+    """
+    A forked worker must not touch the parent's sockets: forget the inherited
+    pooled connections without closing them and start with a fresh breaker.
+    The pool monitor thread does not survive the fork; ensure_engine restarts it.
+    """
+    global _process_pid
+    _process_pid = None
+    breaker.reset()
+    for inherited in {engine, SessionLocal.kw.get("bind")} - {None}:
+        inherited.dispose(close=False)
+
+
+os.register_at_fork(after_in_child=_after_fork_in_child)
+
+
+def get_pool_manager() -> PoolManager:
+    """
+    The PoolManager of the engine sessions are bound to (created on first use)
+    """
+    global pool_manager
+    bound = SessionLocal.kw.get("bind") or get_engine(verify=False)
+    if pool_manager is None or pool_manager.engine is not bound:
+        if pool_manager is not None:
+            pool_manager.stop()
+        pool_manager = PoolManager(bound)
+    return pool_manager
+
+
+def prewarm_pool(connections: int = None) -> int:
+    """
+    Open up to `connections` (DB_POOL_PREWARM) pooled connections concurrently
+    and start the pool monitor, so the first requests do not pay for the
+    handshakes. Returns the number of connections opened; raises if none could be.
+    """
+    ensure_engine()
+    return get_pool_manager().prewarm(connections)
+
+
 def get_db() -> Session:
     """
     Get a database session
@@ -85,15 +214,7 @@ def get_db() -> Session:
         def get_users(db: Session = Depends(get_db)):
             return db.query(User).all()
     """
-    # Ensure session factory is bound to an engine
-    try:
-        # type: ignore[attr-defined] - SessionLocal may not expose 'kw' in some typings
-        is_bound = getattr(SessionLocal, "kw", {}).get("bind") is not None  # pyright: ignore[reportOptionalMemberAccess]
-    except Exception:
-        is_bound = False
-
-    if not is_bound:
-        init_db()
+    ensure_engine()
 
     db = SessionLocal()
     try:
@@ -107,21 +228,10 @@ def get_db_dependency():
     """
     FastAPI dependency for database sessions
     """
-    # Ensure session factory is bound to an engine
-    try:
-        # type: ignore[attr-defined] - SessionLocal may not expose 'kw' in some typings
-        is_bound = getattr(SessionLocal, "kw", {}).get("bind") is not None  # pyright: ignore[reportOptionalMemberAccess]
-    except Exception:
-        is_bound = False
-
-    if not is_bound:
-        init_db()
+    ensure_engine()
 
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
-
-
-
@@ -0,0 +1,365 @@
+"""
+Index advisor - runs EXPLAIN on the SQL behind each GET route.
+
+Every GET route of the app (plus the filter combinations in
+ADDITIONAL_REQUESTS) is called in-process through FastAPI's TestClient while
+the engine's statements are captured. Each captured SELECT is then EXPLAINed
+on the same database and flagged when MySQL plans a full table scan, a
+filesort or a temporary table over more than --min-rows estimated rows.
+
+Plans depend on table sizes, so run it against a database with realistic
+volumes. --seed fills the database with a synthetic dataset first (use a
+scratch database; the rows are not removed afterwards).
+
+Usage (from the backend directory; requires httpx for the TestClient):
+    python db/index_advisor.py --seed --tasks 50000
+    python db/index_advisor.py --json > explain_report.json
+Exits with status 1 when any statement was flagged.
+"""
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from datetime import date, datetime, timedelta
+import argparse
+import json
+import logging
+import os
+import random
+import re
+import sys
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+os.environ.setdefault("OPEN_SWAGGER", "0")
+
+from sqlalchemy import event, insert, text
+from fastapi.routing import APIRoute
+
+import database_connection
+from models import (
+    User, Project, Sprint, Task, TaskAssignee, Document, Role, Company,
+    TaskStatus, TaskPriority, TaskType, ProjectStatus, SprintStatus
+)
+
+logger = logging.getLogger(__name__)
+
+# Path parameter -> table used to pick an existing id for it
+PATH_PARAM_TABLES = {
+    "project_id": "projects",
+    "sprint_id": "sprints",
+    "task_id": "tasks",
+    "user_id": "users",
+    "role_id": "roles",
+    "document_id": "documents",
+    "comment_id": "comments",
+    "event_id": "calendar_events",
+    "permission_id": "permissions",
+    "job_id": "import_jobs",
+}
+
+# Routes that never return (or must not be called) during a capture run
+SKIPPED_PATHS = {"/api/stream"}
+
+# Filter combinations worth checking beyond the bare routes
+ADDITIONAL_REQUESTS = [
+    "/api/tasks?project_id={project_id}&status_key={status_key}",
+    "/api/tasks?sprint_id={sprint_id}&status_key={status_key}",
+    "/api/tasks?assignee_id={user_id}",
+    "/api/tasks?project_id={project_id}&assignee_id={user_id}",
+    "/api/companies/search?q=a",
+    "/api/calendar?start=2024-01-01&end=2024-12-31",
+]
+
+PLACEHOLDER_PATTERN = re.compile(r"\{(\w+)\}")
+
+
+class StatementCapture:
+    """Collects the SELECT statements an engine executes while active"""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.statements: List[Tuple[str, object]] = []
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if not executemany and statement.lstrip().upper().startswith(("SELECT", "WITH")):
+            self.statements.append((statement, parameters))
+
+    def __enter__(self):
+        self.statements = []
+        event.listen(self.engine, "before_cursor_execute", self._before_cursor_execute)
+        return self
+
+    def __exit__(self, *exc_info):
+        event.remove(self.engine, "before_cursor_execute", self._before_cursor_execute)
+
+
+def explain(engine, statement: str, parameters) -> List[Dict]:
+    """EXPLAIN a captured statement with its original DB-API parameters"""
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        cursor.execute(f"EXPLAIN {statement}", parameters)
+        columns = [column[0] for column in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+    finally:
+        raw.close()
+
+
+def review_plan(plan: List[Dict], min_rows: int) -> List[str]:
+    """Findings for one EXPLAIN result"""
+    findings = []
+    for row in plan:
+        estimated_rows = row.get("rows") or 0
+        if estimated_rows < min_rows:
+            continue
+        table = row.get("table")
+        extra = row.get("Extra") or ""
+        if row.get("type") == "ALL":
+            findings.append(f"full table scan on {table} (~{estimated_rows} rows)")
+        elif row.get("type") == "index":
+            findings.append(f"full index scan on {table} via {row.get('key')} (~{estimated_rows} rows)")
+        if "Using filesort" in extra:
+            findings.append(f"filesort on {table} (~{estimated_rows} rows)")
+        if "Using temporary" in extra:
+            findings.append(f"temporary table for {table} (~{estimated_rows} rows)")
+    return findings
+
+
+def sample_values(engine) -> Dict[str, object]:
+    """Existing ids and keys used to fill route placeholders"""
+    values = {}
+    with engine.connect() as conn:
+        for param, table in PATH_PARAM_TABLES.items():
+            try:
+                values[param] = conn.execute(text(f"SELECT MIN(id) FROM {table}")).scalar()
+            except Exception:
+                values[param] = None
+        # Prefer a user that actually has assignments
+        assignee = conn.execute(text("SELECT MIN(user_id) FROM task_assignees")).scalar()
+        if assignee is not None:
+            values["user_id"] = assignee
+        values["status_key"] = conn.execute(text("SELECT `key` FROM task_status ORDER BY id LIMIT 1")).scalar()
+    return values
+
+
+def build_requests(app, values: Dict[str, object]) -> List[str]:
+    """Concrete URLs for every GET route plus ADDITIONAL_REQUESTS"""
+    templates = []
+    for route in app.routes:
+        if isinstance(route, APIRoute) and "GET" in route.methods and route.path not in SKIPPED_PATHS:
+            templates.append(route.path)
+    templates.extend(ADDITIONAL_REQUESTS)
+
+    urls = []
+    for template in templates:
+        placeholders = PLACEHOLDER_PATTERN.findall(template)
+        if any(values.get(name) is None for name in placeholders):
+            logger.info(f"   skipped {template}: no sample value for {placeholders}")
+            continue
+        urls.append(PLACEHOLDER_PATTERN.sub(lambda m: str(values[m.group(1)]), template))
+    return urls
+
+
+def issue_token() -> Optional[str]:
+    """Bearer token for routes that require a session"""
+    from services.session_service import SessionService
+    db = database_connection.SessionLocal()
+    try:
+        user = db.query(User).filter(User.is_active == True).order_by(User.id).first()
+        if user is None:
+            return None
+        token, _ = SessionService.issue_session(user, db)
+        return token
+    finally:
+        db.close()
+
+
+def seed_dataset(engine, projects: int, tasks: int, users: int, documents_per_project: int) -> None:
+    """Bulk-insert a synthetic dataset (needs the lookup rows from seed.sql)"""
+    rng = random.Random(42)
+    chunk = 1000
+
+    def bulk_insert(conn, table, rows: List[Dict]) -> None:
+        for start in range(0, len(rows), chunk):
+            conn.execute(insert(table), rows[start:start + chunk])
+
+    with engine.begin() as conn:
+        def ids(model) -> List[int]:
+            return [row[0] for row in conn.execute(text(f"SELECT id FROM {model.__tablename__}"))]
+
+        role_ids, status_ids = ids(Role), ids(TaskStatus)
+        priority_ids, type_ids = ids(TaskPriority), ids(TaskType)
+        project_status_ids, sprint_status_ids = ids(ProjectStatus), ids(SprintStatus)
+        if not (role_ids and status_ids and priority_ids and type_ids):
+            raise SystemExit("Lookup tables are empty: run db/seed.sql first")
+
+        company_ids = ids(Company)
+        if not company_ids:
+            conn.execute(insert(Company.__table__), [{"name": "Advisor Seed Co"}])
+            company_ids = ids(Company)
+
+        run = datetime.now().strftime("%Y%m%d%H%M%S")
+        bulk_insert(conn, User.__table__, [
+            {
+                "email": f"advisor-{run}-{i}@example.com",
+                "password_hash": "!",
+                "first_name": "Seed",
+                "last_name": f"User {i}",
+                "role_id": rng.choice(role_ids),
+                "company_id": rng.choice(company_ids),
+                "is_active": True,
+            }
+            for i in range(users)
+        ])
+        user_ids = [row[0] for row in conn.execute(
+            text("SELECT id FROM users WHERE email LIKE :pattern"), {"pattern": f"advisor-{run}-%"}
+        )]
+
+        bulk_insert(conn, Project.__table__, [
+            {
+                "name": f"Advisor project {run}-{i}",
+                "company_id": rng.choice(company_ids),
+                "project_manager_id": rng.choice(user_ids),
+                "status_id": rng.choice(project_status_ids) if project_status_ids else None,
+            }
+            for i in range(projects)
+        ])
+        project_ids = [row[0] for row in conn.execute(
+            text("SELECT id FROM projects WHERE name LIKE :pattern"), {"pattern": f"Advisor project {run}-%"}
+        )]
+
+        today = date.today()
+        bulk_insert(conn, Sprint.__table__, [
+            {
+                "name": f"Sprint {n + 1}",
+                "project_id": project_id,
+                "start_date": today + timedelta(days=14 * n),
+                "end_date": today + timedelta(days=14 * n + 13),
+                "status_id": rng.choice(sprint_status_ids) if sprint_status_ids else None,
+            }
+            for project_id in project_ids for n in range(6)
+        ])
+        sprints_by_project: Dict[int, List[int]] = {}
+        # This run's rows have the highest ids, so ">= first id" selects exactly them
+        for sprint_id, project_id in conn.execute(
+            text("SELECT id, project_id FROM sprints WHERE project_id >= :first"), {"first": min(project_ids)}
+        ):
+            sprints_by_project.setdefault(project_id, []).append(sprint_id)
+
+        task_rows = []
+        for i in range(tasks):
+            project_id = rng.choice(project_ids)
+            task_rows.append({
+                "title": f"Advisor task {i}",
+                "project_id": project_id,
+                "sprint_id": rng.choice(sprints_by_project.get(project_id) or [None]),
+                "status_id": rng.choice(status_ids),
+                "priority_id": rng.choice(priority_ids),
+                "task_type_id": rng.choice(type_ids),
+                "assignee_id": rng.choice(user_ids),
+                "created_by": rng.choice(user_ids),
+            })
+        bulk_insert(conn, Task.__table__, task_rows)
+        task_ids = [row[0] for row in conn.execute(
+            text("SELECT id FROM tasks WHERE project_id >= :first"), {"first": min(project_ids)}
+        )]
+
+        bulk_insert(conn, TaskAssignee.__table__, [
+            {"task_id": task_id, "user_id": rng.choice(user_ids)} for task_id in task_ids
+        ])
+
+        bulk_insert(conn, Document.__table__, [
+            {
+                "title": f"Advisor document {n}",
+                "file_name": f"doc-{n}.pdf",
+                "file_path": f"/dev/null/{project_id}/doc-{n}.pdf",
+                "file_size": 1024,
+                "mime_type": "application/pdf",
+                "project_id": project_id,
+                "uploaded_by": rng.choice(user_ids),
+                "created_at": datetime.now() - timedelta(hours=rng.randint(0, 24 * 365)),
+            }
+            for project_id in project_ids for n in range(documents_per_project)
+        ])
+
+    # Refresh statistics so EXPLAIN sees the new volumes
+    with engine.connect() as conn:
+        for table in ("users", "projects", "sprints", "tasks", "task_assignees", "documents"):
+            conn.execute(text(f"ANALYZE TABLE {table}")).all()
+    logger.info(f"Seeded {users} users, {projects} projects, {tasks} tasks")
+
+
+def run_advisor(min_rows: int) -> List[Dict]:
+    """Call every route, EXPLAIN what it ran and return one report entry per route"""
+    from fastapi.testclient import TestClient
+    import main
+
+    engine = database_connection.init_db()
+    values = sample_values(engine)
+    token = issue_token()
+    headers = {"Authorization": f"Bearer {token}"} if token else {}
+
+    report = []
+    with TestClient(main.app) as client:
+        capture = StatementCapture(engine)
+        for url in build_requests(main.app, values):
+            with capture:
+                response = client.get(url, headers=headers)
+            entry = {"request": url, "status": response.status_code, "statements": []}
+            seen = set()
+            for statement, parameters in capture.statements:
+                if statement in seen:
+                    continue  # Same SQL shape (e.g. a per-row lookup); one plan is enough
+                seen.add(statement)
+                try:
+                    plan = explain(engine, statement, parameters)
+                except Exception as e:
+                    entry["statements"].append({"sql": statement, "error": str(e), "findings": []})
+                    continue
+                entry["statements"].append({
+                    "sql": statement,
+                    "plan": plan,
+                    "findings": review_plan(plan, min_rows),
+                })
+            report.append(entry)
+    return report
+
+
+def print_report(report: List[Dict]) -> None:
+    flagged = 0
+    for entry in report:
+        findings = [(s["sql"], f) for s in entry["statements"] for f in s["findings"]]
+        marker = "⚠️ " if findings else "✅"
+        logger.info(f"{marker} GET {entry['request']} [{entry['status']}] - {len(entry['statements'])} distinct statement(s)")
+        for sql, finding in findings:
+            flagged += 1
+            logger.info(f"     {finding}")
+            logger.info(f"       {' '.join(sql.split())[:240]}")
+    logger.info(f"\n{flagged} finding(s) across {len(report)} request(s)")
+
+
+def main_cli(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="EXPLAIN the SQL behind every GET route")
+    parser.add_argument("--seed", action="store_true", help="insert a synthetic dataset first (scratch databases only)")
+    parser.add_argument("--projects", type=int, default=50)
+    parser.add_argument("--tasks", type=int, default=20000)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--documents-per-project", type=int, default=40)
+    parser.add_argument("--min-rows", type=int, default=1000, help="ignore plans estimating fewer rows than this")
+    parser.add_argument("--json", action="store_true", help="print the full report (with plans) as JSON")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s", force=True)
+    if args.seed:
+        seed_dataset(database_connection.init_db(), args.projects, args.tasks, args.users, args.documents_per_project)
+
+    report = run_advisor(args.min_rows)
+    if args.json:
+        print(json.dumps(report, indent=2, default=str))
+    else:
+        print_report(report)
+    return 1 if any(s["findings"] for entry in report for s in entry["statements"]) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
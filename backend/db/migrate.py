@@ -0,0 +1,193 @@
+"""
+Migration runner - applies the versioned SQL files in db/migrations in order.
+
+Each file is named NNN_description.sql and is applied at most once; applied
+versions are recorded in schema_migrations together with a checksum of the
+file, so an edited migration is reported instead of silently ignored.
+
+Statements that find their change already in place (an index that already
+exists or was already dropped) are skipped, so running the migrations
+against a database created from the current schema.sql only records them.
+
+Every table created in schema.sql must either be part of the baseline schema
+the migrations start from or be created by a migration; the runner refuses
+to run when one is missing, since migrated databases would lack that table.
+
+Usage (from the backend directory):
+    python db/migrate.py             # apply pending migrations
+    python db/migrate.py --status    # list applied / pending migrations
+    python db/migrate.py --dry-run   # print the pending statements only
+    python db/migrate.py --check     # only check schema.sql against the migrations (no database)
+"""
+from pathlib import Path
+from typing import List, Tuple
+import argparse
+import hashlib
+import logging
+import re
+import sys
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+
+from database_connection import get_engine
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_DIR = Path(__file__).resolve().parent / "migrations"
+SCHEMA_FILE = Path(__file__).resolve().parent / "schema.sql"
+MIGRATION_FILE_PATTERN = re.compile(r"^(\d+)_(\w+)\.sql$")
+CREATE_TABLE_PATTERN = re.compile(r"CREATE\s+TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?`?(\w+)`?", re.IGNORECASE)
+
+# Tables of the schema.sql the migrations start from; every table added to
+# schema.sql since then must also be created by a migration
+BASELINE_TABLES = frozenset({
+    'roles', 'project_status', 'sprint_status', 'task_status', 'task_priority', 'task_type',
+    'dependency_type', 'event_type', 'event_priority', 'event_status', 'processing_type',
+    'processing_status', 'companies', 'users', 'permissions', 'role_has_permission',
+    'user_permissions', 'projects', 'user_projects', 'sprints', 'tasks', 'task_dependencies',
+    'task_attachments', 'task_assignees', 'task_links', 'comments', 'documents',
+    'document_versions', 'document_text_extraction', 'ai_processing', 'ai_generated_tasks',
+    'document_processing_queue', 'calendar_events', 'user_sessions', 'audit_logs',
+    'schema_migrations',  # Created by this runner
+})
+
+# MySQL errors meaning "this change is already in place"
+ALREADY_APPLIED_ERRORS = {
+    1050,  # Table already exists
+    1060,  # Duplicate column name
+    1061,  # Duplicate key name
+    1091,  # Can't DROP; check that column/key exists
+}
+
+CREATE_MIGRATIONS_TABLE = """
+CREATE TABLE IF NOT EXISTS schema_migrations (
+  version     INT UNSIGNED PRIMARY KEY,
+  name        VARCHAR(255) NOT NULL,
+  checksum    CHAR(64) NOT NULL,
+  applied_at  TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+"""
+
+
+def discover_migrations() -> List[Tuple[int, str, Path]]:
+    """(version, name, path) of every migration file, ordered by version"""
+    migrations = []
+    for path in MIGRATIONS_DIR.glob("*.sql"):
+        match = MIGRATION_FILE_PATTERN.match(path.name)
+        if not match:
+            logger.warning(f"Ignoring {path.name}: not named NNN_description.sql")
+            continue
+        migrations.append((int(match.group(1)), match.group(2), path))
+    migrations.sort()
+    versions = [version for version, _, _ in migrations]
+    if len(versions) != len(set(versions)):
+        raise SystemExit("Duplicate migration version numbers in db/migrations")
+    return migrations
+
+
+def split_statements(sql: str) -> List[str]:
+    """Split a migration file into statements (line comments removed)"""
+    lines = [line for line in sql.splitlines() if not line.strip().startswith("--")]
+    return [statement.strip() for statement in "\n".join(lines).split(";") if statement.strip()]
+
+
+def created_tables(path: Path) -> List[str]:
+    """Names of the tables a SQL file creates, in order"""
+    return CREATE_TABLE_PATTERN.findall("\n".join(split_statements(path.read_text(encoding="utf-8"))))
+
+
+def unmigrated_tables(migrations: List[Tuple[int, str, Path]]) -> List[str]:
+    """Tables schema.sql creates that neither the baseline nor any migration creates"""
+    covered = set(BASELINE_TABLES)
+    for _, _, path in migrations:
+        covered.update(table.lower() for table in created_tables(path))
+    return [table for table in created_tables(SCHEMA_FILE) if table.lower() not in covered]
+
+
+def file_checksum(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def get_applied(conn) -> dict:
+    """version -> checksum of the migrations already applied"""
+    conn.execute(text(CREATE_MIGRATIONS_TABLE))
+    rows = conn.execute(text("SELECT version, checksum FROM schema_migrations")).all()
+    return {version: checksum for version, checksum in rows}
+
+
+def apply_migration(conn, version: int, name: str, path: Path) -> None:
+    """Run one migration's statements and record it"""
+    for statement in split_statements(path.read_text(encoding="utf-8")):
+        try:
+            conn.execute(text(statement))
+        except DBAPIError as e:
+            code = e.orig.args[0] if e.orig is not None and e.orig.args else None
+            if code not in ALREADY_APPLIED_ERRORS:
+                raise
+            logger.info(f"   already in place, skipped: {statement.splitlines()[0]} ({e.orig.args[1]})")
+    conn.execute(
+        text("INSERT INTO schema_migrations (version, name, checksum) VALUES (:version, :name, :checksum)"),
+        {"version": version, "name": name, "checksum": file_checksum(path)}
+    )
+    # MySQL commits DDL implicitly; commit the bookkeeping row as well
+    conn.commit()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Apply versioned SQL migrations")
+    parser.add_argument("--status", action="store_true", help="list applied and pending migrations")
+    parser.add_argument("--dry-run", action="store_true", help="print pending statements without running them")
+    parser.add_argument("--check", action="store_true", help="only check that schema.sql is covered by the migrations")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    migrations = discover_migrations()
+
+    missing = unmigrated_tables(migrations)
+    if missing:
+        logger.error(f"❌ Tables in schema.sql created by no migration: {', '.join(missing)}")
+        return 1
+    if args.check:
+        logger.info("✅ Every table in schema.sql is created by the baseline or a migration")
+        return 0
+
+    with get_engine().connect() as conn:
+        applied = get_applied(conn)
+        conn.commit()
+
+        for version, name, path in migrations:
+            if version in applied and applied[version] != file_checksum(path):
+                logger.warning(f"⚠️  {path.name} was modified after it was applied")
+
+        pending = [m for m in migrations if m[0] not in applied]
+
+        if args.status:
+            for version, name, path in migrations:
+                logger.info(f"{'applied' if version in applied else 'pending'}  {path.name}")
+            return 0
+
+        if not pending:
+            logger.info("✅ Database schema is up to date")
+            return 0
+
+        for version, name, path in pending:
+            if args.dry_run:
+                logger.info(f"-- {path.name}")
+                for statement in split_statements(path.read_text(encoding="utf-8")):
+                    logger.info(f"{statement};")
+                continue
+            logger.info(f"Applying {path.name}")
+            apply_migration(conn, version, name, path)
+
+    if not args.dry_run:
+        logger.info(f"✅ Applied {len(pending)} migration(s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,19 @@
+-- =========================================================
+-- 001: Delta sync support
+-- Range-scan indexes on updated_at and the sync_tombstones table
+-- =========================================================
+
+ALTER TABLE projects  ADD KEY idx_projects_updated_at (updated_at, id);
+ALTER TABLE sprints   ADD KEY idx_sprints_updated_at (updated_at, id);
+ALTER TABLE tasks     ADD KEY idx_tasks_updated_at (updated_at, id);
+ALTER TABLE documents ADD KEY idx_documents_updated_at (updated_at, id);
+
+CREATE TABLE IF NOT EXISTS sync_tombstones (
+  id             BIGINT UNSIGNED AUTO_INCREMENT PRIMARY KEY,
+  resource_type  VARCHAR(50) NOT NULL,
+  resource_id    BIGINT UNSIGNED NOT NULL,
+  project_id     BIGINT UNSIGNED,
+  deleted_at     TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  KEY idx_sync_tombstones_deleted_at (deleted_at, id),
+  KEY idx_sync_tombstones_project (project_id, deleted_at)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
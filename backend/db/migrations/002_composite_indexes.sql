@@ -0,0 +1,18 @@
+-- =========================================================
+-- 002: Composite indexes for the hot list queries
+-- tasks:          project+status and sprint+status filters (TaskService.list_tasks)
+-- task_assignees: assignee filter joins on user_id, then reads task_id (covering)
+-- documents:      per-project listing ordered by created_at DESC (no filesort)
+-- The single-column indexes they replace are left-most prefixes of the new ones.
+-- =========================================================
+
+ALTER TABLE tasks ADD KEY idx_tasks_project_status (project_id, status_id);
+ALTER TABLE tasks ADD KEY idx_tasks_sprint_status (sprint_id, status_id);
+ALTER TABLE tasks DROP KEY idx_tasks_project_id;
+ALTER TABLE tasks DROP KEY idx_tasks_sprint_id;
+
+ALTER TABLE task_assignees ADD KEY idx_task_assignees_user_task (user_id, task_id);
+ALTER TABLE task_assignees DROP KEY idx_task_assignees_user_id;
+
+ALTER TABLE documents ADD KEY idx_documents_project_created (project_id, created_at DESC);
+ALTER TABLE documents DROP KEY idx_documents_project_id;
@@ -0,0 +1,31 @@
+-- =========================================================
+-- 003: Bulk task imports
+-- import_jobs tracks background imports; tasks.import_job_id marks the rows
+-- an import created, so a job can read back the ids of each inserted batch.
+-- =========================================================
+
+ALTER TABLE tasks ADD COLUMN import_job_id BIGINT UNSIGNED NULL AFTER created_by;
+ALTER TABLE tasks ADD KEY idx_tasks_import_job (import_job_id, id);
+
+CREATE TABLE IF NOT EXISTS import_jobs (
+  id               BIGINT UNSIGNED AUTO_INCREMENT PRIMARY KEY,
+  project_id       BIGINT UNSIGNED NOT NULL,
+  status           VARCHAR(20) NOT NULL DEFAULT 'queued',
+  file_format      VARCHAR(10) NOT NULL,
+  file_name        VARCHAR(255) NOT NULL,
+  file_path        VARCHAR(1000) NOT NULL,
+  error_file_path  VARCHAR(1000),
+  total_bytes      BIGINT UNSIGNED NOT NULL DEFAULT 0,
+  processed_bytes  BIGINT UNSIGNED NOT NULL DEFAULT 0,
+  processed_rows   INT UNSIGNED NOT NULL DEFAULT 0,
+  imported_rows    INT UNSIGNED NOT NULL DEFAULT 0,
+  failed_rows      INT UNSIGNED NOT NULL DEFAULT 0,
+  error_message    TEXT,
+  created_by       BIGINT UNSIGNED,
+  created_at       TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  started_at       DATETIME,
+  finished_at      DATETIME,
+  CONSTRAINT fk_import_jobs_project FOREIGN KEY (project_id) REFERENCES projects(id) ON DELETE CASCADE,
+  CONSTRAINT fk_import_jobs_created_by FOREIGN KEY (created_by) REFERENCES users(id),
+  KEY idx_import_jobs_project (project_id, created_at)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
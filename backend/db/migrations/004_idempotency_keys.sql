@@ -0,0 +1,22 @@
+-- =========================================================
+-- 004: Idempotency keys
+-- Responses of POST /api/tasks and document uploads sent with an
+-- Idempotency-Key header, replayed when the client retries the request.
+-- Rows expire after IDEMPOTENCY_TTL_HOURS and are purged by the app.
+-- =========================================================
+
+CREATE TABLE IF NOT EXISTS idempotency_keys (
+  id                BIGINT UNSIGNED AUTO_INCREMENT PRIMARY KEY,
+  key_hash          CHAR(64) NOT NULL,
+  request_hash      CHAR(64) NOT NULL,
+  owner             CHAR(32) NOT NULL,
+  status            VARCHAR(20) NOT NULL DEFAULT 'in_progress',
+  response_status   SMALLINT UNSIGNED,
+  response_headers  JSON,
+  response_body     MEDIUMBLOB,
+  locked_until      DATETIME NOT NULL,
+  created_at        TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  expires_at        DATETIME NOT NULL,
+  UNIQUE KEY uq_idempotency_keys_key (key_hash),
+  KEY idx_idempotency_keys_expires (expires_at)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
@@ -0,0 +1,33 @@
+-- =========================================================
+-- 005: Chunked document versions
+-- Versions are stored as content-defined chunks shared between versions
+-- (document_chunks, reference counted) and listed in order per version
+-- (document_version_chunks). A document whose content moved into versions
+-- has no file of its own any more, so file_path becomes optional.
+-- =========================================================
+
+ALTER TABLE documents MODIFY file_path VARCHAR(500) NULL;
+
+ALTER TABLE document_versions MODIFY file_path VARCHAR(500) NULL;
+ALTER TABLE document_versions ADD COLUMN file_name VARCHAR(255) NULL AFTER file_path;
+ALTER TABLE document_versions ADD COLUMN mime_type VARCHAR(100) NULL AFTER file_size;
+ALTER TABLE document_versions ADD COLUMN content_hash CHAR(64) NULL AFTER mime_type;
+ALTER TABLE document_versions ADD COLUMN chunk_count INT UNSIGNED NOT NULL DEFAULT 0 AFTER content_hash;
+ALTER TABLE document_versions ADD COLUMN stored_bytes BIGINT UNSIGNED NOT NULL DEFAULT 0 AFTER chunk_count;
+
+CREATE TABLE IF NOT EXISTS document_chunks (
+  hash        CHAR(64) NOT NULL PRIMARY KEY,
+  size        INT UNSIGNED NOT NULL,
+  ref_count   INT NOT NULL DEFAULT 0,
+  created_at  TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+CREATE TABLE IF NOT EXISTS document_version_chunks (
+  version_id  BIGINT UNSIGNED NOT NULL,
+  seq         INT UNSIGNED NOT NULL,
+  chunk_hash  CHAR(64) NOT NULL,
+  chunk_size  INT UNSIGNED NOT NULL,
+  PRIMARY KEY (version_id, seq),
+  CONSTRAINT fk_version_chunks_version FOREIGN KEY (version_id) REFERENCES document_versions(id) ON DELETE CASCADE,
+  KEY idx_version_chunks_hash (chunk_hash)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
@@ -0,0 +1,35 @@
+-- =========================================================
+-- 006: Task history and sprint burndown
+-- task_history is the append-only change log of tracked task fields;
+-- sprint_burndown holds one precomputed row per sprint per day. Both are
+-- written on every task change, so older databases need them before the
+-- application starts.
+-- =========================================================
+
+CREATE TABLE IF NOT EXISTS task_history (
+  id            BIGINT UNSIGNED AUTO_INCREMENT PRIMARY KEY,
+  task_id       BIGINT UNSIGNED NOT NULL,
+  sprint_id     BIGINT UNSIGNED,
+  field_name    VARCHAR(50) NOT NULL,
+  old_value     VARCHAR(255),
+  new_value     VARCHAR(255),
+  changed_by    BIGINT UNSIGNED,
+  changed_at    TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  CONSTRAINT fk_task_history_changed_by FOREIGN KEY (changed_by) REFERENCES users(id),
+  KEY idx_task_history_task (task_id, changed_at),
+  KEY idx_task_history_sprint (sprint_id, changed_at)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+CREATE TABLE IF NOT EXISTS sprint_burndown (
+  id               BIGINT UNSIGNED AUTO_INCREMENT PRIMARY KEY,
+  sprint_id        BIGINT UNSIGNED NOT NULL,
+  snapshot_date    DATE NOT NULL,
+  scope_hours      DECIMAL(10,2) NOT NULL DEFAULT 0,
+  remaining_hours  DECIMAL(10,2) NOT NULL DEFAULT 0,
+  completed_hours  DECIMAL(10,2) NOT NULL DEFAULT 0,
+  tasks_total      INT NOT NULL DEFAULT 0,
+  tasks_done       INT NOT NULL DEFAULT 0,
+  updated_at       TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+  CONSTRAINT uq_sprint_burndown_day UNIQUE (sprint_id, snapshot_date),
+  CONSTRAINT fk_sprint_burndown_sprint FOREIGN KEY (sprint_id) REFERENCES sprints(id) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
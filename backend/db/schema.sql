@@ -193,7 +193,8 @@ CREATE TABLE IF NOT EXISTS projects (
   CONSTRAINT fk_projects_status FOREIGN KEY (status_id) REFERENCES project_status(id),
   KEY idx_projects_company_id (company_id),
   KEY idx_projects_manager_id (project_manager_id),
-  KEY idx_projects_status_id (status_id)
+  KEY idx_projects_status_id (status_id),
+  KEY idx_projects_updated_at (updated_at, id)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
 -- User-Project mapping table (project members)
@@ -230,7 +231,8 @@ CREATE TABLE IF NOT EXISTS sprints (
   CONSTRAINT fk_sprints_created_by FOREIGN KEY (created_by) REFERENCES users(id),
   KEY idx_sprints_project_id (project_id),
   KEY idx_sprints_status_id (status_id),
-  KEY idx_sprints_dates (start_date, end_date)
+  KEY idx_sprints_dates (start_date, end_date),
+  KEY idx_sprints_updated_at (updated_at, id)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
 -- =========================================================
@@ -254,6 +256,7 @@ CREATE TABLE IF NOT EXISTS tasks (
   actual_hours         DECIMAL(5,2),
   progress_percentage  INT DEFAULT 0,
   created_by           BIGINT UNSIGNED,
+  import_job_id        BIGINT UNSIGNED,
   created_at           TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
   updated_at           TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
   CONSTRAINT fk_tasks_project FOREIGN KEY (project_id) REFERENCES projects(id),
@@ -264,13 +267,15 @@ CREATE TABLE IF NOT EXISTS tasks (
   CONSTRAINT fk_tasks_assignee FOREIGN KEY (assignee_id) REFERENCES users(id),
   CONSTRAINT fk_tasks_reviewer FOREIGN KEY (reviewer_id) REFERENCES users(id),
   CONSTRAINT fk_tasks_created_by FOREIGN KEY (created_by) REFERENCES users(id),
-  KEY idx_tasks_project_id (project_id),
-  KEY idx_tasks_sprint_id (sprint_id),
+  KEY idx_tasks_project_status (project_id, status_id),
+  KEY idx_tasks_sprint_status (sprint_id, status_id),
   KEY idx_tasks_assignee_id (assignee_id),
   KEY idx_tasks_status_id (status_id),
   KEY idx_tasks_priority_id (priority_id),
   KEY idx_tasks_type_id (task_type_id),
-  KEY idx_tasks_due_date (due_date)
+  KEY idx_tasks_due_date (due_date),
+  KEY idx_tasks_updated_at (updated_at, id),
+  KEY idx_tasks_import_job (import_job_id, id)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
 -- Task dependencies table
@@ -314,7 +319,7 @@ CREATE TABLE IF NOT EXISTS task_assignees (
   CONSTRAINT fk_task_assignees_user FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
   CONSTRAINT fk_task_assignees_assigned_by FOREIGN KEY (assigned_by) REFERENCES users(id),
   KEY idx_task_assignees_task_id (task_id),
-  KEY idx_task_assignees_user_id (user_id)
+  KEY idx_task_assignees_user_task (user_id, task_id)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
 -- Task links table
@@ -354,6 +359,36 @@ CREATE TABLE IF NOT EXISTS comments (
   KEY idx_comments_created_at (created_at)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
+-- Task history table (append-only change log for tracked task fields)
+CREATE TABLE IF NOT EXISTS task_history (
+  id            BIGINT UNSIGNED AUTO_INCREMENT PRIMARY KEY,
+  task_id       BIGINT UNSIGNED NOT NULL,
+  sprint_id     BIGINT UNSIGNED,
+  field_name    VARCHAR(50) NOT NULL,
+  old_value     VARCHAR(255),
+  new_value     VARCHAR(255),
+  changed_by    BIGINT UNSIGNED,
+  changed_at    TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  CONSTRAINT fk_task_history_changed_by FOREIGN KEY (changed_by) REFERENCES users(id),
+  KEY idx_task_history_task (task_id, changed_at),
+  KEY idx_task_history_sprint (sprint_id, changed_at)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- Sprint burndown table (one precomputed row per sprint per day)
+CREATE TABLE IF NOT EXISTS sprint_burndown (
+  id               BIGINT UNSIGNED AUTO_INCREMENT PRIMARY KEY,
+  sprint_id        BIGINT UNSIGNED NOT NULL,
+  snapshot_date    DATE NOT NULL,
+  scope_hours      DECIMAL(10,2) NOT NULL DEFAULT 0,
+  remaining_hours  DECIMAL(10,2) NOT NULL DEFAULT 0,
+  completed_hours  DECIMAL(10,2) NOT NULL DEFAULT 0,
+  tasks_total      INT NOT NULL DEFAULT 0,
+  tasks_done       INT NOT NULL DEFAULT 0,
+  updated_at       TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+  CONSTRAINT uq_sprint_burndown_day UNIQUE (sprint_id, snapshot_date),
+  CONSTRAINT fk_sprint_burndown_sprint FOREIGN KEY (sprint_id) REFERENCES sprints(id) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
 -- =========================================================
 -- SECTION 4: DOCUMENT MANAGEMENT TABLES
 -- =========================================================
@@ -364,7 +399,7 @@ CREATE TABLE IF NOT EXISTS documents (
   title         VARCHAR(255) NOT NULL,
   description   TEXT,
   file_name     VARCHAR(255) NOT NULL,
-  file_path     VARCHAR(500) NOT NULL,
+  file_path     VARCHAR(500),
   file_size     BIGINT NOT NULL,
   mime_type     VARCHAR(100),
   project_id    BIGINT UNSIGNED,
@@ -376,10 +411,11 @@ CREATE TABLE IF NOT EXISTS documents (
   updated_at    TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
   CONSTRAINT fk_documents_project FOREIGN KEY (project_id) REFERENCES projects(id) ON DELETE CASCADE,
   CONSTRAINT fk_documents_uploaded_by FOREIGN KEY (uploaded_by) REFERENCES users(id),
-  KEY idx_documents_project_id (project_id),
+  KEY idx_documents_project_created (project_id, created_at DESC),
   KEY idx_documents_uploaded_by (uploaded_by),
   KEY idx_documents_processed (is_processed),
-  KEY idx_documents_created_at (created_at)
+  KEY idx_documents_created_at (created_at),
+  KEY idx_documents_updated_at (updated_at, id)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
 -- Document versions table
@@ -387,8 +423,13 @@ CREATE TABLE IF NOT EXISTS document_versions (
   id                BIGINT UNSIGNED AUTO_INCREMENT PRIMARY KEY,
   document_id       BIGINT UNSIGNED NOT NULL,
   version_number    INT NOT NULL,
-  file_path         VARCHAR(500) NOT NULL,
+  file_path         VARCHAR(500),
+  file_name         VARCHAR(255),
   file_size         BIGINT NOT NULL,
+  mime_type         VARCHAR(100),
+  content_hash      CHAR(64),
+  chunk_count       INT UNSIGNED NOT NULL DEFAULT 0,
+  stored_bytes      BIGINT UNSIGNED NOT NULL DEFAULT 0,
   change_description TEXT,
   uploaded_by       BIGINT UNSIGNED,
   uploaded_at       TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
@@ -398,6 +439,25 @@ CREATE TABLE IF NOT EXISTS document_versions (
   KEY idx_document_versions_document_id (document_id)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
+-- Content-defined chunks of document versions, shared between versions
+CREATE TABLE IF NOT EXISTS document_chunks (
+  hash        CHAR(64) NOT NULL PRIMARY KEY,
+  size        INT UNSIGNED NOT NULL,
+  ref_count   INT NOT NULL DEFAULT 0,
+  created_at  TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- Chunks of each document version, in order
+CREATE TABLE IF NOT EXISTS document_version_chunks (
+  version_id  BIGINT UNSIGNED NOT NULL,
+  seq         INT UNSIGNED NOT NULL,
+  chunk_hash  CHAR(64) NOT NULL,
+  chunk_size  INT UNSIGNED NOT NULL,
+  PRIMARY KEY (version_id, seq),
+  CONSTRAINT fk_version_chunks_version FOREIGN KEY (version_id) REFERENCES document_versions(id) ON DELETE CASCADE,
+  KEY idx_version_chunks_hash (chunk_hash)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
 -- Document text extraction table
 CREATE TABLE IF NOT EXISTS document_text_extraction (
   id                BIGINT UNSIGNED AUTO_INCREMENT PRIMARY KEY,
@@ -547,6 +607,41 @@ CREATE TABLE IF NOT EXISTS user_sessions (
   KEY idx_user_sessions_active (is_active)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
+-- Sync tombstones table (deletions reported by the delta sync endpoint)
+CREATE TABLE IF NOT EXISTS sync_tombstones (
+  id             BIGINT UNSIGNED AUTO_INCREMENT PRIMARY KEY,
+  resource_type  VARCHAR(50) NOT NULL,
+  resource_id    BIGINT UNSIGNED NOT NULL,
+  project_id     BIGINT UNSIGNED,
+  deleted_at     TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  KEY idx_sync_tombstones_deleted_at (deleted_at, id),
+  KEY idx_sync_tombstones_project (project_id, deleted_at)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- Import jobs table (background bulk imports of tasks)
+CREATE TABLE IF NOT EXISTS import_jobs (
+  id               BIGINT UNSIGNED AUTO_INCREMENT PRIMARY KEY,
+  project_id       BIGINT UNSIGNED NOT NULL,
+  status           VARCHAR(20) NOT NULL DEFAULT 'queued',
+  file_format      VARCHAR(10) NOT NULL,
+  file_name        VARCHAR(255) NOT NULL,
+  file_path        VARCHAR(1000) NOT NULL,
+  error_file_path  VARCHAR(1000),
+  total_bytes      BIGINT UNSIGNED NOT NULL DEFAULT 0,
+  processed_bytes  BIGINT UNSIGNED NOT NULL DEFAULT 0,
+  processed_rows   INT UNSIGNED NOT NULL DEFAULT 0,
+  imported_rows    INT UNSIGNED NOT NULL DEFAULT 0,
+  failed_rows      INT UNSIGNED NOT NULL DEFAULT 0,
+  error_message    TEXT,
+  created_by       BIGINT UNSIGNED,
+  created_at       TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  started_at       DATETIME,
+  finished_at      DATETIME,
+  CONSTRAINT fk_import_jobs_project FOREIGN KEY (project_id) REFERENCES projects(id) ON DELETE CASCADE,
+  CONSTRAINT fk_import_jobs_created_by FOREIGN KEY (created_by) REFERENCES users(id),
+  KEY idx_import_jobs_project (project_id, created_at)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
 -- Audit logs table
 CREATE TABLE IF NOT EXISTS audit_logs (
   id             BIGINT UNSIGNED AUTO_INCREMENT PRIMARY KEY,
@@ -566,6 +661,31 @@ CREATE TABLE IF NOT EXISTS audit_logs (
   KEY idx_audit_logs_created_at (created_at)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
+-- Idempotency keys of retried POSTs (replayed responses)
+CREATE TABLE IF NOT EXISTS idempotency_keys (
+  id                BIGINT UNSIGNED AUTO_INCREMENT PRIMARY KEY,
+  key_hash          CHAR(64) NOT NULL,
+  request_hash      CHAR(64) NOT NULL,
+  owner             CHAR(32) NOT NULL,
+  status            VARCHAR(20) NOT NULL DEFAULT 'in_progress',
+  response_status   SMALLINT UNSIGNED,
+  response_headers  JSON,
+  response_body     MEDIUMBLOB,
+  locked_until      DATETIME NOT NULL,
+  created_at        TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  expires_at        DATETIME NOT NULL,
+  UNIQUE KEY uq_idempotency_keys_key (key_hash),
+  KEY idx_idempotency_keys_expires (expires_at)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- Applied migrations (see db/migrate.py)
+CREATE TABLE IF NOT EXISTS schema_migrations (
+  version     INT UNSIGNED PRIMARY KEY,
+  name        VARCHAR(255) NOT NULL,
+  checksum    CHAR(64) NOT NULL,
+  applied_at  TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
 SET FOREIGN_KEY_CHECKS = 1;
 
 -- =========================================================
@@ -0,0 +1,172 @@
+"""
+Request deadlines carried into SQL.
+
+Every API request gets a time budget (see DeadlineMiddleware). The engine
+events here pass the remaining budget on to each statement of the request:
+
+- SELECTs get a MAX_EXECUTION_TIME(ms) optimizer hint, so MySQL aborts them
+  once the budget is spent;
+- writes and locking reads run with innodb_lock_wait_timeout lowered to the
+  remaining seconds, so a locked row fails the request instead of holding it
+  for MySQL's default 50 s;
+- no statement is sent once the deadline has passed or the client is gone.
+
+When the client disconnects, the statements still running for the request
+are killed (KILL QUERY). Timeouts surface as 504, so a slow query costs one
+request instead of a pool connection and a threadpool slot for minutes.
+Work outside requests (background jobs, the audit flusher) has no deadline.
+"""
+from contextvars import ContextVar
+from typing import Optional, Dict, Tuple
+from fastapi import HTTPException, status
+from sqlalchemy import event
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# MySQL's own default, restored for statements that run without a deadline
+DEFAULT_LOCK_WAIT_TIMEOUT = int(os.getenv("DB_LOCK_WAIT_TIMEOUT", "50"))
+
+# ER_LOCK_WAIT_TIMEOUT, ER_QUERY_INTERRUPTED (KILL QUERY), ER_QUERY_TIMEOUT (MAX_EXECUTION_TIME)
+TIMEOUT_ERROR_CODES = {1205, 1317, 3024}
+
+LOCKING_CLAUSES = (" FOR UPDATE", " FOR SHARE", " LOCK IN SHARE MODE")
+
+
+class DeadlineExceeded(HTTPException):
+    def __init__(self):
+        super().__init__(status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail="Request took too long and was aborted")
+
+
+class RequestCancelled(HTTPException):
+    """The client disconnected; nobody will read the response (499 as in nginx)"""
+
+    def __init__(self):
+        super().__init__(status_code=499, detail="Client closed request")
+
+
+class Deadline:
+    """Time budget of one request and the statements running under it"""
+
+    def __init__(self, timeout: float):
+        self.timeout = timeout
+        self.expires_at = time.monotonic() + timeout
+        self.cancelled = False
+        self._running: Dict[int, Tuple[object, int]] = {}  # id(cursor) -> (engine, MySQL thread id)
+        self._lock = threading.Lock()
+
+    def remaining(self) -> float:
+        return self.expires_at - time.monotonic()
+
+    def check(self) -> None:
+        if self.cancelled:
+            raise RequestCancelled()
+        if self.remaining() <= 0:
+            raise DeadlineExceeded()
+
+    def statement_started(self, key: int, engine, thread_id: Optional[int]) -> None:
+        if thread_id is not None:
+            with self._lock:
+                self._running[key] = (engine, thread_id)
+
+    def statement_finished(self, key: int) -> None:
+        with self._lock:
+            self._running.pop(key, None)
+
+    def cancel(self) -> int:
+        """
+        The client went away: fail the request's next statement and kill the
+        running ones. Uses its own connection, outside the (possibly exhausted)
+        pool. Returns the number of statements killed.
+        """
+        self.cancelled = True
+        with self._lock:
+            running = list(self._running.values())
+        killed = 0
+        for engine, thread_id in running:
+            try:
+                cargs, cparams = engine.dialect.create_connect_args(engine.url)
+                connection = engine.dialect.connect(*cargs, **cparams)
+                try:
+                    connection.cursor().execute(f"KILL QUERY {int(thread_id)}")
+                    killed += 1
+                finally:
+                    connection.close()
+            except Exception as e:
+                logger.warning(f"Could not cancel query of disconnected client: {e}")
+        return killed
+
+
+# Set by DeadlineMiddleware for the duration of each request (copied into threadpool calls)
+request_deadline: ContextVar[Optional[Deadline]] = ContextVar('request_deadline', default=None)
+
+
+def current_deadline() -> Optional[Deadline]:
+    """Deadline of the request being handled (None outside requests)"""
+    return request_deadline.get()
+
+
+def _mysql_thread_id(conn) -> Optional[int]:
+    info = conn.connection.info
+    if 'thread_id' not in info:
+        thread_id = getattr(conn.connection.dbapi_connection, 'thread_id', None)
+        info['thread_id'] = thread_id() if callable(thread_id) else None
+    return info['thread_id']
+
+
+def _set_lock_wait_timeout(conn, cursor, seconds: int) -> None:
+    info = conn.connection.info
+    if info.get('lock_wait_timeout', DEFAULT_LOCK_WAIT_TIMEOUT) != seconds:
+        cursor.execute(f"SET SESSION innodb_lock_wait_timeout = {int(seconds)}")
+        info['lock_wait_timeout'] = seconds
+
+
+def attach_deadline_events(target_engine) -> None:
+    """Apply request deadlines to the engine's statements"""
+
+    @event.listens_for(target_engine, "before_cursor_execute", retval=True)
+    def _apply_deadline(conn, cursor, statement, parameters, context, executemany):
+        deadline = request_deadline.get()
+        mysql = conn.dialect.name == 'mysql'
+        if deadline is None:
+            if mysql:
+                _set_lock_wait_timeout(conn, cursor, DEFAULT_LOCK_WAIT_TIMEOUT)
+            return statement, parameters
+
+        deadline.check()
+        if not mysql:
+            return statement, parameters
+
+        remaining = deadline.remaining()
+        body = statement.lstrip()
+        is_select = body[:6].upper() == 'SELECT'
+        if is_select and not body.startswith('SELECT /*+'):
+            statement = f"SELECT /*+ MAX_EXECUTION_TIME({max(1, int(remaining * 1000))}) */{body[6:]}"
+        if not is_select or any(clause in body.upper() for clause in LOCKING_CLAUSES):
+            _set_lock_wait_timeout(conn, cursor, max(1, int(remaining)))
+        deadline.statement_started(id(cursor), conn.engine, _mysql_thread_id(conn))
+        return statement, parameters
+
+    @event.listens_for(target_engine, "after_cursor_execute")
+    def _statement_done(conn, cursor, statement, parameters, context, executemany):
+        deadline = request_deadline.get()
+        if deadline is not None:
+            deadline.statement_finished(id(cursor))
+
+    @event.listens_for(target_engine, "handle_error")
+    def _translate_timeouts(context):
+        deadline = request_deadline.get()
+        if deadline is None:
+            return
+        if context.cursor is not None:
+            deadline.statement_finished(id(context.cursor))
+        if isinstance(context.original_exception, HTTPException):
+            return  # Raised by _apply_deadline
+        if deadline.cancelled:
+            raise RequestCancelled() from context.original_exception
+        args = getattr(context.original_exception, 'args', None)
+        if args and args[0] in TIMEOUT_ERROR_CODES:
+            raise DeadlineExceeded() from context.original_exception
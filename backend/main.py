@@ -1,28 +1,84 @@
 """
 SmartSprint Backend - FastAPI Application
 Main entry point for the SmartSprint backend API server.
+
+APP_MODE=production starts fast: routers are imported on a background thread
+after the server is listening, the database pool is prewarmed concurrently,
+and there is no Swagger UI and no browser. Development mode (the default)
+imports everything up front and opens Swagger as before.
+Run production servers through serve.py (multi-worker launcher).
 """
+import time
+
+_import_started = time.perf_counter()
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
+from middleware import (
+    RequestContextMiddleware, CompressionMiddleware, LazyRouterMiddleware, DeadlineMiddleware,
+    CoalescingMiddleware, AdmissionMiddleware, AdmissionController, IdempotencyMiddleware
+)
+from startup import ROUTER_MODULES, RouterLoader, StartupReport
 import logging
 import os
 import threading
-import time
 import webbrowser
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+APP_MODE = os.getenv("APP_MODE", "development")
+PRODUCTION = APP_MODE == "production"
+REQUEST_TIMEOUT_SECONDS = float(os.getenv("REQUEST_TIMEOUT_SECONDS", "30"))
+
+startup_report = StartupReport(_import_started)
+_background_services_started = threading.Event()
+
 # Initialize FastAPI app
 app = FastAPI(
     title="SmartSprint API",
     description="SmartSprint Advanced Project Management System - Backend API",
-    version="1.0.0"
+    version="1.0.0",
+    docs_url=None if PRODUCTION else "/docs",
+    redoc_url=None if PRODUCTION else "/redoc",
+    openapi_url=None if PRODUCTION else "/openapi.json"
 )
 
+router_loader = RouterLoader(app, ROUTER_MODULES, startup_report)
+
+# Hold requests until the routers are imported (production mode only)
+if PRODUCTION:
+    app.add_middleware(LazyRouterMiddleware, loader=router_loader)
+
+# Share one response among identical concurrent GETs (inside CORS and compression)
+app.add_middleware(CoalescingMiddleware)
+
+# Replay the stored response of task creations / uploads retried with an Idempotency-Key
+app.add_middleware(IdempotencyMiddleware)
+
+
+def _tenant_of_token(token: str):
+    """Company of a bearer token this process has already verified (no database access)"""
+    if not router_loader.loaded.is_set():
+        return None  # Never import the services on the event loop
+    from services.session_service import SessionService
+    return SessionService.cached_tenant(token)
+
+
+def _database_saturated() -> bool:
+    import database_connection
+    manager = database_connection.pool_manager
+    return manager is not None and manager.saturated()
+
+
+# Per-tenant rate limits and concurrency caps; sheds bulk work first under load
+admission_controller = AdmissionController()
+admission_controller.tenant_resolver = _tenant_of_token
+admission_controller.database_saturated = _database_saturated
+app.add_middleware(AdmissionMiddleware, controller=admission_controller)
+
 # Configure CORS to allow frontend connections
 app.add_middleware(
     CORSMiddleware,
@@ -38,6 +94,15 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Expose client IP / user agent to services (audit logging)
+app.add_middleware(RequestContextMiddleware)
+
+# Time budget per request, enforced on SQL statements; cancels queries of disconnected clients
+app.add_middleware(DeadlineMiddleware, timeout=REQUEST_TIMEOUT_SECONDS)
+
+# Compress large JSON / CSV / iCal responses (brotli when installed, else gzip)
+app.add_middleware(CompressionMiddleware)
+
 
 def _open_swagger_after_start(delay_seconds: float = 1.0) -> None:
     """Open Swagger UI in the default browser after a small delay."""
@@ -50,42 +115,106 @@ def _open_swagger_after_start(delay_seconds: float = 1.0) -> None:
     threading.Thread(target=_worker, daemon=True).start()
 
 
+def _start_background_services() -> None:
+    """Start the audit flusher, the event bus and the password pool"""
+    started = time.perf_counter()
+
+    # Start the background audit-log flusher
+    from services.audit_service import AuditService
+    AuditService.start()
+
+    # Join the cross-worker event bus (when EVENT_BROKER_BACKEND=unix)
+    from services.event_service import EventService
+    EventService.start()
+
+    # Start the password hashing pool off the event loop (spawning workers takes a moment)
+    from services.password_service import PasswordService
+    threading.Thread(target=PasswordService.start, daemon=True).start()
+
+    _background_services_started.set()
+    startup_report.record('background services', time.perf_counter() - started)
+
+
+def _prewarm_database() -> None:
+    """Open the first pool connections concurrently, off the request path"""
+    started = time.perf_counter()
+    try:
+        from database_connection import prewarm_pool
+        opened = prewarm_pool()
+        startup_report.database = 'connected'
+        startup_report.record('database prewarm', time.perf_counter() - started, connections=opened)
+    except Exception as e:
+        startup_report.database = 'unavailable'
+        startup_report.record('database prewarm', time.perf_counter() - started, error=str(e))
+        logger.warning(f"⚠️  Database connection not available: {e}")
+
+
+def _warm_up() -> None:
+    """Production startup: routers and services in the background, reported when done"""
+    database = threading.Thread(target=_prewarm_database, name="db-prewarm", daemon=True)
+    database.start()
+    try:
+        router_loader.load()
+        _start_background_services()
+    except Exception:
+        pass  # Logged by the loader; requests retry the import
+    database.join()
+    startup_report.log()
+
+
 @app.on_event("startup")
 async def startup_event():
     """Initialize database connection when app starts"""
+    startup_report.record('app import', app_imported_at - _import_started)
+
+    if PRODUCTION:
+        threading.Thread(target=_warm_up, name="startup-warm-up", daemon=True).start()
+        return
+
+    started = time.perf_counter()
     try:
         from database_connection import init_db
         init_db()
+        startup_report.database = 'connected'
         logger.info("✅ Database connection initialized")
     except Exception as e:
+        startup_report.database = 'unavailable'
         logger.warning(f"⚠️  Database connection not available: {e}")
         logger.info("   You can still run the API, but database features won't work")
         logger.info("   Make sure you've created .env file and installed dependencies")
+    startup_report.record('database', time.perf_counter() - started)
+
+    _start_background_services()
+    startup_report.log()
 
     # Auto-open Swagger UI unless explicitly disabled
     if os.getenv("OPEN_SWAGGER", "1") not in ("0", "false", "False"):
         _open_swagger_after_start(1.0)
 
-# Routers
-from routes.users import router as users_router
-from routes.roles import router as roles_router
-from routes.companies import router as companies_router
-from routes.permissions import router as permissions_router
-from routes.role_permissions import router as role_permissions_router
-from routes.user_permissions import router as user_permissions_router
-from routes.tasks import router as tasks_router
-from routes.projects import router as projects_router
-from routes.documents import router as documents_router
-
-app.include_router(users_router)
-app.include_router(roles_router)
-app.include_router(companies_router)
-app.include_router(permissions_router)
-app.include_router(role_permissions_router)
-app.include_router(user_permissions_router)
-app.include_router(tasks_router)
-app.include_router(projects_router)
-app.include_router(documents_router)
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Write out queued audit entries, stop worker pools and close the database pool"""
+    if _background_services_started.is_set():
+        from services.import_service import ImportService
+        ImportService.shutdown()
+
+        from services.audit_service import AuditService
+        AuditService.shutdown()
+
+        from services.password_service import PasswordService
+        PasswordService.shutdown()
+
+        from services.event_service import EventService
+        EventService.shutdown()
+
+    from database_connection import dispose_engine
+    dispose_engine()
+
+
+# Routers (imported after startup in production mode)
+if not PRODUCTION:
+    router_loader.load()
 
 
 @app.get("/")
@@ -107,7 +236,52 @@ async def health_check():
     })
 
 
+@app.get("/health/ready")
+async def readiness_check():
+    """Readiness: routers loaded, background services started and the database reachable"""
+    import database_connection
+    database = startup_report.database
+    if database_connection.breaker.state != "closed" or (
+        database_connection.pool_manager is not None and database_connection.pool_manager.healthy is False
+    ):
+        database = "unavailable"  # Circuit open or failed its last background health check
+    checks = {
+        "routers": router_loader.loaded.is_set(),
+        "background_services": _background_services_started.is_set(),
+        "database": database,
+    }
+    ready = checks["routers"] and checks["background_services"] and checks["database"] == "connected"
+    return JSONResponse(
+        {"status": "ready" if ready else "starting", "checks": checks},
+        status_code=200 if ready else 503
+    )
+
+
+@app.get("/health/startup")
+async def startup_info():
+    """Startup timings: phases and per-router import times"""
+    return JSONResponse({"mode": APP_MODE, **startup_report.as_dict()})
+
+
+@app.get("/health/pool")
+async def pool_info():
+    """Database pool state: size and bounds, usage, checkout waits, health checks, resizes and the circuit breaker"""
+    import database_connection
+    circuit = database_connection.breaker.snapshot()
+    if database_connection.pool_manager is None:
+        return JSONResponse({"status": "not initialized", "circuit": circuit}, status_code=503)
+    return JSONResponse({**database_connection.pool_manager.snapshot(), "circuit": circuit})
+
+
+@app.get("/health/admission")
+async def admission_info():
+    """Admission control: requests in flight, admitted, queued and shed"""
+    return JSONResponse(admission_controller.snapshot())
+
+
+app_imported_at = time.perf_counter()
+
+
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
-
+    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=not PRODUCTION)
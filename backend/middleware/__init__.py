@@ -0,0 +1,22 @@
+"""
+Middleware package - ASGI middleware shared by all routes.
+"""
+from .request_context import RequestContextMiddleware, get_request_context
+from .compression import CompressionMiddleware
+from .lazy_routers import LazyRouterMiddleware
+from .deadline import DeadlineMiddleware
+from .coalescing import CoalescingMiddleware
+from .admission import AdmissionMiddleware, AdmissionController
+from .idempotency import IdempotencyMiddleware
+
+__all__ = [
+    'RequestContextMiddleware',
+    'get_request_context',
+    'CompressionMiddleware',
+    'LazyRouterMiddleware',
+    'DeadlineMiddleware',
+    'CoalescingMiddleware',
+    'AdmissionMiddleware',
+    'AdmissionController',
+    'IdempotencyMiddleware',
+]
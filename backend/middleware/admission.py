@@ -0,0 +1,210 @@
+"""
+Admission control middleware.
+All tenants share one process, threadpool and database pool, so requests are
+admitted per tenant (the caller's company; see SessionService.cached_tenant)
+before any work is done:
+
+- a token bucket per tenant limits the request rate (429 + Retry-After);
+- per-tenant caps limit how many requests a tenant has in flight, with a
+  separate, small cap for bulk work (exports, imports, portfolio analytics);
+- process-wide, interactive requests may use MAX_IN_FLIGHT slots and wait up
+  to QUEUE_TIMEOUT_MS for one, while bulk requests only get in while less
+  than BULK_SHARE of the slots are busy and the database pool has idle
+  connections; otherwise they are shed at once (503 + Retry-After).
+
+Load is shed here, in milliseconds, instead of requests queueing on the
+database pool until its timeout expires. Callers whose tenant is not known
+yet (anonymous, or a token this process has not verified) are keyed by IP.
+"""
+from collections import OrderedDict
+from typing import Callable, Optional, Dict, Iterable, Tuple
+import asyncio
+import math
+import os
+import re
+import time
+
+from starlette.responses import JSONResponse
+
+DEFAULT_BULK_PATTERNS = (
+    r'/tasks/export$',
+    r'/tasks/import$',
+    r'^/api/analytics/portfolio',
+)
+
+DEFAULT_EXEMPT_PATTERNS = (
+    r'^/$',
+    r'^/health',
+    r'^/api/stream',  # Long-lived event streams would hold a slot forever
+)
+
+
+class TokenBucket:
+    """Refills `rate` tokens per second up to `burst`"""
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def take(self) -> float:
+        """Take a token; returns 0 on success, else the seconds until one is available"""
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+
+class Rejection(Exception):
+    def __init__(self, status_code: int, detail: str, retry_after: float):
+        self.status_code = status_code
+        self.detail = detail
+        self.retry_after = max(1, math.ceil(retry_after))
+
+
+class AdmissionController:
+    """Per-tenant rate limits and concurrency caps, process-wide priority lanes"""
+
+    # Configuration (overridable through the environment)
+    TENANT_RATE = float(os.getenv("ADMISSION_TENANT_RATE", "50"))  # Requests per second
+    TENANT_BURST = float(os.getenv("ADMISSION_TENANT_BURST", "100"))
+    TENANT_MAX_IN_FLIGHT = int(os.getenv("ADMISSION_TENANT_MAX_IN_FLIGHT", "16"))
+    TENANT_MAX_BULK = int(os.getenv("ADMISSION_TENANT_MAX_BULK", "2"))
+    MAX_IN_FLIGHT = int(os.getenv("ADMISSION_MAX_IN_FLIGHT", "64"))
+    BULK_SHARE = float(os.getenv("ADMISSION_BULK_SHARE", "0.5"))
+    QUEUE_TIMEOUT_MS = int(os.getenv("ADMISSION_QUEUE_TIMEOUT_MS", "500"))
+    MAX_TENANTS = 10000
+
+    def __init__(self):
+        self.buckets: "OrderedDict[str, TokenBucket]" = OrderedDict()
+        self.tenant_in_flight: Dict[Tuple[str, str], int] = {}
+        self.in_flight = 0
+        self.bulk_in_flight = 0
+        self._slot_freed: Optional[asyncio.Condition] = None
+        self.stats = {'admitted': 0, 'queued': 0, 'rate_limited': 0, 'tenant_capped': 0, 'shed': 0}
+        # Hooks set by the app: tenant of a bearer token, and whether the database pool is exhausted
+        self.tenant_resolver: Callable[[str], Optional[str]] = lambda token: None
+        self.database_saturated: Callable[[], bool] = lambda: False
+
+    def bucket(self, tenant: str) -> TokenBucket:
+        bucket = self.buckets.get(tenant)
+        if bucket is None:
+            bucket = self.buckets[tenant] = TokenBucket(self.TENANT_RATE, self.TENANT_BURST)
+            if len(self.buckets) > self.MAX_TENANTS:
+                self.buckets.popitem(last=False)
+        else:
+            self.buckets.move_to_end(tenant)
+        return bucket
+
+    def reject(self, counter: str, status_code: int, detail: str, retry_after: float) -> Rejection:
+        self.stats[counter] += 1
+        return Rejection(status_code, detail, retry_after)
+
+    async def admit(self, tenant: str, lane: str) -> None:
+        """Take a slot for the request or raise Rejection"""
+        wait = self.bucket(tenant).take()
+        if wait:
+            raise self.reject('rate_limited', 429, "Too many requests, please slow down", wait)
+
+        cap = self.TENANT_MAX_BULK if lane == 'bulk' else self.TENANT_MAX_IN_FLIGHT
+        if self.tenant_in_flight.get((tenant, lane), 0) >= cap:
+            raise self.reject('tenant_capped', 429, "Too many concurrent requests", 1)
+
+        if lane == 'bulk':
+            if self.in_flight >= self.MAX_IN_FLIGHT * self.BULK_SHARE or self.database_saturated():
+                raise self.reject('shed', 503, "Server is busy, please retry bulk operations later", 5)
+        elif self.in_flight >= self.MAX_IN_FLIGHT:
+            self.stats['queued'] += 1
+            if self._slot_freed is None:
+                self._slot_freed = asyncio.Condition()
+            try:
+                async with self._slot_freed:
+                    await asyncio.wait_for(
+                        self._slot_freed.wait_for(lambda: self.in_flight < self.MAX_IN_FLIGHT),
+                        self.QUEUE_TIMEOUT_MS / 1000
+                    )
+            except asyncio.TimeoutError:
+                raise self.reject('shed', 503, "Server is busy, please retry shortly", 1)
+
+        self.in_flight += 1
+        if lane == 'bulk':
+            self.bulk_in_flight += 1
+        self.tenant_in_flight[(tenant, lane)] = self.tenant_in_flight.get((tenant, lane), 0) + 1
+        self.stats['admitted'] += 1
+
+    async def release(self, tenant: str, lane: str) -> None:
+        self.in_flight -= 1
+        if lane == 'bulk':
+            self.bulk_in_flight -= 1
+        remaining = self.tenant_in_flight[(tenant, lane)] - 1
+        if remaining:
+            self.tenant_in_flight[(tenant, lane)] = remaining
+        else:
+            del self.tenant_in_flight[(tenant, lane)]
+        if self._slot_freed is not None:
+            async with self._slot_freed:
+                self._slot_freed.notify()
+
+    def snapshot(self) -> Dict:
+        return {
+            'in_flight': self.in_flight,
+            'bulk_in_flight': self.bulk_in_flight,
+            'max_in_flight': self.MAX_IN_FLIGHT,
+            'tenants_in_flight': len({tenant for tenant, _ in self.tenant_in_flight}),
+            **self.stats,
+        }
+
+
+class AdmissionMiddleware:
+    """Pure ASGI middleware admitting or shedding each HTTP request"""
+
+    def __init__(
+        self,
+        app,
+        controller: AdmissionController,
+        bulk_patterns: Iterable[str] = DEFAULT_BULK_PATTERNS,
+        exempt_patterns: Iterable[str] = DEFAULT_EXEMPT_PATTERNS
+    ):
+        self.app = app
+        self.controller = controller
+        self.bulk = re.compile('|'.join(bulk_patterns))
+        self.exempt = re.compile('|'.join(exempt_patterns))
+
+    def tenant(self, scope) -> str:
+        for name, value in scope.get('headers') or []:
+            if name == b'authorization':
+                scheme, _, token = value.decode('latin-1').partition(' ')
+                if scheme.lower() == 'bearer' and token:
+                    tenant = self.controller.tenant_resolver(token.strip())
+                    if tenant:
+                        return tenant
+                break
+        client = scope.get('client')
+        return f"ip:{client[0] if client else 'unknown'}"
+
+    async def __call__(self, scope, receive, send):
+        path = scope.get('path', '')
+        if scope['type'] != 'http' or scope['method'] == 'OPTIONS' or self.exempt.search(path):
+            await self.app(scope, receive, send)
+            return
+
+        tenant = self.tenant(scope)
+        lane = 'bulk' if self.bulk.search(path) else 'interactive'
+        try:
+            await self.controller.admit(tenant, lane)
+        except Rejection as rejection:
+            response = JSONResponse(
+                {"detail": rejection.detail},
+                status_code=rejection.status_code,
+                headers={"Retry-After": str(rejection.retry_after)}
+            )
+            await response(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            await self.controller.release(tenant, lane)
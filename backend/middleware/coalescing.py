@@ -0,0 +1,140 @@
+"""
+Request coalescing middleware (single flight).
+Identical GET requests that arrive while the first one is still being
+handled do not run the route again: they wait for the first response and
+get a copy of it. Requests are identical when they have the same path, query
+string and credentials (Authorization / Cookie), and the same Accept,
+If-None-Match and X-Request-Timeout headers, so callers never share a
+response built for different permissions or a different time budget.
+
+Only in-flight work is shared, nothing is cached: a read that starts after
+a write (POST/PUT/PATCH/DELETE) in this process has completed never joins
+a flight started before it. Responses that cannot be shared (errors and
+429s, Set-Cookie, bodies over MAX_BODY_BYTES, failures before a response was
+produced, or a leader whose client went away) make the waiting requests run
+on their own. Waiting is bounded by the waiter's own request deadline.
+
+It sits inside the CORS and compression middleware, so per-client headers
+and encodings are still applied to every copy.
+"""
+from typing import Dict, Tuple, Optional, Iterable
+import asyncio
+import os
+import re
+
+from starlette.responses import JSONResponse
+
+from deadlines import DeadlineExceeded, current_deadline
+
+MUTATING_METHODS = frozenset({'POST', 'PUT', 'PATCH', 'DELETE'})
+
+# Besides 5xx: rate limits are per caller, 499 means the leader's client went away
+NOT_SHARED_STATUSES = frozenset({429, 499})
+
+DEFAULT_EXEMPT_PATTERNS = (
+    r'^/api/stream',          # Server-sent events
+    r'/tasks/export$',        # Streaming exports
+    r'/errors$',              # Import error files
+    r'/versions/\d+/content$',  # Document version downloads
+)
+
+
+class Flight:
+    """One in-flight GET and the requests waiting for its response"""
+
+    def __init__(self, generation: int):
+        self.generation = generation
+        self.waiters = 0
+        self.result: "asyncio.Future[Optional[Tuple[Dict, bytes]]]" = asyncio.get_running_loop().create_future()
+
+
+class CoalescingMiddleware:
+    """Pure ASGI middleware sharing the response of identical concurrent GETs"""
+
+    # Configuration (overridable through the environment)
+    MAX_BODY_BYTES = int(os.getenv("COALESCE_MAX_BODY_BYTES", str(8 * 1024 * 1024)))
+    KEY_HEADERS = (b'authorization', b'cookie', b'accept', b'if-none-match', b'x-request-timeout')
+
+    def __init__(self, app, exempt_patterns: Iterable[str] = DEFAULT_EXEMPT_PATTERNS):
+        self.app = app
+        self.exempt = re.compile('|'.join(exempt_patterns))
+        self.flights: Dict[Tuple, Flight] = {}
+        self.generation = 0  # Bumped by every completed write
+        self.stats = {'flights': 0, 'coalesced': 0, 'reruns': 0, 'timeouts': 0}
+
+    def request_key(self, scope) -> Tuple:
+        headers = tuple(sorted(
+            (name, value) for name, value in scope.get('headers') or [] if name in self.KEY_HEADERS
+        ))
+        return scope['path'], scope.get('query_string', b''), headers
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        method = scope['method']
+        if method != 'GET' or self.exempt.search(scope['path']):
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                if method in MUTATING_METHODS:
+                    self.generation += 1
+            return
+
+        key = self.request_key(scope)
+        flight = self.flights.get(key)
+        if flight is not None and flight.generation == self.generation:
+            flight.waiters += 1
+            self.stats['coalesced'] += 1
+            deadline = current_deadline()
+            try:
+                response = await asyncio.wait_for(
+                    asyncio.shield(flight.result), None if deadline is None else max(0, deadline.remaining())
+                )
+            except asyncio.TimeoutError:
+                self.stats['timeouts'] += 1
+                timeout = DeadlineExceeded()
+                await JSONResponse({"detail": timeout.detail}, status_code=timeout.status_code)(scope, receive, send)
+                return
+            if response is not None:
+                start, body = response
+                await send(start)
+                await send({'type': 'http.response.body', 'body': body})
+                return
+            self.stats['reruns'] += 1
+            await self.app(scope, receive, send)
+            return
+
+        flight = Flight(self.generation)
+        self.flights[key] = flight
+        self.stats['flights'] += 1
+        captured = {'start': None, 'chunks': [], 'size': 0, 'shareable': True, 'complete': False}
+
+        async def send_capturing(message):
+            if message['type'] == 'http.response.start':
+                captured['start'] = message
+                if message['status'] >= 500 or message['status'] in NOT_SHARED_STATUSES or any(
+                    name.lower() == b'set-cookie' for name, _ in message.get('headers') or []
+                ):
+                    captured['shareable'] = False
+            elif message['type'] == 'http.response.body' and captured['shareable']:
+                body = message.get('body', b'')
+                captured['size'] += len(body)
+                if captured['size'] > self.MAX_BODY_BYTES:
+                    captured['shareable'] = False
+                    captured['chunks'] = []
+                else:
+                    captured['chunks'].append(body)
+                captured['complete'] = not message.get('more_body', False)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_capturing)
+        finally:
+            if self.flights.get(key) is flight:
+                del self.flights[key]
+            if flight.waiters and captured['shareable'] and captured['start'] is not None and captured['complete']:
+                flight.result.set_result((captured['start'], b''.join(captured['chunks'])))
+            else:
+                flight.result.set_result(None)
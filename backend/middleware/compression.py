@@ -0,0 +1,258 @@
+"""
+Response compression middleware.
+Compresses responses with brotli or gzip (per Accept-Encoding) when their
+content type is on the allowlist and the body is at least MIN_SIZE bytes.
+Streaming responses of an allowed type are compressed chunk by chunk;
+event streams are never touched.
+
+Responses that carry an ETag are served from a small LRU of compressed
+bodies keyed by (path, ETag, encoding), so hot cacheable responses (e.g. the
+iCal feeds) are compressed once per version instead of on every hit. The
+compressed variant gets its own ETag ("<etag>-gzip"); the suffix is stripped
+from If-None-Match on the way in so routes keep comparing their own tags.
+"""
+from collections import OrderedDict
+from typing import Optional, Dict, List, Tuple
+import gzip
+import os
+import threading
+import zlib
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+
+class CompressedBodyCache:
+    """Bounded LRU of compressed bodies (by entry count and total bytes)"""
+
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Tuple[str, str, str], bytes]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Tuple[str, str, str]) -> Optional[bytes]:
+        with self._lock:
+            body = self._entries.get(key)
+            if body is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return body
+
+    def put(self, key: Tuple[str, str, str], body: bytes) -> None:
+        if self.max_entries <= 0 or len(body) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous)
+            self._entries[key] = body
+            self._size += len(body)
+            while len(self._entries) > self.max_entries or self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def parse_accept_encoding(header: str) -> Dict[str, float]:
+    """'gzip, br;q=0.8' -> {'gzip': 1.0, 'br': 0.8}"""
+    encodings = {}
+    for part in header.split(','):
+        name, _, params = part.strip().partition(';')
+        if not name:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        encodings[name.strip().lower()] = quality
+    return encodings
+
+
+class CompressionMiddleware:
+    """Pure ASGI middleware compressing allowlisted responses above a size threshold"""
+
+    # Configuration (overridable through the environment)
+    MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+    GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+    BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4"))  # Fast enough for dynamic content
+    CONTENT_TYPES = (
+        'application/json',
+        'application/x-ndjson',
+        'application/javascript',
+        'text/plain',
+        'text/csv',
+        'text/html',
+        'text/css',
+        'text/calendar',
+    )
+
+    cache = CompressedBodyCache(
+        int(os.getenv("COMPRESSION_CACHE_ENTRIES", "256")),
+        int(os.getenv("COMPRESSION_CACHE_MAX_BYTES", str(16 * 1024 * 1024)))
+    )
+
+    def __init__(self, app):
+        self.app = app
+
+    def choose_encoding(self, accept_encoding: str) -> Optional[str]:
+        accepted = parse_accept_encoding(accept_encoding)
+        wildcard = accepted.get('*', 0.0)
+        candidates = ['br', 'gzip'] if brotli is not None else ['gzip']
+        best, best_quality = None, 0.0
+        for encoding in candidates:
+            quality = accepted.get(encoding, wildcard)
+            if quality > best_quality:
+                best, best_quality = encoding, quality
+        return best
+
+    def compress(self, body: bytes, encoding: str) -> bytes:
+        if encoding == 'br':
+            return brotli.compress(body, quality=self.BROTLI_QUALITY)
+        return gzip.compress(body, compresslevel=self.GZIP_LEVEL, mtime=0)
+
+    def compressor(self, encoding: str):
+        """Incremental compressor for streaming bodies: (compress(chunk), finish())"""
+        if encoding == 'br':
+            stream = brotli.Compressor(quality=self.BROTLI_QUALITY)
+            return stream.process, stream.finish
+        stream = zlib.compressobj(self.GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)  # gzip container
+        return stream.compress, stream.flush
+
+    def is_compressible(self, headers: List[Tuple[bytes, bytes]]) -> bool:
+        content_type = b''
+        for name, value in headers:
+            lowered = name.lower()
+            if lowered == b'content-encoding':
+                return False
+            if lowered == b'content-type':
+                content_type = value
+        media_type = content_type.decode('latin-1').split(';')[0].strip().lower()
+        return media_type in self.CONTENT_TYPES
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        request_headers = scope.get('headers') or []
+        accept_encoding = b''
+        for name, value in request_headers:
+            if name == b'accept-encoding':
+                accept_encoding = value
+                break
+        encoding = self.choose_encoding(accept_encoding.decode('latin-1')) if accept_encoding else None
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        # Routes compare If-None-Match against their own (identity) ETags
+        suffix = f'-{encoding}"'.encode()
+        revalidating_variant = any(
+            name == b'if-none-match' and suffix in value for name, value in request_headers
+        )
+        if revalidating_variant:
+            scope = {
+                **scope,
+                'headers': [
+                    (name, value.replace(suffix, b'"') if name == b'if-none-match' else value)
+                    for name, value in request_headers
+                ],
+            }
+
+        state = {'start': None, 'compress': None, 'finish': None, 'passthrough': False}
+
+        async def send_compressed(message):
+            if state['passthrough']:
+                await send(message)
+                return
+
+            if message['type'] == 'http.response.start':
+                if message['status'] == 304 and revalidating_variant:
+                    # The client holds the compressed variant: confirm its ETag
+                    state['passthrough'] = True
+                    await send({**message, 'headers': [
+                        (name, value[:-1] + suffix if name.lower() == b'etag' and value.endswith(b'"') else value)
+                        for name, value in message.get('headers') or []
+                    ]})
+                    return
+                state['start'] = message
+                return
+
+            if message['type'] != 'http.response.body':
+                await send(message)
+                return
+
+            start = state['start']
+            body = message.get('body', b'')
+            more_body = message.get('more_body', False)
+
+            if state['compress'] is not None:
+                # Continuing a compressed stream
+                chunk = state['compress'](body)
+                if not more_body:
+                    chunk += state['finish']()
+                if chunk or not more_body:
+                    await send({'type': 'http.response.body', 'body': chunk, 'more_body': more_body})
+                return
+
+            headers = list(start.get('headers') or [])
+            if (
+                start['status'] < 200 or start['status'] in (204, 304)
+                or not self.is_compressible(headers)
+                or (not more_body and len(body) < self.MIN_SIZE)
+            ):
+                state['passthrough'] = True
+                await send(start)
+                await send(message)
+                return
+
+            etag = None
+            headers_out = []
+            for name, value in headers:
+                lowered = name.lower()
+                if lowered == b'content-length':
+                    continue
+                if lowered == b'etag':
+                    etag = value.decode('latin-1')
+                    if etag.endswith('"'):
+                        value = f'{etag[:-1]}-{encoding}"'.encode('latin-1')
+                if lowered == b'vary':
+                    continue
+                headers_out.append((name, value))
+            vary = [value for name, value in headers if name.lower() == b'vary']
+            headers_out.append((b'vary', b', '.join(vary + [b'Accept-Encoding'])))
+            headers_out.append((b'content-encoding', encoding.encode()))
+
+            if not more_body:
+                key = (scope.get('path', ''), etag, encoding) if etag else None
+                compressed = self.cache.get(key) if key else None
+                if compressed is None:
+                    compressed = self.compress(body, encoding)
+                    if key:
+                        self.cache.put(key, compressed)
+                headers_out.append((b'content-length', str(len(compressed)).encode()))
+                await send({**start, 'headers': headers_out})
+                await send({'type': 'http.response.body', 'body': compressed})
+                return
+
+            # Streaming body: compress incrementally
+            state['compress'], state['finish'] = self.compressor(encoding)
+            await send({**start, 'headers': headers_out})
+            chunk = state['compress'](body)
+            if chunk:
+                await send({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+
+        await self.app(scope, receive, send_compressed)
@@ -0,0 +1,82 @@
+"""
+Request deadline middleware.
+Gives each HTTP request a deadline (REQUEST_TIMEOUT_SECONDS, or less when the
+client sends X-Request-Timeout) that database statements honour (see
+deadlines.py), and cancels the request's statements when the client
+disconnects before the response is complete. Streaming and upload endpoints
+are exempt: they legitimately run for as long as the transfer takes.
+"""
+from typing import Iterable
+import asyncio
+import re
+import threading
+
+from deadlines import Deadline, request_deadline
+
+DEFAULT_EXEMPT_PATTERNS = (
+    r'^/api/stream',          # Server-sent events
+    r'/tasks/export$',        # Streaming exports
+    r'/tasks/import$',        # Uploads of import files
+    r'/documents/upload$',    # Document uploads
+    r'^/api/documents/\d+/versions(/\d+/content)?$',  # Version uploads and downloads
+)
+
+
+class DeadlineMiddleware:
+    """Pure ASGI middleware setting request_deadline and watching for client disconnects"""
+
+    def __init__(self, app, timeout: float = 30.0, exempt_patterns: Iterable[str] = DEFAULT_EXEMPT_PATTERNS):
+        self.app = app
+        self.timeout = timeout
+        self.exempt = re.compile('|'.join(exempt_patterns))
+
+    def request_timeout(self, scope) -> float:
+        for name, value in scope.get('headers') or []:
+            if name == b'x-request-timeout':
+                try:
+                    requested = float(value)
+                except ValueError:
+                    break
+                if requested > 0:
+                    return min(self.timeout, requested)
+        return self.timeout
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http' or self.exempt.search(scope.get('path', '')):
+            await self.app(scope, receive, send)
+            return
+
+        deadline = Deadline(self.request_timeout(scope))
+        response_complete = False
+        # The listener is the only reader of `receive`; the app reads through the queue
+        messages: asyncio.Queue = asyncio.Queue(maxsize=1)
+
+        async def listen():
+            while True:
+                message = await receive()
+                if message['type'] == 'http.disconnect':
+                    if not response_complete:
+                        threading.Thread(target=deadline.cancel, name="query-cancel", daemon=True).start()
+                    await messages.put(message)
+                    return
+                await messages.put(message)
+
+        listener = asyncio.ensure_future(listen())
+
+        async def receive_from_listener():
+            if listener.done() and messages.empty():
+                return {'type': 'http.disconnect'}
+            return await messages.get()
+
+        async def send_tracking_completion(message):
+            nonlocal response_complete
+            if message['type'] == 'http.response.body' and not message.get('more_body', False):
+                response_complete = True
+            await send(message)
+
+        token = request_deadline.set(deadline)
+        try:
+            await self.app(scope, receive_from_listener, send_tracking_completion)
+        finally:
+            request_deadline.reset(token)
+            listener.cancel()
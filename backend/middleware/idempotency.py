@@ -0,0 +1,241 @@
+"""
+Idempotency-Key middleware.
+Clients on flaky networks retry creations whose response they never got. A
+POST to one of the creation endpoints that carries an `Idempotency-Key`
+header is handled at most once per key (see IdempotencyService):
+
+- the first request claims the key, runs, and its response is stored;
+- retries get the stored response back (`Idempotent-Replayed: true`)
+  without running the route again;
+- duplicates arriving while the first is still running wait for it (up to
+  WAIT_SECONDS, then 409 + Retry-After) and get its response;
+- reusing a key for a different request body is rejected with 422.
+
+Keys are scoped to the method, path and Authorization header, so different
+users can never see each other's responses. Failed requests (5xx, 429 or an
+exception) release their key so that the retry runs again. Requests without
+the header are not affected.
+"""
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Tuple
+import asyncio
+import hashlib
+import logging
+import os
+import re
+import time
+import uuid
+
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import JSONResponse
+
+from deadlines import request_deadline
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PATTERNS = (
+    r'^/api/tasks$',                              # Task creation
+    r'^/api/projects/\d+/documents/upload$',      # Document uploads
+    r'^/api/documents/\d+/versions$',             # Document version uploads
+)
+
+NOT_STORED_STATUSES = frozenset({429, 499})
+
+
+def _call_store(method: str, *args):
+    """Runs in the threadpool: the services are imported lazily in production"""
+    from services.idempotency_service import IdempotencyService
+    # Key bookkeeping must not fail because the request's own time budget ran out
+    request_deadline.set(None)  # Only affects this call's copy of the context
+    return getattr(IdempotencyService, method)(*args)
+
+
+class IdempotencyMiddleware:
+    """Pure ASGI middleware replaying the stored response of retried POSTs"""
+
+    # Configuration (overridable through the environment)
+    WAIT_SECONDS = float(os.getenv("IDEMPOTENCY_WAIT_SECONDS", "10"))
+    FINGERPRINT_BYTES = int(os.getenv("IDEMPOTENCY_FINGERPRINT_BYTES", str(1024 * 1024)))
+    MAX_RESPONSE_BYTES = int(os.getenv("IDEMPOTENCY_MAX_RESPONSE_BYTES", str(1024 * 1024)))
+    POLL_INTERVAL = 0.1
+    PURGE_INTERVAL = 300
+    MAX_KEY_LENGTH = 255
+
+    def __init__(self, app, patterns: Iterable[str] = DEFAULT_PATTERNS):
+        self.app = app
+        self.paths = re.compile('|'.join(patterns))
+        self.running: Dict[str, asyncio.Event] = {}  # key_hash -> set when this process' request finishes
+        self.next_purge = 0.0
+        self.stats = {'executed': 0, 'replayed': 0, 'waited': 0, 'conflicts': 0, 'mismatches': 0}
+
+    @staticmethod
+    async def store(method: str, *args):
+        return await run_in_threadpool(_call_store, method, *args)
+
+    @staticmethod
+    def header(scope, name: bytes) -> Optional[bytes]:
+        for header_name, value in scope.get('headers') or []:
+            if header_name == name:
+                return value
+        return None
+
+    async def read_prefix(self, receive) -> Tuple[List[Dict], bool]:
+        """Read the request body up to FINGERPRINT_BYTES; returns the messages and whether it is complete"""
+        messages, size = [], 0
+        while True:
+            message = await receive()
+            messages.append(message)
+            if message['type'] != 'http.request':
+                return messages, False
+            size += len(message.get('body', b''))
+            if not message.get('more_body', False):
+                return messages, True
+            if size >= self.FINGERPRINT_BYTES:
+                return messages, False
+
+    def fingerprints(self, scope, key: bytes, messages: List[Dict], complete: bool) -> Tuple[str, str]:
+        key_hash = hashlib.sha256(b'\0'.join((
+            scope['method'].encode(), scope['path'].encode(), self.header(scope, b'authorization') or b'', key
+        ))).hexdigest()
+        request = hashlib.sha256(scope.get('query_string', b''))
+        request.update(b'\0' + (self.header(scope, b'content-type') or b''))
+        if not complete:
+            # Large uploads are identified by their first FINGERPRINT_BYTES and their length
+            request.update(b'\0' + (self.header(scope, b'content-length') or b''))
+        request.update(b'\0')
+        for message in messages:
+            request.update(message.get('body', b''))
+        return key_hash, request.hexdigest()
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http' or scope['method'] != 'POST' or not self.paths.search(scope['path']):
+            await self.app(scope, receive, send)
+            return
+        key = self.header(scope, b'idempotency-key')
+        if key is None:
+            await self.app(scope, receive, send)
+            return
+        key = key.strip()
+        if not key or len(key) > self.MAX_KEY_LENGTH:
+            response = JSONResponse(
+                {"detail": f"Idempotency-Key must be 1 to {self.MAX_KEY_LENGTH} characters"},
+                status_code=400
+            )
+            await response(scope, receive, send)
+            return
+
+        messages, complete = await self.read_prefix(receive)
+        key_hash, request_hash = self.fingerprints(scope, key, messages, complete)
+        buffered = deque(messages)
+
+        async def replay_receive():
+            if buffered:
+                return buffered.popleft()
+            return await receive()
+
+        owner = uuid.uuid4().hex
+        give_up_at = time.monotonic() + self.WAIT_SECONDS
+        waited = False
+        while True:
+            try:
+                outcome, stored = await self.store('begin', key_hash, request_hash, owner)
+            except Exception as e:
+                logger.error(f"Idempotency store unavailable: {e}")
+                response = JSONResponse(
+                    {"detail": "Service temporarily unavailable, please retry"},
+                    status_code=503, headers={"Retry-After": "1"}
+                )
+                await response(scope, receive, send)
+                return
+            if outcome == 'started':
+                break
+            if outcome == 'completed':
+                self.stats['replayed'] += 1
+                await self.replay(stored, send)
+                return
+            if outcome == 'mismatch':
+                self.stats['mismatches'] += 1
+                response = JSONResponse(
+                    {"detail": "Idempotency-Key was already used for a different request"},
+                    status_code=422
+                )
+                await response(scope, receive, send)
+                return
+
+            remaining = give_up_at - time.monotonic()
+            if remaining <= 0:
+                self.stats['conflicts'] += 1
+                response = JSONResponse(
+                    {"detail": "A request with this Idempotency-Key is still being processed"},
+                    status_code=409, headers={"Retry-After": "1"}
+                )
+                await response(scope, receive, send)
+                return
+            if not waited:
+                waited = True
+                self.stats['waited'] += 1
+            running = self.running.get(key_hash)
+            if running is not None:
+                try:
+                    await asyncio.wait_for(running.wait(), remaining)
+                except asyncio.TimeoutError:
+                    pass
+            else:
+                await asyncio.sleep(min(self.POLL_INTERVAL, remaining))
+
+        finished = self.running[key_hash] = asyncio.Event()
+        self.stats['executed'] += 1
+        captured = {'status': None, 'headers': [], 'chunks': [], 'size': 0, 'complete': False}
+
+        async def send_capturing(message):
+            if message['type'] == 'http.response.start':
+                captured['status'] = message['status']
+                captured['headers'] = [
+                    [name.decode('latin-1'), value.decode('latin-1')]
+                    for name, value in message.get('headers') or []
+                    if name.lower() != b'set-cookie'
+                ]
+            elif message['type'] == 'http.response.body':
+                body = message.get('body', b'')
+                captured['size'] += len(body)
+                if captured['size'] <= self.MAX_RESPONSE_BYTES:
+                    captured['chunks'].append(body)
+                captured['complete'] = not message.get('more_body', False)
+            await send(message)
+
+        try:
+            await self.app(scope, replay_receive, send_capturing)
+        finally:
+            try:
+                await asyncio.shield(self.finish(key_hash, owner, captured))
+            finally:
+                finished.set()
+                if self.running.get(key_hash) is finished:
+                    del self.running[key_hash]
+
+    async def finish(self, key_hash: str, owner: str, captured: Dict) -> None:
+        """Store the response for retries, or release the key when it must not be replayed"""
+        status_code = captured['status']
+        storable = (
+            status_code is not None and status_code < 500 and status_code not in NOT_STORED_STATUSES
+            and captured['complete'] and captured['size'] <= self.MAX_RESPONSE_BYTES
+        )
+        try:
+            if storable:
+                await self.store('complete', key_hash, owner, status_code, captured['headers'],
+                                 b''.join(captured['chunks']))
+            else:
+                await self.store('abandon', key_hash, owner)
+            if time.monotonic() >= self.next_purge:
+                self.next_purge = time.monotonic() + self.PURGE_INTERVAL
+                await self.store('purge_expired')
+        except Exception as e:
+            # The key stays locked until LOCK_SECONDS pass; a retry then runs again
+            logger.warning(f"Could not record idempotency key outcome: {e}")
+
+    @staticmethod
+    async def replay(stored: Dict, send) -> None:
+        headers = [(name.encode('latin-1'), value.encode('latin-1')) for name, value in stored['headers']]
+        headers.append((b'idempotent-replayed', b'true'))
+        await send({'type': 'http.response.start', 'status': stored['status'], 'headers': headers})
+        await send({'type': 'http.response.body', 'body': stored['body']})
@@ -0,0 +1,26 @@
+"""
+Lazy router middleware.
+In production mode the routers are imported after the server starts
+listening (see startup.py). Until they are in place, requests other than the
+health checks wait for the import here instead of falling through to a 404.
+"""
+from starlette.concurrency import run_in_threadpool
+
+
+class LazyRouterMiddleware:
+    """Pure ASGI middleware holding requests until the routers are loaded"""
+
+    def __init__(self, app, loader, exempt_paths=('/', '/health', '/health/ready', '/health/startup', '/health/pool', '/health/admission')):
+        self.app = app
+        self.loader = loader
+        self.exempt_paths = frozenset(exempt_paths)
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope['type'] in ('http', 'websocket')
+            and not self.loader.loaded.is_set()
+            and scope.get('path') not in self.exempt_paths
+        ):
+            # Joins the background import (or retries it after a failure)
+            await run_in_threadpool(self.loader.load)
+        await self.app(scope, receive, send)
@@ -0,0 +1,47 @@
+"""
+Request context middleware.
+Exposes per-request metadata (client IP, user agent) to services through a
+context variable, so write paths can attribute audit entries without every
+route having to pass the Request object down.
+"""
+from contextvars import ContextVar
+from typing import Optional, Dict
+
+
+# Populated for the duration of each HTTP request; empty outside requests
+request_context: ContextVar[Dict[str, Optional[str]]] = ContextVar('request_context', default={})
+
+
+def get_request_context() -> Dict[str, Optional[str]]:
+    """Get metadata of the request being handled (empty dict outside requests)"""
+    return request_context.get()
+
+
+class RequestContextMiddleware:
+    """Pure ASGI middleware that sets request_context for HTTP requests"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get('headers') or [])
+        forwarded_for = headers.get(b'x-forwarded-for')
+        if forwarded_for:
+            ip_address = forwarded_for.decode('latin-1').split(',')[0].strip()
+        else:
+            client = scope.get('client')
+            ip_address = client[0] if client else None
+        user_agent = headers.get(b'user-agent')
+
+        token = request_context.set({
+            'ip_address': ip_address[:45] if ip_address else None,
+            'user_agent': user_agent.decode('latin-1') if user_agent else None,
+        })
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            request_context.reset(token)
@@ -4,18 +4,29 @@ Models package - all database models organized by entity.
 from .base import Base
 from .role import Role
 from .company import Company
-from .user import User
+from .user import User, UserSession
 from .permission import Permission
 from .role_has_permission import RoleHasPermission
 from .user_permission import UserPermission
-from .project import Project, ProjectStatus, Sprint, SprintStatus
-from .task import Task, TaskStatus, TaskPriority, TaskType, TaskAssignee, TaskLink, Comment
-from .document import Document
+from .project import Project, ProjectStatus, Sprint, SprintStatus, SprintBurndown
+from .task import (
+    Task, TaskStatus, TaskPriority, TaskType, TaskAssignee, TaskLink, Comment, TaskHistory,
+    DependencyType, TaskDependency
+)
+from .document import Document, DocumentVersion, DocumentChunk, DocumentVersionChunk
+from .calendar import CalendarEvent, EventType, EventPriority, EventStatus
+from .audit import AuditLog
+from .sync import SyncTombstone
+from .import_job import ImportJob
+from .idempotency_key import IdempotencyKey
 
 __all__ = [
-    'Base', 'Role', 'Company', 'User', 'Permission', 'RoleHasPermission', 'UserPermission',
-    'Project', 'ProjectStatus', 'Sprint', 'SprintStatus',
-    'Task', 'TaskStatus', 'TaskPriority', 'TaskType', 'TaskAssignee', 'TaskLink', 'Comment',
-    'Document'
+    'Base', 'Role', 'Company', 'User', 'UserSession', 'Permission', 'RoleHasPermission', 'UserPermission',
+    'Project', 'ProjectStatus', 'Sprint', 'SprintStatus', 'SprintBurndown',
+    'Task', 'TaskStatus', 'TaskPriority', 'TaskType', 'TaskAssignee', 'TaskLink', 'Comment', 'TaskHistory',
+    'DependencyType', 'TaskDependency',
+    'Document', 'DocumentVersion', 'DocumentChunk', 'DocumentVersionChunk',
+    'CalendarEvent', 'EventType', 'EventPriority', 'EventStatus',
+    'AuditLog', 'SyncTombstone', 'ImportJob', 'IdempotencyKey'
 ]
 
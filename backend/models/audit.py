@@ -0,0 +1,20 @@
+"""
+Audit log model - append-only record of mutations.
+"""
+from sqlalchemy import Column, String, BigInteger, DateTime, ForeignKey, Text, JSON, text
+from .base import Base
+
+
+class AuditLog(Base):
+    __tablename__ = 'audit_logs'
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    user_id = Column(BigInteger, ForeignKey('users.id'), nullable=True)
+    action = Column(String(100), nullable=False)
+    resource_type = Column(String(50), nullable=False)
+    resource_id = Column(BigInteger, nullable=True)
+    old_values = Column(JSON, nullable=True)
+    new_values = Column(JSON, nullable=True)
+    ip_address = Column(String(45), nullable=True)
+    user_agent = Column(Text, nullable=True)
+    created_at = Column(DateTime, nullable=False, server_default=text('CURRENT_TIMESTAMP'))
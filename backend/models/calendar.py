@@ -0,0 +1,56 @@
+"""
+Calendar models - calendar events and their lookup tables.
+"""
+from sqlalchemy import Column, String, BigInteger, DateTime, Boolean, ForeignKey, Text, Integer, text
+from sqlalchemy.orm import relationship
+from .base import Base
+
+
+class EventType(Base):
+    __tablename__ = 'event_type'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)  # TINYINT in MySQL
+    key = Column(String(30), nullable=False, unique=True)
+    name = Column(String(60), nullable=False)
+
+
+class EventPriority(Base):
+    __tablename__ = 'event_priority'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)  # TINYINT in MySQL
+    key = Column(String(20), nullable=False, unique=True)
+    name = Column(String(40), nullable=False)
+
+
+class EventStatus(Base):
+    __tablename__ = 'event_status'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)  # TINYINT in MySQL
+    key = Column(String(30), nullable=False, unique=True)
+    name = Column(String(60), nullable=False)
+
+
+class CalendarEvent(Base):
+    __tablename__ = 'calendar_events'
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    title = Column(String(255), nullable=False)
+    description = Column(Text, nullable=True)
+    event_type_id = Column(Integer, ForeignKey('event_type.id'), nullable=False)  # TINYINT reference
+    start_date = Column(DateTime, nullable=False)
+    end_date = Column(DateTime, nullable=False)
+    is_all_day = Column(Boolean, nullable=False, server_default=text('0'))
+    priority_id = Column(Integer, ForeignKey('event_priority.id'), nullable=True)  # TINYINT reference
+    status_id = Column(Integer, ForeignKey('event_status.id'), nullable=True)  # TINYINT reference
+    project_id = Column(BigInteger, ForeignKey('projects.id'), nullable=True)
+    sprint_id = Column(BigInteger, ForeignKey('sprints.id'), nullable=True)
+    task_id = Column(BigInteger, ForeignKey('tasks.id'), nullable=True)
+    created_by = Column(BigInteger, ForeignKey('users.id'), nullable=True)
+    created_at = Column(DateTime, nullable=False, server_default=text('CURRENT_TIMESTAMP'))
+    updated_at = Column(DateTime, nullable=False, server_default=text('CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP'))
+
+    # Relationships
+    event_type = relationship("EventType", foreign_keys=[event_type_id])
+    priority = relationship("EventPriority", foreign_keys=[priority_id])
+    status = relationship("EventStatus", foreign_keys=[status_id])
+    project = relationship("Project", foreign_keys=[project_id])
@@ -1,7 +1,7 @@
 """
-Document models for file uploads and text extraction.
+Document models for file uploads, text extraction and versions.
 """
-from sqlalchemy import Column, String, BigInteger, DateTime, ForeignKey, Text, Integer, text
+from sqlalchemy import Column, String, BigInteger, DateTime, ForeignKey, Text, Integer, CHAR, Index, UniqueConstraint, text
 from sqlalchemy.orm import relationship
 from .base import Base
 
@@ -13,7 +13,7 @@ class Document(Base):
     title = Column(String(255), nullable=False)
     description = Column(Text, nullable=True)
     file_name = Column(String(255), nullable=False)
-    file_path = Column(String(500), nullable=False)
+    file_path = Column(String(500), nullable=True)  # NULL once the content lives in document_versions
     file_size = Column(BigInteger, nullable=False)
     mime_type = Column(String(100), nullable=True)
     project_id = Column(BigInteger, ForeignKey('projects.id'), nullable=True)
@@ -28,3 +28,49 @@ class Document(Base):
     project = relationship("Project", backref="documents")
     uploader = relationship("User", foreign_keys=[uploaded_by])
 
+
+
+class DocumentVersion(Base):
+    """One uploaded revision of a document; its content is an ordered list of chunks"""
+    __tablename__ = 'document_versions'
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    document_id = Column(BigInteger, ForeignKey('documents.id', ondelete='CASCADE'), nullable=False)
+    version_number = Column(Integer, nullable=False)
+    file_path = Column(String(500), nullable=True)  # Unused for chunked versions
+    file_name = Column(String(255), nullable=True)
+    file_size = Column(BigInteger, nullable=False)
+    mime_type = Column(String(100), nullable=True)
+    content_hash = Column(CHAR(64), nullable=True)  # sha256 of the whole file
+    chunk_count = Column(Integer, nullable=False, server_default=text('0'))
+    stored_bytes = Column(BigInteger, nullable=False, server_default=text('0'))  # Bytes of chunks first stored by this version
+    change_description = Column(Text, nullable=True)
+    uploaded_by = Column(BigInteger, ForeignKey('users.id'), nullable=True)
+    uploaded_at = Column(DateTime, nullable=False, server_default=text('CURRENT_TIMESTAMP'))
+
+    __table_args__ = (
+        UniqueConstraint('document_id', 'version_number', name='uq_document_version'),
+    )
+
+
+class DocumentChunk(Base):
+    """Content-addressed chunk file shared by every version that contains it"""
+    __tablename__ = 'document_chunks'
+
+    hash = Column(CHAR(64), primary_key=True)  # sha256 of the chunk
+    size = Column(Integer, nullable=False)
+    ref_count = Column(Integer, nullable=False, server_default=text('0'))  # Versions referencing the chunk
+    created_at = Column(DateTime, nullable=False, server_default=text('CURRENT_TIMESTAMP'))
+
+
+class DocumentVersionChunk(Base):
+    __tablename__ = 'document_version_chunks'
+
+    version_id = Column(BigInteger, ForeignKey('document_versions.id', ondelete='CASCADE'), primary_key=True)
+    seq = Column(Integer, primary_key=True)
+    chunk_hash = Column(CHAR(64), nullable=False)
+    chunk_size = Column(Integer, nullable=False)
+
+    __table_args__ = (
+        Index('idx_version_chunks_hash', 'chunk_hash'),
+    )
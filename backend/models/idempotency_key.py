@@ -0,0 +1,25 @@
+"""
+Idempotency key model - responses of POSTs retried with an Idempotency-Key header.
+"""
+from sqlalchemy import Column, String, BigInteger, DateTime, Integer, JSON, LargeBinary, CHAR, Index, text
+from .base import Base
+
+
+class IdempotencyKey(Base):
+    __tablename__ = 'idempotency_keys'
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    key_hash = Column(CHAR(64), nullable=False, unique=True)  # sha256 of method, path, credentials and key
+    request_hash = Column(CHAR(64), nullable=False)  # Fingerprint of the request body
+    owner = Column(CHAR(32), nullable=False)  # Request currently holding the key
+    status = Column(String(20), nullable=False, server_default='in_progress')  # in_progress, completed
+    response_status = Column(Integer, nullable=True)
+    response_headers = Column(JSON, nullable=True)
+    response_body = Column(LargeBinary(16 * 1024 * 1024), nullable=True)
+    locked_until = Column(DateTime, nullable=False)
+    created_at = Column(DateTime, nullable=False, server_default=text('CURRENT_TIMESTAMP'))
+    expires_at = Column(DateTime, nullable=False)
+
+    __table_args__ = (
+        Index('idx_idempotency_keys_expires', 'expires_at'),
+    )
@@ -0,0 +1,27 @@
+"""
+Import job model - background bulk imports of tasks into a project.
+"""
+from sqlalchemy import Column, String, BigInteger, DateTime, ForeignKey, Text, Integer, text
+from .base import Base
+
+
+class ImportJob(Base):
+    __tablename__ = 'import_jobs'
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    project_id = Column(BigInteger, ForeignKey('projects.id'), nullable=False)
+    status = Column(String(20), nullable=False, server_default='queued')  # queued, running, completed, failed
+    file_format = Column(String(10), nullable=False)  # csv, ndjson, json
+    file_name = Column(String(255), nullable=False)
+    file_path = Column(String(1000), nullable=False)
+    error_file_path = Column(String(1000), nullable=True)
+    total_bytes = Column(BigInteger, nullable=False, server_default=text('0'))
+    processed_bytes = Column(BigInteger, nullable=False, server_default=text('0'))
+    processed_rows = Column(Integer, nullable=False, server_default=text('0'))
+    imported_rows = Column(Integer, nullable=False, server_default=text('0'))
+    failed_rows = Column(Integer, nullable=False, server_default=text('0'))
+    error_message = Column(Text, nullable=True)
+    created_by = Column(BigInteger, ForeignKey('users.id'), nullable=True)
+    created_at = Column(DateTime, nullable=False, server_default=text('CURRENT_TIMESTAMP'))
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
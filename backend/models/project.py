@@ -1,7 +1,7 @@
 """
 Project and Sprint models.
 """
-from sqlalchemy import Column, String, BigInteger, DateTime, ForeignKey, Text, Date, Numeric, text, Integer
+from sqlalchemy import Column, String, BigInteger, DateTime, ForeignKey, Text, Date, Numeric, text, Integer, UniqueConstraint
 from sqlalchemy.orm import relationship
 from .base import Base
 
@@ -65,3 +65,21 @@ class Sprint(Base):
     status = relationship("SprintStatus", foreign_keys=[status_id])
     creator = relationship("User", foreign_keys=[created_by])
 
+
+
+class SprintBurndown(Base):
+    __tablename__ = 'sprint_burndown'
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    sprint_id = Column(BigInteger, ForeignKey('sprints.id', ondelete='CASCADE'), nullable=False)
+    snapshot_date = Column(Date, nullable=False)
+    scope_hours = Column(Numeric(10, 2), nullable=False, server_default=text('0'))
+    remaining_hours = Column(Numeric(10, 2), nullable=False, server_default=text('0'))
+    completed_hours = Column(Numeric(10, 2), nullable=False, server_default=text('0'))
+    tasks_total = Column(Integer, nullable=False, server_default=text('0'))
+    tasks_done = Column(Integer, nullable=False, server_default=text('0'))
+    updated_at = Column(DateTime, nullable=False, server_default=text('CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP'))
+
+    __table_args__ = (
+        UniqueConstraint('sprint_id', 'snapshot_date', name='uq_sprint_burndown_day'),
+    )
@@ -0,0 +1,15 @@
+"""
+Sync models - tombstones recording deletions for delta sync clients.
+"""
+from sqlalchemy import Column, String, BigInteger, DateTime, text
+from .base import Base
+
+
+class SyncTombstone(Base):
+    __tablename__ = 'sync_tombstones'
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    resource_type = Column(String(50), nullable=False)
+    resource_id = Column(BigInteger, nullable=False)
+    project_id = Column(BigInteger, nullable=True)  # No FK: tombstones outlive their project
+    deleted_at = Column(DateTime, nullable=False, server_default=text('CURRENT_TIMESTAMP'))
@@ -30,6 +30,14 @@ class TaskType(Base):
     name = Column(String(60), nullable=False)
 
 
+class DependencyType(Base):
+    __tablename__ = 'dependency_type'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)  # TINYINT in MySQL
+    key = Column(String(30), nullable=False, unique=True)
+    name = Column(String(60), nullable=False)
+
+
 class Task(Base):
     __tablename__ = 'tasks'
 
@@ -48,6 +56,7 @@ class Task(Base):
     actual_hours = Column(Numeric(5, 2), nullable=True)
     progress_percentage = Column(Integer, nullable=False, server_default=text('0'))
     created_by = Column(BigInteger, ForeignKey('users.id'), nullable=True)
+    import_job_id = Column(BigInteger, nullable=True)  # Set on tasks created by a bulk import
     created_at = Column(DateTime, nullable=False, server_default=text('CURRENT_TIMESTAMP'))
     updated_at = Column(DateTime, nullable=False, server_default=text('CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP'))
 
@@ -80,6 +89,21 @@ class TaskAssignee(Base):
     assigned_by_user = relationship("User", foreign_keys=[assigned_by])
 
 
+class TaskDependency(Base):
+    __tablename__ = 'task_dependencies'
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    task_id = Column(BigInteger, ForeignKey('tasks.id', ondelete='CASCADE'), nullable=False)
+    depends_on_task_id = Column(BigInteger, ForeignKey('tasks.id', ondelete='CASCADE'), nullable=False)
+    dependency_type_id = Column(Integer, ForeignKey('dependency_type.id'), nullable=True)  # TINYINT reference
+    created_at = Column(DateTime, nullable=False, server_default=text('CURRENT_TIMESTAMP'))
+
+    # Relationships
+    task = relationship("Task", foreign_keys=[task_id])
+    depends_on_task = relationship("Task", foreign_keys=[depends_on_task_id])
+    dependency_type = relationship("DependencyType", foreign_keys=[dependency_type_id])
+
+
 class TaskLink(Base):
     __tablename__ = 'task_links'
 
@@ -116,3 +140,16 @@ class Comment(Base):
     author = relationship("User", foreign_keys=[author_id])
     parent_comment = relationship("Comment", remote_side=[id], backref="replies")
 
+
+
+class TaskHistory(Base):
+    __tablename__ = 'task_history'
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    task_id = Column(BigInteger, nullable=False)  # No FK: history outlives deleted tasks
+    sprint_id = Column(BigInteger, nullable=True)
+    field_name = Column(String(50), nullable=False)
+    old_value = Column(String(255), nullable=True)
+    new_value = Column(String(255), nullable=True)
+    changed_by = Column(BigInteger, ForeignKey('users.id'), nullable=True)
+    changed_at = Column(DateTime, nullable=False, server_default=text('CURRENT_TIMESTAMP'))
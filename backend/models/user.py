@@ -1,7 +1,7 @@
 """
 User model - application users.
 """
-from sqlalchemy import Column, String, BigInteger, DateTime, Boolean, ForeignKey, text
+from sqlalchemy import Column, String, BigInteger, DateTime, Boolean, ForeignKey, Text, text
 from sqlalchemy.orm import relationship
 from .base import Base
 
@@ -25,3 +25,20 @@ class User(Base):
     # Relationships
     role = relationship("Role", backref="users")
 
+
+
+class UserSession(Base):
+    __tablename__ = 'user_sessions'
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    user_id = Column(BigInteger, ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+    token_hash = Column(String(255), nullable=False)  # SHA-256 of the bearer token, never the token itself
+    expires_at = Column(DateTime, nullable=False)
+    ip_address = Column(String(45), nullable=True)
+    user_agent = Column(Text, nullable=True)
+    is_active = Column(Boolean, nullable=False, server_default=text('1'))
+    created_at = Column(DateTime, nullable=False, server_default=text('CURRENT_TIMESTAMP'))
+    last_accessed_at = Column(DateTime, nullable=False, server_default=text('CURRENT_TIMESTAMP'))
+
+    # Relationships
+    user = relationship("User", foreign_keys=[user_id])
@@ -0,0 +1,32 @@
+"""
+Analytics API routes - portfolio-level reporting.
+Routes handle HTTP concerns only, business logic is in services.
+"""
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+from typing import Optional
+
+from database_connection import get_db_dependency
+from services.portfolio_analytics_service import PortfolioAnalyticsService
+from schemas.analytics import PortfolioResponse
+
+router = APIRouter(prefix="/api/analytics", tags=["analytics"])
+
+
+@router.get("/portfolio", response_model=PortfolioResponse)
+def get_portfolio(
+    company_id: Optional[int] = None,
+    status_key: Optional[str] = None,
+    include_projects: bool = True,
+    db: Session = Depends(get_db_dependency)
+):
+    """
+    Get portfolio analytics: budget vs. progress, overdue ratios and
+    estimated vs. actual hours, per project, per company and overall.
+    """
+    return PortfolioAnalyticsService.get_portfolio(
+        db=db,
+        company_id=company_id,
+        status_key=status_key,
+        include_projects=include_projects
+    )
@@ -0,0 +1,130 @@
+"""
+Auth API routes - token sessions (login, logout, session management).
+Also provides the FastAPI dependencies that resolve the bearer token of a request.
+Routes handle HTTP concerns only, business logic is in services.
+"""
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy.orm import Session
+from typing import Optional, List
+
+from database_connection import get_db_dependency
+from middleware.request_context import get_request_context
+from serialization import fast_response
+from services.session_service import SessionService, AuthenticatedSession
+from services.user_service import UserService
+from services.audit_service import AuditService
+from schemas.auth import LoginRequest, TokenResponse, SessionInfo
+
+router = APIRouter(prefix="/api/auth", tags=["auth"])
+
+bearer_scheme = HTTPBearer(auto_error=False)
+
+
+def get_optional_session(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(bearer_scheme),
+    db: Session = Depends(get_db_dependency)
+) -> Optional[AuthenticatedSession]:
+    """
+    Resolve the bearer token if one was sent (None for anonymous requests).
+    An invalid or expired token is rejected rather than treated as anonymous.
+    """
+    if credentials is None:
+        return None
+    session = SessionService.verify_token(credentials.credentials, db)
+    context = get_request_context()
+    if context:
+        context['user_id'] = session.user_id  # Attribute audit entries to the caller
+    return session
+
+
+def get_current_session(
+    session: Optional[AuthenticatedSession] = Depends(get_optional_session)
+) -> AuthenticatedSession:
+    """Require a valid bearer token"""
+    if session is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"}
+        )
+    return session
+
+
+@router.post("/login", response_model=TokenResponse)
+def login(payload: LoginRequest, db: Session = Depends(get_db_dependency)):
+    """
+    Authenticate with email and password and receive a bearer token.
+    """
+    user = UserService.authenticate_user(payload.email, payload.password, db)
+    token, user_session = SessionService.issue_session(user, db)
+    AuditService.record("session.create", "user_session", user_session.id, user_id=user.id)
+    return TokenResponse(
+        access_token=token,
+        session_id=user_session.id,
+        expires_at=user_session.expires_at,
+        user=UserService.build_user_response_with_company(user, db)
+    )
+
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+def logout(
+    session: AuthenticatedSession = Depends(get_current_session),
+    db: Session = Depends(get_db_dependency)
+):
+    """
+    Revoke the session of the token used for this request.
+    """
+    SessionService.revoke_session(session.session_id, db)
+    AuditService.record("session.revoke", "user_session", session.session_id, user_id=session.user_id)
+    return None
+
+
+@router.get("/session", response_model=SessionInfo)
+def get_session(session: AuthenticatedSession = Depends(get_current_session)):
+    """
+    Get the session of the token used for this request.
+    """
+    return SessionInfo(session_id=session.session_id, user_id=session.user_id, expires_at=session.expires_at)
+
+
+@router.get("/sessions", response_model=List[SessionInfo])
+def list_sessions(
+    session: AuthenticatedSession = Depends(get_current_session),
+    db: Session = Depends(get_db_dependency)
+):
+    """
+    List the caller's active sessions.
+    """
+    return fast_response([
+        SessionInfo(
+            session_id=s.id,
+            user_id=s.user_id,
+            expires_at=s.expires_at,
+            ip_address=s.ip_address,
+            user_agent=s.user_agent,
+            created_at=s.created_at,
+            last_accessed_at=s.last_accessed_at
+        )
+        for s in SessionService.list_user_sessions(session.user_id, db)
+    ], List[SessionInfo])
+
+
+@router.delete("/sessions/{session_id}", status_code=status.HTTP_204_NO_CONTENT)
+def revoke_session(
+    session_id: int,
+    session: AuthenticatedSession = Depends(get_current_session),
+    db: Session = Depends(get_db_dependency)
+):
+    """
+    Revoke one of the caller's sessions (e.g. sign out another device).
+    """
+    target = SessionService.get_session_by_id(session_id, db)
+    if target.user_id != session.user_id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Session not found"
+        )
+    SessionService.revoke_session(session_id, db)
+    AuditService.record("session.revoke", "user_session", session_id, user_id=session.user_id)
+    return None
@@ -0,0 +1,117 @@
+"""
+Calendar API routes - calendar events, merged calendar views and iCal feeds.
+Routes handle HTTP concerns only, business logic is in services.
+"""
+from fastapi import APIRouter, Depends, Query, Request, Response, status
+from sqlalchemy.orm import Session
+from typing import Optional, List
+from datetime import datetime
+
+from database_connection import get_db_dependency
+from serialization import fast_response
+from services.calendar_service import CalendarService
+from services.project_service import ProjectService
+from schemas.calendar import CalendarEventCreate, CalendarEventUpdate, CalendarEventResponse, CalendarEntry
+
+router = APIRouter(prefix="/api/calendar", tags=["calendar"])
+
+
+@router.get("", response_model=List[CalendarEntry])
+def get_calendar(
+    start: datetime = Query(..., description="Range start (inclusive)"),
+    end: datetime = Query(..., description="Range end (inclusive)"),
+    project_id: Optional[int] = Query(None, description="Limit to one project"),
+    db: Session = Depends(get_db_dependency)
+):
+    """
+    Get calendar events, sprints and task due dates overlapping a date range.
+    """
+    return fast_response(CalendarService.list_entries(db, start, end, project_id), List[CalendarEntry])
+
+
+@router.post("/events", response_model=CalendarEventResponse, status_code=status.HTTP_201_CREATED)
+def create_event(payload: CalendarEventCreate, db: Session = Depends(get_db_dependency)):
+    """
+    Create a calendar event.
+    """
+    try:
+        event = CalendarService.create_event(payload, db)
+        return CalendarService.build_event_response(event)
+    except Exception as e:
+        db.rollback()
+        if isinstance(e, Exception) and hasattr(e, 'status_code'):
+            raise e
+        from fastapi import HTTPException
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to create event: {str(e)}"
+        )
+
+
+@router.get("/events/{event_id}", response_model=CalendarEventResponse)
+def get_event(event_id: int, db: Session = Depends(get_db_dependency)):
+    """
+    Get a calendar event by ID.
+    """
+    event = CalendarService.get_event_by_id(event_id, db)
+    return CalendarService.build_event_response(event)
+
+
+@router.put("/events/{event_id}", response_model=CalendarEventResponse)
+def update_event(event_id: int, payload: CalendarEventUpdate, db: Session = Depends(get_db_dependency)):
+    """
+    Update a calendar event.
+    """
+    try:
+        event = CalendarService.update_event(event_id, payload, db)
+        return CalendarService.build_event_response(event)
+    except Exception as e:
+        db.rollback()
+        if isinstance(e, Exception) and hasattr(e, 'status_code'):
+            raise e
+        from fastapi import HTTPException
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to update event: {str(e)}"
+        )
+
+
+@router.delete("/events/{event_id}", status_code=status.HTTP_204_NO_CONTENT)
+def delete_event(event_id: int, db: Session = Depends(get_db_dependency)):
+    """
+    Delete a calendar event.
+    """
+    try:
+        CalendarService.delete_event(event_id, db)
+        return None
+    except Exception as e:
+        db.rollback()
+        if isinstance(e, Exception) and hasattr(e, 'status_code'):
+            raise e
+        from fastapi import HTTPException
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to delete event: {str(e)}"
+        )
+
+
+@router.get("/projects/{project_id}/feed.ics")
+def get_project_feed(project_id: int, request: Request, db: Session = Depends(get_db_dependency)):
+    """
+    iCalendar feed of a project's events, sprints and task due dates.
+    Supports conditional requests via ETag / If-None-Match.
+    """
+    ProjectService.get_project_by_id(project_id, db)
+    headers = {"Cache-Control": "private, max-age=0, must-revalidate"}
+
+    etag = CalendarService.get_project_etag(project_id, db)
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and etag in [tag.strip() for tag in if_none_match.split(",")]:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={**headers, "ETag": etag})
+
+    etag, ics = CalendarService.get_project_ical(project_id, db)
+    return Response(
+        content=ics,
+        media_type="text/calendar",
+        headers={**headers, "ETag": etag}
+    )
@@ -0,0 +1,90 @@
+"""
+Comments API routes - threaded comments on tasks.
+Routes handle HTTP concerns only, business logic is in services.
+"""
+from fastapi import APIRouter, Depends, Query, status
+from sqlalchemy.orm import Session
+from typing import Optional
+
+from database_connection import get_db_dependency
+from serialization import fast_response
+from services.comment_service import CommentService
+from schemas.comment import CommentCreate, CommentUpdate, CommentResponse, CommentThreadPage
+
+router = APIRouter(prefix="/api", tags=["comments"])
+
+
+@router.get("/tasks/{task_id}/comments", response_model=CommentThreadPage)
+def list_task_comments(
+    task_id: int,
+    cursor: Optional[int] = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(CommentService.DEFAULT_PAGE_SIZE, ge=1, le=100, description="Threads per page"),
+    db: Session = Depends(get_db_dependency)
+):
+    """
+    Get a task's comment threads (top-level comments with nested replies), oldest first.
+    """
+    return fast_response(CommentService.list_threads(task_id, db, cursor=cursor, limit=limit), CommentThreadPage)
+
+
+@router.post("/tasks/{task_id}/comments", response_model=CommentResponse, status_code=status.HTTP_201_CREATED)
+def create_task_comment(task_id: int, payload: CommentCreate, db: Session = Depends(get_db_dependency)):
+    """
+    Add a comment to a task, or reply to an existing comment via parent_comment_id.
+    """
+    try:
+        return CommentService.create_comment(task_id, payload, db)
+    except Exception as e:
+        db.rollback()
+        if isinstance(e, Exception) and hasattr(e, 'status_code'):
+            raise e
+        from fastapi import HTTPException
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to create comment: {str(e)}"
+        )
+
+
+@router.get("/comments/{comment_id}", response_model=CommentResponse)
+def get_comment_thread(comment_id: int, db: Session = Depends(get_db_dependency)):
+    """
+    Get a comment with all of its nested replies.
+    """
+    return CommentService.get_thread(comment_id, db)
+
+
+@router.put("/comments/{comment_id}", response_model=CommentResponse)
+def update_comment(comment_id: int, payload: CommentUpdate, db: Session = Depends(get_db_dependency)):
+    """
+    Edit a comment.
+    """
+    try:
+        return CommentService.update_comment(comment_id, payload, db)
+    except Exception as e:
+        db.rollback()
+        if isinstance(e, Exception) and hasattr(e, 'status_code'):
+            raise e
+        from fastapi import HTTPException
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to update comment: {str(e)}"
+        )
+
+
+@router.delete("/comments/{comment_id}", status_code=status.HTTP_204_NO_CONTENT)
+def delete_comment(comment_id: int, db: Session = Depends(get_db_dependency)):
+    """
+    Delete a comment and all of its replies.
+    """
+    try:
+        CommentService.delete_comment(comment_id, db)
+        return None
+    except Exception as e:
+        db.rollback()
+        if isinstance(e, Exception) and hasattr(e, 'status_code'):
+            raise e
+        from fastapi import HTTPException
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to delete comment: {str(e)}"
+        )
@@ -0,0 +1,76 @@
+"""
+Task dependencies API routes - manage dependencies and project dependency graphs.
+Routes handle HTTP concerns only, business logic is in services.
+"""
+from fastapi import APIRouter, Depends, status
+from sqlalchemy.orm import Session
+from typing import List
+
+from database_connection import get_db_dependency
+from serialization import fast_response
+from services.dependency_service import DependencyService
+from services.project_service import ProjectService
+from schemas.dependency import TaskDependencyCreate, TaskDependencyResponse, DependencyGraphResponse
+
+router = APIRouter(prefix="/api", tags=["dependencies"])
+
+
+@router.get("/tasks/{task_id}/dependencies", response_model=List[TaskDependencyResponse])
+def list_task_dependencies(task_id: int, db: Session = Depends(get_db_dependency)):
+    """
+    Get the tasks a task depends on.
+    """
+    dependencies = DependencyService.list_task_dependencies(task_id, db)
+    return fast_response([DependencyService.build_dependency_response(d) for d in dependencies], List[TaskDependencyResponse])
+
+
+@router.post("/tasks/{task_id}/dependencies", response_model=TaskDependencyResponse, status_code=status.HTTP_201_CREATED)
+def create_task_dependency(
+    task_id: int,
+    payload: TaskDependencyCreate,
+    db: Session = Depends(get_db_dependency)
+):
+    """
+    Add a dependency to a task. Rejected if it would create a cycle.
+    """
+    try:
+        dependency = DependencyService.create_dependency(task_id, payload, db)
+        return DependencyService.build_dependency_response(dependency)
+    except Exception as e:
+        db.rollback()
+        if isinstance(e, Exception) and hasattr(e, 'status_code'):
+            raise e
+        from fastapi import HTTPException
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to create dependency: {str(e)}"
+        )
+
+
+@router.delete("/tasks/{task_id}/dependencies/{dependency_id}", status_code=status.HTTP_204_NO_CONTENT)
+def delete_task_dependency(task_id: int, dependency_id: int, db: Session = Depends(get_db_dependency)):
+    """
+    Remove a dependency from a task.
+    """
+    try:
+        DependencyService.delete_dependency(task_id, dependency_id, db)
+        return None
+    except Exception as e:
+        db.rollback()
+        if isinstance(e, Exception) and hasattr(e, 'status_code'):
+            raise e
+        from fastapi import HTTPException
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to delete dependency: {str(e)}"
+        )
+
+
+@router.get("/projects/{project_id}/dependency-graph", response_model=DependencyGraphResponse)
+def get_project_dependency_graph(project_id: int, db: Session = Depends(get_db_dependency)):
+    """
+    Get topological order, critical path, earliest/latest start times and
+    blocked tasks for a project's dependency graph.
+    """
+    ProjectService.get_project_by_id(project_id, db)
+    return DependencyService.get_project_analysis(project_id)
@@ -1,15 +1,21 @@
 """
-Documents API routes - manage document uploads and processing.
+Documents API routes - manage document uploads, versions and processing.
 Routes handle HTTP concerns only, business logic is in services.
 """
 from fastapi import APIRouter, Depends, File, Form, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from typing import Optional, List
+from urllib.parse import quote
 from fastapi import UploadFile
 
 from database_connection import get_db_dependency
+from serialization import fast_response
 from services.document_service import DocumentService
-from schemas.document import DocumentResponse, DocumentUpdate
+from services.document_version_service import DocumentVersionService
+from services.session_service import AuthenticatedSession
+from schemas.document import DocumentResponse, DocumentUpdate, DocumentVersionResponse
+from routes.auth import get_optional_session
 
 router = APIRouter(prefix="/api", tags=["documents"])
 
@@ -64,7 +70,7 @@ def update_document(
 def get_project_documents(project_id: int, db: Session = Depends(get_db_dependency)):
     """Get all documents for a project"""
     documents = DocumentService.list_project_documents(project_id, db)
-    return [DocumentService.build_document_response(doc, db) for doc in documents]
+    return fast_response([DocumentService.build_document_response(doc, db) for doc in documents], List[DocumentResponse])
 
 
 @router.post("/projects/{project_id}/documents/upload", response_model=DocumentResponse, status_code=status.HTTP_201_CREATED)
@@ -73,11 +79,11 @@ async def upload_document(
     file: UploadFile = File(...),
     title: Optional[str] = Form(None),
     description: Optional[str] = Form(None),
-    db: Session = Depends(get_db_dependency)
+    db: Session = Depends(get_db_dependency),
+    session: Optional[AuthenticatedSession] = Depends(get_optional_session)
 ):
     """Upload a document for a project"""
-    # TODO: Get current user from auth context
-    uploaded_by = None
+    uploaded_by = session.user_id if session else None
     
     try:
         document = await DocumentService.upload_document(
@@ -98,3 +104,71 @@ async def upload_document(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to upload document: {str(e)}"
         )
+
+
+# Document versions
+@router.get("/documents/{document_id}/versions", response_model=List[DocumentVersionResponse])
+def get_document_versions(document_id: int, db: Session = Depends(get_db_dependency)):
+    """Get the versions of a document, newest first"""
+    versions = DocumentVersionService.list_versions(document_id, db)
+    return fast_response(
+        [DocumentVersionService.build_version_response(version) for version in versions],
+        List[DocumentVersionResponse]
+    )
+
+
+@router.post("/documents/{document_id}/versions", response_model=DocumentVersionResponse, status_code=status.HTTP_201_CREATED)
+def upload_document_version(
+    document_id: int,
+    file: UploadFile = File(...),
+    change_description: Optional[str] = Form(None),
+    db: Session = Depends(get_db_dependency),
+    session: Optional[AuthenticatedSession] = Depends(get_optional_session)
+):
+    """
+    Upload a new version of a document; it becomes the document's current content.
+    Only the chunks that differ from earlier versions are stored.
+    """
+    uploaded_by = session.user_id if session else None
+
+    try:
+        version = DocumentVersionService.upload_version(
+            document_id=document_id,
+            file=file,
+            change_description=change_description,
+            uploaded_by=uploaded_by,
+            db=db
+        )
+        return DocumentVersionService.build_version_response(version)
+    except Exception as e:
+        db.rollback()
+        if isinstance(e, Exception) and hasattr(e, 'status_code'):
+            raise e
+        from fastapi import HTTPException
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to upload document version: {str(e)}"
+        )
+
+
+@router.get("/documents/{document_id}/versions/{version_number}", response_model=DocumentVersionResponse)
+def get_document_version(document_id: int, version_number: int, db: Session = Depends(get_db_dependency)):
+    """Get a single version of a document"""
+    version = DocumentVersionService.get_version(document_id, version_number, db)
+    return DocumentVersionService.build_version_response(version)
+
+
+@router.get("/documents/{document_id}/versions/{version_number}/content")
+def download_document_version(document_id: int, version_number: int, db: Session = Depends(get_db_dependency)):
+    """Download the file of a document version, streamed chunk by chunk"""
+    version = DocumentVersionService.get_version(document_id, version_number, db)
+    file_name = version.file_name or f"document-{document_id}-v{version_number}"
+    return StreamingResponse(
+        DocumentVersionService.iter_content(version.id),
+        media_type=version.mime_type or "application/octet-stream",
+        headers={
+            "Content-Length": str(version.file_size),
+            "Content-Disposition": f"attachment; filename*=utf-8''{quote(file_name)}",
+            "ETag": f'"{version.content_hash}"',
+        }
+    )
@@ -0,0 +1,76 @@
+"""
+Imports API routes - bulk task imports running as background jobs.
+Routes handle HTTP concerns only, business logic is in services.
+"""
+from fastapi import APIRouter, Depends, File, Query, UploadFile, status
+from fastapi.responses import FileResponse
+from sqlalchemy.orm import Session
+from typing import Optional, List
+
+from database_connection import get_db_dependency
+from serialization import fast_response
+from services.import_service import ImportService
+from services.project_service import ProjectService
+from services.session_service import AuthenticatedSession
+from schemas.import_job import ImportJobResponse
+from routes.auth import get_optional_session
+
+router = APIRouter(prefix="/api", tags=["imports"])
+
+
+@router.post(
+    "/projects/{project_id}/tasks/import",
+    response_model=ImportJobResponse,
+    status_code=status.HTTP_202_ACCEPTED
+)
+async def import_project_tasks(
+    project_id: int,
+    file: UploadFile = File(...),
+    format: Optional[str] = Query(
+        None, pattern="^(csv|ndjson|json)$", description="File format; taken from the file extension when omitted"
+    ),
+    db: Session = Depends(get_db_dependency),
+    session: Optional[AuthenticatedSession] = Depends(get_optional_session)
+):
+    """
+    Upload a CSV, NDJSON or JSON file of tasks and import it in the background.
+    Columns/keys follow TaskCreate (status_key, priority_key, task_type_key,
+    assignee_ids, ...); users may also be given as assignee_emails / reviewer_email.
+    Poll GET /api/imports/{job_id} for progress.
+    """
+    created_by = session.user_id if session else None
+
+    try:
+        job = await ImportService.create_job(project_id, file, format, created_by, db)
+        return ImportService.build_job_response(job)
+    except Exception as e:
+        db.rollback()
+        if isinstance(e, Exception) and hasattr(e, 'status_code'):
+            raise e
+        from fastapi import HTTPException
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to start import: {str(e)}"
+        )
+
+
+@router.get("/projects/{project_id}/imports", response_model=List[ImportJobResponse])
+def get_project_imports(project_id: int, db: Session = Depends(get_db_dependency)):
+    """Get the import jobs of a project, newest first"""
+    ProjectService.get_project_by_id(project_id, db)
+    jobs = ImportService.list_project_jobs(project_id, db)
+    return fast_response([ImportService.build_job_response(job) for job in jobs], List[ImportJobResponse])
+
+
+@router.get("/imports/{job_id}", response_model=ImportJobResponse)
+def get_import(job_id: int, db: Session = Depends(get_db_dependency)):
+    """Get an import job's status and progress"""
+    job = ImportService.get_job_by_id(job_id, db)
+    return ImportService.build_job_response(job)
+
+
+@router.get("/imports/{job_id}/errors")
+def get_import_errors(job_id: int, db: Session = Depends(get_db_dependency)):
+    """Download the rejected rows of an import job as CSV (row, error, record)"""
+    path = ImportService.get_error_file(job_id, db)
+    return FileResponse(path, media_type="text/csv", filename=f"import-{job_id}-errors.csv")
@@ -6,6 +6,7 @@ from sqlalchemy.orm import Session
 from typing import Optional, List
 
 from database_connection import get_db_dependency
+from serialization import fast_response
 from models import Permission
 from schemas.permission import PermissionResponse
 
@@ -25,7 +26,7 @@ def list_permissions(
         query = query.filter(Permission.category == category)
     
     permissions = query.order_by(Permission.category.asc(), Permission.name.asc()).all()
-    return permissions
+    return fast_response(permissions, List[PermissionResponse], from_attributes=True)
 
 
 @router.get("/{permission_id}", response_model=PermissionResponse)
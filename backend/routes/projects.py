@@ -2,13 +2,19 @@
 Projects API routes - manage projects.
 Routes handle HTTP concerns only, business logic is in services.
 """
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from typing import Optional, List
 
 from database_connection import get_db_dependency
+from serialization import fast_response, parse_fields, sparse_response
 from services.project_service import ProjectService
+from services.sprint_analytics_service import SprintAnalyticsService
+from services.export_service import ExportService
 from schemas.project import ProjectCreate, ProjectUpdate, ProjectResponse
+from schemas.task import TaskResponse
+from schemas.sprint import ProjectVelocityResponse
 
 router = APIRouter(prefix="/api/projects", tags=["projects"])
 
@@ -20,21 +26,27 @@ def list_projects(
     status_key: Optional[str] = None,
     skip: int = 0,
     limit: int = 100,
+    fields: Optional[str] = Query(None, description="Comma-separated ProjectResponse fields to return (default: all)"),
     db: Session = Depends(get_db_dependency)
 ):
     """
     Get all projects with optional filtering.
+    With ?fields=, only the listed fields are loaded and returned.
     """
+    requested_fields = parse_fields(fields, ProjectResponse)
     projects = ProjectService.list_projects(
         db=db,
         company_id=company_id,
         project_manager_id=project_manager_id,
         status_key=status_key,
         skip=skip,
-        limit=limit
+        limit=limit,
+        fields=requested_fields
     )
     
-    return [ProjectService.build_project_response(project, db) for project in projects]
+    if requested_fields is not None:
+        return sparse_response(ProjectService.build_project_field_rows(projects, db, requested_fields), ProjectResponse)
+    return fast_response([ProjectService.build_project_response(project, db) for project in projects], List[ProjectResponse])
 
 
 @router.get("/{project_id}", response_model=ProjectResponse)
@@ -46,6 +58,37 @@ def get_project(project_id: int, db: Session = Depends(get_db_dependency)):
     return ProjectService.build_project_response(project, db)
 
 
+@router.get("/{project_id}/velocity", response_model=ProjectVelocityResponse)
+def get_project_velocity(
+    project_id: int,
+    window: int = Query(default=SprintAnalyticsService.DEFAULT_VELOCITY_WINDOW, ge=1, le=20),
+    db: Session = Depends(get_db_dependency)
+):
+    """
+    Get per-sprint and rolling velocity for a project.
+    """
+    return SprintAnalyticsService.get_project_velocity(project_id, db, window=window)
+
+
+@router.get("/{project_id}/tasks/export")
+def export_project_tasks(
+    project_id: int,
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$", description="ndjson or csv"),
+    fields: Optional[str] = Query(None, description="Comma-separated TaskResponse fields to export (default: all)"),
+    db: Session = Depends(get_db_dependency)
+):
+    """
+    Stream all tasks of a project as NDJSON (one TaskResponse object per line) or CSV.
+    """
+    ProjectService.get_project_by_id(project_id, db)
+    requested_fields = parse_fields(fields, TaskResponse)
+    return StreamingResponse(
+        ExportService.stream_tasks(project_id, format, requested_fields),
+        media_type=ExportService.FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="project-{project_id}-tasks.{format}"'}
+    )
+
+
 @router.post("", response_model=ProjectResponse, status_code=status.HTTP_201_CREATED)
 def create_project(payload: ProjectCreate, db: Session = Depends(get_db_dependency)):
     """
@@ -8,6 +8,7 @@ from typing import List
 from database_connection import get_db_dependency
 from models import Role, Permission, RoleHasPermission
 from schemas.permission import RolePermissionsResponse, RolePermissionsUpdate, PermissionResponse
+from services.audit_service import AuditService
 
 router = APIRouter(prefix="/api/roles", tags=["role-permissions"])
 
@@ -70,6 +71,12 @@ def update_role_permissions(
             detail="One or more permission IDs not found"
         )
     
+    previous_permission_ids = sorted(
+        permission_id for (permission_id,) in db.query(RoleHasPermission.permission_id).filter(
+            RoleHasPermission.role_id == role_id
+        ).all()
+    )
+    
     # Delete existing role permissions
     db.query(RoleHasPermission).filter(
         RoleHasPermission.role_id == role_id
@@ -91,6 +98,12 @@ def update_role_permissions(
             detail=f"Failed to update role permissions: {str(e)}"
         )
     
+    AuditService.record_update(
+        "role_permissions", role_id,
+        {"permission_ids": previous_permission_ids},
+        {"permission_ids": sorted(payload.permission_ids)}
+    )
+    
     # Return updated permissions
     return get_role_permissions(role_id, db)
 
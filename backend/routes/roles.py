@@ -3,6 +3,7 @@ from sqlalchemy.orm import Session
 from typing import List
 
 from database_connection import get_db_dependency
+from serialization import fast_response
 from models import Role
 from schemas.role import RoleResponse, RoleUpdate
 
@@ -15,7 +16,7 @@ def list_roles(db: Session = Depends(get_db_dependency)):
     Get all roles.
     """
     roles = db.query(Role).order_by(Role.name.asc()).all()
-    return roles
+    return fast_response(roles, List[RoleResponse], from_attributes=True)
 
 
 @router.get("/{role_id}", response_model=RoleResponse)
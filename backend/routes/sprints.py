@@ -0,0 +1,20 @@
+"""
+Sprints API routes - sprint analytics.
+Routes handle HTTP concerns only, business logic is in services.
+"""
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+
+from database_connection import get_db_dependency
+from services.sprint_analytics_service import SprintAnalyticsService
+from schemas.sprint import SprintBurndownResponse
+
+router = APIRouter(prefix="/api/sprints", tags=["sprints"])
+
+
+@router.get("/{sprint_id}/burndown", response_model=SprintBurndownResponse)
+def get_sprint_burndown(sprint_id: int, db: Session = Depends(get_db_dependency)):
+    """
+    Get the daily burndown series for a sprint.
+    """
+    return SprintAnalyticsService.get_burndown(sprint_id, db)
@@ -0,0 +1,48 @@
+"""
+Stream API routes - Server-Sent Events feed of task and project changes.
+Clients apply the events to their local state instead of polling full lists.
+"""
+from fastapi import APIRouter, Header, Query, Request
+from fastapi.responses import StreamingResponse
+from typing import Optional
+import asyncio
+
+from services.event_service import EventService
+
+router = APIRouter(prefix="/api", tags=["stream"])
+
+
+@router.get("/stream")
+async def stream_changes(
+    request: Request,
+    project_id: Optional[int] = Query(None, description="Only events of this project"),
+    last_event_id: Optional[str] = Header(None, alias="Last-Event-ID")
+):
+    """
+    Stream task/project change events (text/event-stream).
+    Reconnecting clients send Last-Event-ID to receive missed events; a
+    'resync' event means the gap could not be replayed and lists must be refetched.
+    """
+    broker = EventService.broker
+    subscription = broker.subscribe(project_id, last_event_id)
+
+    async def event_source():
+        try:
+            yield "retry: 3000\n\n"
+            while True:
+                try:
+                    event = await asyncio.wait_for(subscription.queue.get(), timeout=EventService.HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        break
+                    yield ": keep-alive\n\n"
+                    continue
+                yield EventService.format_sse(event)
+        finally:
+            broker.unsubscribe(subscription)
+
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
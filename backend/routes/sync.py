@@ -0,0 +1,28 @@
+"""
+Sync API routes - delta sync for clients and integrations.
+Routes handle HTTP concerns only, business logic is in services.
+"""
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from typing import Optional
+
+from database_connection import get_db_dependency
+from serialization import fast_response
+from services.sync_service import SyncService
+from schemas.sync import SyncResponse
+
+router = APIRouter(prefix="/api", tags=["sync"])
+
+
+@router.get("/sync", response_model=SyncResponse)
+def sync_changes(
+    since: Optional[str] = Query(None, description="next_token from the previous sync; omit for a full sync"),
+    project_id: Optional[int] = Query(None, description="Limit to one project"),
+    limit: int = Query(SyncService.DEFAULT_LIMIT, ge=1, le=5000, description="Max rows per resource"),
+    db: Session = Depends(get_db_dependency)
+):
+    """
+    Get tasks, projects, sprints and documents changed since a watermark, plus
+    tombstones for deleted records. Repeat with next_token while has_more is true.
+    """
+    return fast_response(SyncService.get_changes(db, since=since, project_id=project_id, limit=limit), SyncResponse)
@@ -2,11 +2,12 @@
 Tasks API routes - manage tasks in projects.
 Routes handle HTTP concerns only, business logic is in services.
 """
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, status
 from sqlalchemy.orm import Session
 from typing import Optional, List
 
 from database_connection import get_db_dependency
+from serialization import fast_response, parse_fields, sparse_response
 from services.task_service import TaskService
 from schemas.task import TaskCreate, TaskUpdate, TaskResponse
 
@@ -23,11 +24,14 @@ def list_tasks(
     assignee_id: Optional[int] = None,
     skip: int = 0,
     limit: int = 100,
+    fields: Optional[str] = Query(None, description="Comma-separated TaskResponse fields to return (default: all)"),
     db: Session = Depends(get_db_dependency)
 ):
     """
     Get all tasks with optional filtering.
+    With ?fields=, only the listed fields are loaded and returned.
     """
+    requested_fields = parse_fields(fields, TaskResponse)
     tasks = TaskService.list_tasks(
         db=db,
         project_id=project_id,
@@ -37,10 +41,13 @@ def list_tasks(
         task_type_key=task_type_key,
         assignee_id=assignee_id,
         skip=skip,
-        limit=limit
+        limit=limit,
+        fields=requested_fields
     )
     
-    return [TaskService.build_task_response(task, db) for task in tasks]
+    if requested_fields is not None:
+        return sparse_response(TaskService.build_task_field_rows(tasks, db, requested_fields), TaskResponse)
+    return fast_response([TaskService.build_task_response(task, db) for task in tasks], List[TaskResponse])
 
 
 @router.get("/{task_id}", response_model=TaskResponse)
@@ -118,7 +125,7 @@ def get_task_statuses(db: Session = Depends(get_db_dependency)):
     """
     Get all task statuses.
     """
-    return TaskService.get_task_statuses(db)
+    return fast_response(TaskService.get_task_statuses(db))
 
 
 @router.get("/priorities", response_model=List[dict])
@@ -126,7 +133,7 @@ def get_task_priorities(db: Session = Depends(get_db_dependency)):
     """
     Get all task priorities.
     """
-    return TaskService.get_task_priorities(db)
+    return fast_response(TaskService.get_task_priorities(db))
 
 
 @router.get("/types", response_model=List[dict])
@@ -134,4 +141,4 @@ def get_task_types(db: Session = Depends(get_db_dependency)):
     """
     Get all task types.
     """
-    return TaskService.get_task_types(db)
+    return fast_response(TaskService.get_task_types(db))
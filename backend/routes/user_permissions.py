@@ -3,11 +3,14 @@ User Permissions API routes - manage explicit permissions for users.
 """
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
 from database_connection import get_db_dependency
 from models import User, Role, Permission, RoleHasPermission, UserPermission
 from schemas.permission import UserPermissionsResponse, UserPermissionDetail, UserPermissionUpdate
+from services.audit_service import AuditService
+from services.session_service import AuthenticatedSession
+from routes.auth import get_optional_session
 
 router = APIRouter(prefix="/api/users", tags=["user-permissions"])
 
@@ -100,7 +103,8 @@ def update_user_permission(
     permission_key: str,
     payload: UserPermissionUpdate,
     db: Session = Depends(get_db_dependency),
-    granted_by: int = 1  # TODO: Get from auth token
+    session: Optional[AuthenticatedSession] = Depends(get_optional_session),
+    granted_by: int = 1  # Fallback for unauthenticated callers
 ):
     """
     Update an explicit permission for a user.
@@ -121,12 +125,16 @@ def update_user_permission(
             detail=f"Permission '{permission_key}' not found"
         )
     
+    if session is not None:
+        granted_by = session.user_id
+    
     # Find or create user permission
     user_permission = db.query(UserPermission).filter(
         UserPermission.user_id == user_id,
         UserPermission.permission_key == permission_key
     ).first()
     
+    previous_granted = bool(user_permission.granted) if user_permission else None
     if user_permission:
         user_permission.granted = payload.granted
         user_permission.granted_by = granted_by
@@ -148,6 +156,13 @@ def update_user_permission(
             detail=f"Failed to update user permission: {str(e)}"
         )
     
+    AuditService.record(
+        "user_permission.update", "user_permission", user_id,
+        old_values={"permission_key": permission_key, "granted": previous_granted},
+        new_values={"permission_key": permission_key, "granted": payload.granted},
+        user_id=granted_by
+    )
+    
     return get_user_permissions(user_id, db)
 
 
@@ -174,6 +189,7 @@ def delete_user_permission(
     ).first()
     
     if user_permission:
+        previous_granted = bool(user_permission.granted)
         db.delete(user_permission)
         try:
             db.commit()
@@ -183,6 +199,10 @@ def delete_user_permission(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Failed to delete user permission: {str(e)}"
             )
+        AuditService.record_delete(
+            "user_permission", user_id,
+            {"permission_key": permission_key, "granted": previous_granted}
+        )
     
     return get_user_permissions(user_id, db)
 
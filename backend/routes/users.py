@@ -2,12 +2,12 @@
 Users API routes - manage users.
 Routes handle HTTP concerns only, business logic is in services.
 """
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, status
 from sqlalchemy.orm import Session
 from typing import Optional, List
-from pydantic import EmailStr
 
 from database_connection import get_db_dependency
+from serialization import fast_response, parse_fields, sparse_response
 from services.user_service import UserService
 from schemas.user import UserCreate, UserResponse, UserUpdate, UserDetailResponse
 
@@ -51,30 +51,26 @@ def list_users(
     limit: int = 100,
     is_active: Optional[bool] = None,
     role_key: Optional[str] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated UserDetailResponse fields to return (default: all)"),
     db: Session = Depends(get_db_dependency)
 ):
     """
     Get all users with optional filtering.
+    With ?fields=, only the listed fields are loaded and returned.
     """
+    requested_fields = parse_fields(fields, UserDetailResponse)
     users = UserService.list_users(
         db=db,
         skip=skip,
         limit=limit,
         is_active=is_active,
-        role_key=role_key
+        role_key=role_key,
+        fields=requested_fields
     )
     
-    return [UserService.build_user_detail_response(user, db) for user in users]
-
-
-@router.get("/login", response_model=UserResponse)
-def login_user(email: EmailStr, password: str, db: Session = Depends(get_db_dependency)):
-    """
-    Temporary login via GET with query params (?email=...&password=...)
-    Returns user if email & password match exactly.
-    """
-    user = UserService.authenticate_user(email, password, db)
-    return UserService.build_user_response_with_company(user, db)
+    if requested_fields is not None:
+        return sparse_response(UserService.build_user_field_rows(users, requested_fields), UserDetailResponse)
+    return fast_response([UserService.build_user_detail_response(user, db) for user in users], List[UserDetailResponse])
 
 
 @router.get("/{user_id}", response_model=UserDetailResponse)
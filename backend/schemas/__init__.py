@@ -11,6 +11,13 @@ from .user import (
     UserDetailResponse,
 )
 
+# Auth schemas
+from .auth import (
+    LoginRequest,
+    TokenResponse,
+    SessionInfo,
+)
+
 # Role schemas
 from .role import (
     RoleResponse,
@@ -43,11 +50,64 @@ from .project import (
     ProjectResponse,
 )
 
+# Comment schemas
+from .comment import (
+    CommentCreate,
+    CommentUpdate,
+    CommentAuthor,
+    CommentResponse,
+    CommentThreadPage,
+)
+
+# Task dependency schemas
+from .dependency import (
+    TaskDependencyCreate,
+    TaskDependencyResponse,
+    TaskScheduleEntry,
+    DependencyGraphResponse,
+)
+
+# Sprint schemas
+from .sprint import (
+    BurndownPoint,
+    SprintBurndownResponse,
+    SprintVelocityEntry,
+    ProjectVelocityResponse,
+)
+
+# Analytics schemas
+from .analytics import (
+    PortfolioMetrics,
+    ProjectPortfolioRow,
+    CompanyPortfolioSummary,
+    PortfolioResponse,
+)
+
+# Calendar schemas
+from .calendar import (
+    CalendarEventCreate,
+    CalendarEventUpdate,
+    CalendarEventResponse,
+    CalendarEntry,
+)
+
+# Sync schemas
+from .sync import (
+    SyncTombstoneResponse,
+    SyncResponse,
+)
+
+# Import schemas
+from .import_job import (
+    ImportJobResponse,
+)
+
 # Document schemas
 from .document import (
     DocumentCreate,
     DocumentUpdate,
     DocumentResponse,
+    DocumentVersionResponse,
 )
 
 __all__ = [
@@ -56,6 +116,10 @@ __all__ = [
     'UserResponse',
     'UserUpdate',
     'UserDetailResponse',
+    # Auth
+    'LoginRequest',
+    'TokenResponse',
+    'SessionInfo',
     # Role
     'RoleResponse',
     'RoleUpdate',
@@ -76,9 +140,41 @@ __all__ = [
     'ProjectCreate',
     'ProjectUpdate',
     'ProjectResponse',
+    # Comment
+    'CommentCreate',
+    'CommentUpdate',
+    'CommentAuthor',
+    'CommentResponse',
+    'CommentThreadPage',
+    # Task dependency
+    'TaskDependencyCreate',
+    'TaskDependencyResponse',
+    'TaskScheduleEntry',
+    'DependencyGraphResponse',
+    # Sprint
+    'BurndownPoint',
+    'SprintBurndownResponse',
+    'SprintVelocityEntry',
+    'ProjectVelocityResponse',
+    # Analytics
+    'PortfolioMetrics',
+    'ProjectPortfolioRow',
+    'CompanyPortfolioSummary',
+    'PortfolioResponse',
+    # Calendar
+    'CalendarEventCreate',
+    'CalendarEventUpdate',
+    'CalendarEventResponse',
+    'CalendarEntry',
+    # Sync
+    'SyncTombstoneResponse',
+    'SyncResponse',
+    # Import
+    'ImportJobResponse',
     # Document
     'DocumentCreate',
     'DocumentUpdate',
     'DocumentResponse',
+    'DocumentVersionResponse',
 ]
 
@@ -0,0 +1,43 @@
+"""
+Analytics schemas for request/response validation.
+Portfolio-level aggregates across projects and companies.
+"""
+from pydantic import BaseModel
+from typing import Optional, List
+from datetime import datetime
+
+
+class PortfolioMetrics(BaseModel):
+    projects_count: int = 0
+    tasks_count: int = 0
+    done_tasks_count: int = 0
+    overdue_tasks_count: int = 0
+    overdue_ratio: float = 0
+    estimated_hours: float = 0
+    actual_hours: float = 0
+    hours_ratio: Optional[float] = None  # actual / estimated
+    budget: float = 0
+    avg_progress: float = 0  # percentage, done tasks count as 100
+
+
+class ProjectPortfolioRow(PortfolioMetrics):
+    project_id: int
+    project_name: str
+    company_id: Optional[int] = None
+    status_key: Optional[str] = None
+    time_elapsed_percentage: Optional[float] = None  # share of the project's date range already elapsed
+    schedule_variance: Optional[float] = None  # avg_progress - time_elapsed_percentage (negative = behind)
+
+
+class CompanyPortfolioSummary(PortfolioMetrics):
+    company_id: Optional[int] = None
+    company_name: Optional[str] = None
+
+
+class PortfolioResponse(BaseModel):
+    generated_at: datetime
+    company_id: Optional[int] = None
+    status_key: Optional[str] = None
+    totals: PortfolioMetrics
+    companies: List[CompanyPortfolioSummary] = []
+    projects: List[ProjectPortfolioRow] = []
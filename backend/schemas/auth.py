@@ -0,0 +1,34 @@
+"""
+Authentication schemas for request/response validation.
+"""
+from pydantic import BaseModel, EmailStr
+from typing import Optional
+from datetime import datetime
+
+from .user import UserResponse
+
+
+class LoginRequest(BaseModel):
+    email: EmailStr
+    password: str
+
+
+class TokenResponse(BaseModel):
+    access_token: str
+    token_type: str = 'bearer'
+    session_id: int
+    expires_at: datetime
+    user: UserResponse
+
+
+class SessionInfo(BaseModel):
+    session_id: int
+    user_id: int
+    expires_at: datetime
+    ip_address: Optional[str] = None
+    user_agent: Optional[str] = None
+    created_at: Optional[datetime] = None
+    last_accessed_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,69 @@
+"""
+Calendar schemas for request/response validation.
+Includes calendar events and the merged calendar entries (events, sprints, task due dates).
+"""
+from pydantic import BaseModel, Field
+from typing import Optional
+from datetime import datetime
+
+
+class CalendarEventCreate(BaseModel):
+    title: str = Field(min_length=1, max_length=255)
+    description: Optional[str] = None
+    event_type_key: str  # event_type.key (e.g., 'meeting', 'release')
+    start_date: datetime
+    end_date: datetime
+    is_all_day: bool = False
+    priority_key: Optional[str] = None  # event_priority.key (e.g., 'low', 'high')
+    status_key: Optional[str] = None  # event_status.key (e.g., 'upcoming')
+    project_id: Optional[int] = None
+    sprint_id: Optional[int] = None
+    task_id: Optional[int] = None
+    created_by: Optional[int] = None
+
+
+class CalendarEventUpdate(BaseModel):
+    title: Optional[str] = Field(default=None, min_length=1, max_length=255)
+    description: Optional[str] = None
+    event_type_key: Optional[str] = None
+    start_date: Optional[datetime] = None
+    end_date: Optional[datetime] = None
+    is_all_day: Optional[bool] = None
+    priority_key: Optional[str] = None
+    status_key: Optional[str] = None
+
+
+class CalendarEventResponse(BaseModel):
+    id: int
+    title: str
+    description: Optional[str] = None
+    event_type_key: Optional[str] = None
+    event_type_name: Optional[str] = None
+    start_date: datetime
+    end_date: datetime
+    is_all_day: bool = False
+    priority_key: Optional[str] = None
+    status_key: Optional[str] = None
+    project_id: Optional[int] = None
+    sprint_id: Optional[int] = None
+    task_id: Optional[int] = None
+    created_by: Optional[int] = None
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class CalendarEntry(BaseModel):
+    source: str  # 'event', 'sprint' or 'task'
+    id: int
+    title: str
+    start_date: datetime
+    end_date: datetime
+    is_all_day: bool = False
+    type_key: Optional[str] = None
+    project_id: Optional[int] = None
+    sprint_id: Optional[int] = None
+    task_id: Optional[int] = None
+    updated_at: Optional[datetime] = None
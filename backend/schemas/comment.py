@@ -0,0 +1,50 @@
+"""
+Comment schemas for request/response validation.
+Comments are returned as threads: each top-level comment carries its nested replies.
+"""
+from pydantic import BaseModel, Field
+from typing import Optional, List
+from datetime import datetime
+
+
+class CommentCreate(BaseModel):
+    content: str = Field(min_length=1)
+    author_id: Optional[int] = None
+    parent_comment_id: Optional[int] = None  # Reply to another comment of the same task
+
+
+class CommentUpdate(BaseModel):
+    content: str = Field(min_length=1)
+
+
+class CommentAuthor(BaseModel):
+    id: int
+    first_name: str
+    last_name: str
+    avatar_url: Optional[str] = None
+
+
+class CommentResponse(BaseModel):
+    id: int
+    task_id: int
+    parent_comment_id: Optional[int] = None
+    content: str
+    author_id: Optional[int] = None
+    author: Optional[CommentAuthor] = None
+    is_edited: bool = False
+    edited_at: Optional[datetime] = None
+    created_at: datetime
+    updated_at: datetime
+    replies_count: int = 0  # All descendants, not only direct replies
+    replies: List['CommentResponse'] = []
+
+    class Config:
+        from_attributes = True
+
+
+class CommentThreadPage(BaseModel):
+    task_id: int
+    total_threads: int = 0
+    total_comments: int = 0
+    threads: List[CommentResponse] = []
+    next_cursor: Optional[int] = None  # Pass as ?cursor= to fetch the next page
@@ -0,0 +1,51 @@
+"""
+Task dependency schemas for request/response validation.
+Includes the dependency graph analysis (topological order, critical path).
+"""
+from pydantic import BaseModel
+from typing import Optional, List
+from datetime import datetime
+
+
+class TaskDependencyCreate(BaseModel):
+    depends_on_task_id: int
+    dependency_type_key: Optional[str] = 'blocks'  # dependency_type.key (e.g., 'blocks', 'relates-to')
+
+
+class TaskDependencyResponse(BaseModel):
+    id: int
+    task_id: int
+    depends_on_task_id: int
+    depends_on_task_title: Optional[str] = None
+    dependency_type_key: Optional[str] = None
+    dependency_type_name: Optional[str] = None
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class TaskScheduleEntry(BaseModel):
+    task_id: int
+    title: str
+    duration_hours: float = 0
+    earliest_start: float = 0
+    earliest_finish: float = 0
+    latest_start: float = 0
+    latest_finish: float = 0
+    slack: float = 0
+    is_critical: bool = False
+    is_blocked: bool = False
+    is_done: bool = False
+
+
+class DependencyGraphResponse(BaseModel):
+    project_id: int
+    tasks_count: int = 0
+    dependencies_count: int = 0
+    has_cycle: bool = False
+    project_duration_hours: float = 0
+    topological_order: List[int] = []
+    critical_path: List[int] = []
+    blocked_task_ids: List[int] = []
+    schedule: List[TaskScheduleEntry] = []
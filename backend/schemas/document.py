@@ -11,7 +11,7 @@ class DocumentResponse(BaseModel):
     title: str
     description: Optional[str] = None
     file_name: str
-    file_path: str
+    file_path: Optional[str] = None  # None once the content is stored as versions
     file_size: int
     mime_type: Optional[str] = None
     project_id: Optional[int] = None
@@ -37,3 +37,21 @@ class DocumentUpdate(BaseModel):
     title: Optional[str] = None
     description: Optional[str] = None
 
+
+
+class DocumentVersionResponse(BaseModel):
+    id: int
+    document_id: int
+    version_number: int
+    file_name: Optional[str] = None
+    file_size: int
+    mime_type: Optional[str] = None
+    content_hash: Optional[str] = None  # sha256 of the whole file
+    chunk_count: int = 0
+    stored_bytes: int = 0  # New chunk bytes this version added to storage
+    change_description: Optional[str] = None
+    uploaded_by: Optional[int] = None
+    uploaded_at: datetime
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,28 @@
+"""
+Import job schemas for request/response validation.
+"""
+from pydantic import BaseModel
+from typing import Optional
+from datetime import datetime
+
+
+class ImportJobResponse(BaseModel):
+    id: int
+    project_id: int
+    status: str  # 'queued', 'running', 'completed', 'failed'
+    file_name: str
+    file_format: str  # 'csv', 'ndjson', 'json'
+    progress_percentage: int = 0  # Share of the uploaded file parsed so far
+    processed_rows: int = 0
+    imported_rows: int = 0
+    failed_rows: int = 0  # Rejected rows, listed in the error file
+    rows_per_second: Optional[float] = None
+    error_file_available: bool = False
+    error_message: Optional[str] = None  # Why a failed job stopped
+    created_by: Optional[int] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
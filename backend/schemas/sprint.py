@@ -0,0 +1,44 @@
+"""
+Sprint schemas for request/response validation.
+Includes burndown and velocity analytics.
+"""
+from pydantic import BaseModel
+from typing import Optional, List
+from datetime import date
+
+
+class BurndownPoint(BaseModel):
+    date: date
+    scope_hours: float = 0
+    remaining_hours: float = 0
+    completed_hours: float = 0
+    ideal_remaining_hours: Optional[float] = None
+    tasks_total: int = 0
+    tasks_done: int = 0
+
+
+class SprintBurndownResponse(BaseModel):
+    sprint_id: int
+    sprint_name: str
+    start_date: date
+    end_date: date
+    capacity_hours: float = 0
+    velocity_points: float = 0
+    points: List[BurndownPoint] = []
+
+
+class SprintVelocityEntry(BaseModel):
+    sprint_id: int
+    sprint_name: str
+    start_date: date
+    end_date: date
+    capacity_hours: float = 0
+    velocity_points: float = 0
+    rolling_velocity: float = 0
+
+
+class ProjectVelocityResponse(BaseModel):
+    project_id: int
+    window: int
+    average_velocity: float = 0
+    sprints: List[SprintVelocityEntry] = []
@@ -0,0 +1,29 @@
+"""
+Delta sync schemas for request/response validation.
+Changed rows are returned as plain column dictionaries to keep the payload cheap.
+"""
+from pydantic import BaseModel
+from typing import Optional, List, Dict, Any
+from datetime import datetime
+
+
+class SyncTombstoneResponse(BaseModel):
+    resource_type: str  # 'task', 'project', 'document'
+    resource_id: int
+    project_id: Optional[int] = None
+    deleted_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class SyncResponse(BaseModel):
+    next_token: Optional[str] = None  # Pass as ?since= on the next call
+    has_more: bool = False  # More changes are waiting; call again right away
+    reset_required: bool = False  # Token too old: discard local state and sync without ?since=
+    server_time: datetime
+    tasks: List[Dict[str, Any]] = []
+    projects: List[Dict[str, Any]] = []
+    sprints: List[Dict[str, Any]] = []
+    documents: List[Dict[str, Any]] = []
+    deleted: List[SyncTombstoneResponse] = []
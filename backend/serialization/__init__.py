@@ -0,0 +1,15 @@
+"""
+Serialization package - fast JSON rendering and sparse fieldsets for large responses.
+"""
+from .fast_json import FastJSONResponse, dumps, fast_response, serialize
+from .fieldsets import parse_fields, resolve_sources, sparse_response
+
+__all__ = [
+    'FastJSONResponse',
+    'dumps',
+    'fast_response',
+    'serialize',
+    'parse_fields',
+    'resolve_sources',
+    'sparse_response',
+]
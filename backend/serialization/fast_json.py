@@ -0,0 +1,79 @@
+"""
+Fast JSON responses for list endpoints.
+
+With response_model=, FastAPI takes the models a route returns, dumps them to
+dicts, validates the dicts against the response model again, runs
+jsonable_encoder over the result and finally json.dumps it. For the response
+models our services build (already validated once, at construction) that is
+three redundant passes.
+
+fast_response() serializes the content with a precompiled TypeAdapter of the
+declared response type (pydantic-core, straight to bytes) and returns it in a
+FastJSONResponse, which FastAPI sends as is. Routes keep response_model= so the
+OpenAPI schema is unchanged. Content without a declared type (plain dicts and
+lists) is rendered with orjson.
+"""
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, Dict, Optional
+import orjson
+from fastapi.responses import Response
+from pydantic import BaseModel, TypeAdapter
+
+
+def _orjson_default(value: Any) -> Any:
+    """Types orjson does not handle natively, rendered as pydantic's JSON mode does"""
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """orjson-encode plain data (dicts, lists, models, datetimes, Decimals)"""
+    return orjson.dumps(content, default=_orjson_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+class FastJSONResponse(Response):
+    """JSON response rendered with orjson; pre-serialized bytes are sent unchanged"""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, (bytes, bytearray)):
+            return bytes(content)
+        return dumps(content)
+
+
+@lru_cache(maxsize=None)
+def get_type_adapter(response_type: Any) -> TypeAdapter:
+    """One compiled adapter per response type (e.g. List[TaskResponse])"""
+    return TypeAdapter(response_type)
+
+
+def serialize(content: Any, response_type: Any, from_attributes: bool = False) -> bytes:
+    """
+    Serialize content as response_type to JSON bytes.
+    Model instances are trusted and not validated again; pass
+    from_attributes=True for ORM objects, which are validated once on the way.
+    """
+    adapter = get_type_adapter(response_type)
+    if from_attributes:
+        content = adapter.validate_python(content, from_attributes=True)
+    return adapter.dump_json(content)
+
+
+def fast_response(
+    content: Any,
+    response_type: Any = None,
+    from_attributes: bool = False,
+    status_code: int = 200,
+    headers: Optional[Dict[str, str]] = None
+) -> FastJSONResponse:
+    """Build a FastJSONResponse, bypassing FastAPI's response_model re-validation"""
+    if response_type is not None:
+        content = serialize(content, response_type, from_attributes=from_attributes)
+    return FastJSONResponse(content, status_code=status_code, headers=headers)
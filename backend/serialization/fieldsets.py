@@ -0,0 +1,68 @@
+"""
+Sparse fieldsets (?fields=id,title,status_key) for list endpoints.
+
+Services declare, per response field, the ORM columns it is computed from and
+the relationship it needs eager-loaded. A request for a subset of fields then
+loads only those columns (load_only) and relationships; the service skips the
+lookups and counts behind fields that were not requested.
+
+Rows are returned as dicts holding just the requested fields and validated
+against a partial copy of the response model (every field optional), so types
+are coerced exactly as in the full response.
+"""
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Type
+from fastapi import HTTPException, status
+from pydantic import BaseModel, ConfigDict, create_model
+
+from .fast_json import FastJSONResponse, get_type_adapter
+
+# Response field -> (columns it reads, relationship attribute to eager-load or None)
+FieldSources = Dict[str, Tuple[Tuple[Any, ...], Any]]
+
+
+def parse_fields(fields: Optional[str], model: Type[BaseModel]) -> Optional[Set[str]]:
+    """
+    Parse a comma-separated fields parameter (None = full response).
+    'id' is always included; unknown names are rejected with 400.
+    """
+    if fields is None or not fields.strip():
+        return None
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = sorted(requested - set(model.model_fields))
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown field(s): {', '.join(unknown)}. Available: {', '.join(model.model_fields)}"
+        )
+    return requested | {"id"}
+
+
+def resolve_sources(fields: Iterable[str], sources: FieldSources) -> Tuple[List[Any], List[Any]]:
+    """Columns and relationships needed to compute the requested fields"""
+    columns: List[Any] = []
+    relationships: List[Any] = []
+    for name in fields:
+        field_columns, relationship = sources[name]
+        for column in field_columns:
+            if not any(column is existing for existing in columns):
+                columns.append(column)
+        if relationship is not None and not any(relationship is existing for existing in relationships):
+            relationships.append(relationship)
+    return columns, relationships
+
+
+@lru_cache(maxsize=None)
+def partial_model(model: Type[BaseModel]) -> Type[BaseModel]:
+    """Copy of a response model with every field optional"""
+    return create_model(
+        f"{model.__name__}Fields",
+        __config__=ConfigDict(from_attributes=True),
+        **{name: (Optional[field.annotation], None) for name, field in model.model_fields.items()}
+    )
+
+
+def sparse_response(rows: List[Dict[str, Any]], model: Type[BaseModel]) -> FastJSONResponse:
+    """Serialize field-subset rows, emitting only the keys each row holds"""
+    adapter = get_type_adapter(List[partial_model(model)])
+    return FastJSONResponse(adapter.dump_json(adapter.validate_python(rows), exclude_unset=True))
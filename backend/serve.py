@@ -0,0 +1,145 @@
+"""
+Production server launcher.
+
+    python serve.py
+
+Runs the API in production mode (APP_MODE=production) on WORKERS processes,
+by default one per available core. With gunicorn installed, the app is
+imported once in the master and its routers are loaded there before the
+workers are forked (preload): workers start warm and share that memory
+copy-on-write. Without gunicorn, uvicorn's own supervisor starts the workers
+and each imports the app itself. uvloop and httptools are used when
+installed (uvicorn[standard]).
+
+On SIGTERM the workers stop accepting connections, finish in-flight requests
+for up to GRACEFUL_TIMEOUT seconds, then run the app's shutdown hooks (audit
+flush, worker pools, database pool). Note that every worker has its own
+database pool: WORKERS x (DB_POOL_MAX_SIZE + max overflow) must stay within
+MySQL's max_connections.
+
+Environment: HOST, PORT, WORKERS, MAX_WORKERS, BACKLOG, KEEPALIVE,
+GRACEFUL_TIMEOUT, WORKER_TIMEOUT, MAX_REQUESTS, LOG_LEVEL
+"""
+from typing import Dict, Any
+import importlib.util
+import logging
+import os
+
+os.environ.setdefault("APP_MODE", "production")
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("serve")
+
+
+def available_cores() -> int:
+    """Cores this process may run on (respects CPU affinity / container cpusets)"""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def server_settings() -> Dict[str, Any]:
+    """Launcher configuration from the environment"""
+    max_workers = int(os.getenv("MAX_WORKERS", "16"))
+    workers = int(os.getenv("WORKERS", "0")) or min(max_workers, available_cores())
+    return {
+        'host': os.getenv("HOST", "0.0.0.0"),
+        'port': int(os.getenv("PORT", "8000")),
+        'workers': max(1, workers),
+        'backlog': int(os.getenv("BACKLOG", "2048")),
+        'keepalive': int(os.getenv("KEEPALIVE", "5")),
+        'graceful_timeout': int(os.getenv("GRACEFUL_TIMEOUT", "30")),
+        'worker_timeout': int(os.getenv("WORKER_TIMEOUT", "60")),
+        'max_requests': int(os.getenv("MAX_REQUESTS", "0")),
+        'log_level': os.getenv("LOG_LEVEL", "info"),
+        'loop': "uvloop" if importlib.util.find_spec("uvloop") else "asyncio",
+        'http': "httptools" if importlib.util.find_spec("httptools") else "h11",
+    }
+
+
+def load_app():
+    """Import the app and its routers (in the gunicorn master, before forking)"""
+    import main
+    main.router_loader.load()
+    return main.app
+
+
+try:
+    from uvicorn.workers import UvicornWorker
+except ImportError:  # gunicorn is not installed: uvicorn runs the workers
+    UvicornWorker = None
+
+if UvicornWorker is not None:
+    class ProductionWorker(UvicornWorker):
+        """Uvicorn worker with the fast loop/parser and a bounded drain on shutdown"""
+
+        _settings = server_settings()
+        CONFIG_KWARGS = {
+            "loop": _settings['loop'],
+            "http": _settings['http'],
+            "timeout_graceful_shutdown": _settings['graceful_timeout'],
+        }
+
+
+def run_gunicorn(settings: Dict[str, Any]) -> None:
+    from gunicorn.app.base import BaseApplication
+
+    class Application(BaseApplication):
+        def load_config(self):
+            options = {
+                'bind': f"{settings['host']}:{settings['port']}",
+                'workers': settings['workers'],
+                'worker_class': "serve.ProductionWorker",
+                'preload_app': True,
+                'backlog': settings['backlog'],
+                'keepalive': settings['keepalive'],
+                # Drain window plus time for the shutdown hooks before the master kills a worker
+                'graceful_timeout': settings['graceful_timeout'] + 10,
+                'timeout': settings['worker_timeout'],
+                'max_requests': settings['max_requests'],
+                'max_requests_jitter': settings['max_requests'] // 10,
+                'loglevel': settings['log_level'],
+            }
+            for key, value in options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            return load_app()
+
+    Application().run()
+
+
+def run_uvicorn(settings: Dict[str, Any]) -> None:
+    import uvicorn
+    uvicorn.run(
+        "main:app",
+        host=settings['host'],
+        port=settings['port'],
+        workers=settings['workers'],
+        loop=settings['loop'],
+        http=settings['http'],
+        backlog=settings['backlog'],
+        timeout_keep_alive=settings['keepalive'],
+        timeout_graceful_shutdown=settings['graceful_timeout'],
+        limit_max_requests=settings['max_requests'] or None,
+        log_level=settings['log_level'],
+    )
+
+
+def main() -> None:
+    settings = server_settings()
+    preload = importlib.util.find_spec("gunicorn") is not None
+    logger.info(
+        f"Starting {settings['workers']} worker(s) on {settings['host']}:{settings['port']} "
+        f"({'gunicorn, preloaded' if preload else 'uvicorn'}, loop={settings['loop']}, http={settings['http']}, "
+        f"backlog={settings['backlog']}, keep-alive={settings['keepalive']}s, graceful={settings['graceful_timeout']}s)"
+    )
+    if preload:
+        run_gunicorn(settings)
+    else:
+        run_uvicorn(settings)
+
+
+if __name__ == "__main__":
+    main()
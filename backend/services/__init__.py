@@ -2,11 +2,39 @@ from .task_service import TaskService
 from .project_service import ProjectService
 from .user_service import UserService
 from .document_service import DocumentService
+from .document_version_service import DocumentVersionService
+from .sprint_analytics_service import SprintAnalyticsService
+from .portfolio_analytics_service import PortfolioAnalyticsService
+from .dependency_service import DependencyService
+from .calendar_service import CalendarService
+from .comment_service import CommentService
+from .audit_service import AuditService
+from .session_service import SessionService
+from .password_service import PasswordService
+from .event_service import EventService
+from .sync_service import SyncService
+from .export_service import ExportService
+from .import_service import ImportService
+from .idempotency_service import IdempotencyService
 
 __all__ = [
     'TaskService',
     'ProjectService',
     'UserService',
     'DocumentService',
+    'DocumentVersionService',
+    'SprintAnalyticsService',
+    'PortfolioAnalyticsService',
+    'DependencyService',
+    'CalendarService',
+    'CommentService',
+    'AuditService',
+    'SessionService',
+    'PasswordService',
+    'EventService',
+    'SyncService',
+    'ExportService',
+    'ImportService',
+    'IdempotencyService',
 ]
 
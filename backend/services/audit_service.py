@@ -0,0 +1,391 @@
+"""
+Audit Service - Asynchronous, batched writer for the audit_logs table.
+Write paths enqueue entries without touching the database; a background
+flusher batch-inserts them every FLUSH_INTERVAL_MS or BATCH_SIZE rows.
+Entries that cannot be queued or written are appended to a spill file and
+replayed once the database accepts writes again. Entries that can never be
+written (unparseable, or rejected by the database for their data) are moved
+to a `.corrupt` file instead of being retried.
+"""
+from sqlalchemy import insert, inspect
+from sqlalchemy.exc import IntegrityError, DataError
+from typing import Optional, Dict, List, Iterable, Tuple
+from datetime import datetime, date
+from decimal import Decimal
+from pathlib import Path
+import json
+import logging
+import os
+import queue
+import threading
+import time
+
+import database_connection
+from models.audit import AuditLog
+from middleware.request_context import get_request_context
+
+logger = logging.getLogger(__name__)
+
+
+class AuditLogWriter:
+    """Background queue + flusher that batch-inserts audit entries"""
+
+    def __init__(
+        self,
+        flush_interval_ms: int,
+        batch_size: int,
+        max_queue_size: int,
+        spill_path: Path
+    ):
+        self.flush_interval = flush_interval_ms / 1000.0
+        self.batch_size = batch_size
+        self.spill_path = Path(spill_path)
+        self.queue: "queue.Queue[Dict]" = queue.Queue(maxsize=max_queue_size)
+        self._spill_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._retry_at = 0.0
+        self.stats = {'queued': 0, 'written': 0, 'spilled': 0, 'replayed': 0, 'failed_batches': 0, 'corrupt': 0}
+
+    # ---- Producer side -------------------------------------------------
+
+    def submit(self, entry: Dict) -> None:
+        """Queue an entry; never blocks. Spills to disk when the queue is full."""
+        self.ensure_started()
+        try:
+            self.queue.put_nowait(entry)
+            self.stats['queued'] += 1
+        except queue.Full:
+            self.spill([entry])
+
+    # ---- Lifecycle -----------------------------------------------------
+
+    def ensure_started(self) -> None:
+        """Start the flusher thread (again after a fork, where threads do not survive)"""
+        if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+                return
+            if self._pid != os.getpid():
+                # A forked child inherits the parent's queued entries; the parent writes those
+                self.queue = queue.Queue(maxsize=self.queue.maxsize)
+            self._stop_event.clear()
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name="audit-log-flusher", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop the flusher, writing (or spilling) everything still queued"""
+        thread = self._thread
+        if thread is None or self._pid != os.getpid():
+            return
+        self._stop_event.set()
+        thread.join(timeout)
+        self._thread = None
+        # Anything the flusher could not drain in time goes to the spill file
+        leftovers = self._drain(None)
+        if leftovers:
+            self.spill(leftovers)
+
+    def flush(self, timeout: float = 5.0) -> None:
+        """Block until the queue is empty (used at shutdown and by maintenance scripts)"""
+        deadline = time.monotonic() + timeout
+        while not self.queue.empty() and time.monotonic() < deadline:
+            time.sleep(min(self.flush_interval, 0.05))
+
+    # ---- Flusher -------------------------------------------------------
+
+    def _run(self) -> None:
+        self._replay_spill()
+        while not self._stop_event.is_set():
+            batch = self._take_batch()
+            if batch:
+                self._write_or_spill(batch)
+            elif self.spill_path.exists() and time.monotonic() >= self._retry_at:
+                self._replay_spill()
+        remaining = self._drain(None)
+        for start in range(0, len(remaining), self.batch_size):
+            self._write_or_spill(remaining[start:start + self.batch_size])
+
+    def _take_batch(self) -> List[Dict]:
+        """Wait up to one flush interval, then collect at most batch_size entries"""
+        try:
+            first = self.queue.get(timeout=self.flush_interval)
+        except queue.Empty:
+            return []
+        batch = [first]
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self.queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _drain(self, limit: Optional[int]) -> List[Dict]:
+        entries = []
+        while limit is None or len(entries) < limit:
+            try:
+                entries.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+        return entries
+
+    def _write(self, entries: List[Dict]) -> None:
+        """Insert entries with one multi-row INSERT on a dedicated session"""
+        database_connection.ensure_engine()
+        db = database_connection.SessionLocal()
+        try:
+            db.execute(insert(AuditLog), entries)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def _insert(self, entries: List[Dict]) -> Tuple[int, List[Dict]]:
+        """
+        Insert entries; returns the number written and the entries left over
+        by a database failure (to be spilled). A batch rejected for its data
+        is retried row by row and the rows the database refuses are
+        quarantined, so they cannot block the entries behind them.
+        """
+        try:
+            self._write(entries)
+            return len(entries), []
+        except (IntegrityError, DataError) as e:
+            logger.warning(f"Audit log batch of {len(entries)} entries rejected, retrying row by row: {e.orig}")
+        except Exception as e:
+            self._back_off(e, len(entries))
+            return 0, entries
+
+        written, rejected, remaining = 0, [], []
+        for index, entry in enumerate(entries):
+            try:
+                self._write([entry])
+                written += 1
+            except (IntegrityError, DataError):
+                rejected.append(entry)
+            except Exception as e:
+                self._back_off(e, len(entries) - index)
+                remaining = entries[index:]
+                break
+        if rejected:
+            self._quarantine(
+                [json.dumps(entry, default=AuditService.to_json_value) for entry in rejected],
+                'were rejected by the database'
+            )
+        return written, remaining
+
+    def _back_off(self, error: Exception, count: int) -> None:
+        """The database is unavailable: keep entries on disk for a while"""
+        logger.warning(f"Audit log batch of {count} entries could not be written: {error}")
+        self.stats['failed_batches'] += 1
+        self._retry_at = time.monotonic() + max(self.flush_interval * 10, 5.0)
+
+    def _write_or_spill(self, entries: List[Dict]) -> bool:
+        if time.monotonic() < self._retry_at:
+            # Database recently failed: do not hammer it, keep entries on disk
+            self.spill(entries)
+            return False
+        written, remaining = self._insert(entries)
+        self.stats['written'] += written
+        if remaining:
+            self.spill(remaining)
+            return False
+        return True
+
+    # ---- Spill file ----------------------------------------------------
+
+    def spill(self, entries: Iterable[Dict]) -> None:
+        """Append entries to the spill file (fsync'ed, one JSON object per line)"""
+        lines = [json.dumps(entry, default=AuditService.to_json_value) for entry in entries]
+        if not lines:
+            return
+        with self._spill_lock:
+            try:
+                self.spill_path.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.spill_path, 'a', encoding='utf-8') as spill_file:
+                    spill_file.write('\n'.join(lines) + '\n')
+                    spill_file.flush()
+                    os.fsync(spill_file.fileno())
+                self.stats['spilled'] += len(lines)
+            except OSError as e:
+                logger.error(f"Audit log spill failed, {len(lines)} entries lost: {e}")
+
+    def _replay_spill(self) -> None:
+        """Move the spill file aside and insert its entries batch by batch"""
+        replay_path = self.spill_path.with_suffix(self.spill_path.suffix + '.replay')
+        with self._spill_lock:
+            if not replay_path.exists():
+                if not self.spill_path.exists():
+                    return
+                os.replace(self.spill_path, replay_path)
+
+        entries, corrupt = [], []
+        try:
+            with open(replay_path, 'r', encoding='utf-8', errors='replace') as replay_file:
+                for line in replay_file:
+                    if not line.strip():
+                        continue
+                    try:
+                        entries.append(AuditService.entry_from_json(line))
+                    except (ValueError, TypeError, AttributeError):
+                        corrupt.append(line.rstrip('\n'))
+        except OSError as e:
+            logger.error(f"Audit log spill file {replay_path} could not be read: {e}")
+            return
+        if corrupt:
+            self._quarantine(corrupt, 'could not be parsed')
+
+        for start in range(0, len(entries), self.batch_size):
+            written, remaining = self._insert(entries[start:start + self.batch_size])
+            self.stats['replayed'] += written
+            if remaining:
+                logger.warning("Audit log replay paused until the database accepts writes again")
+                self.spill(remaining + entries[start + self.batch_size:])
+                replay_path.unlink(missing_ok=True)
+                return
+        replay_path.unlink(missing_ok=True)
+
+    def _quarantine(self, lines: List[str], reason: str) -> None:
+        """Set entries that can never be written aside in `<spill>.corrupt` so they do not block the replay"""
+        corrupt_path = self.spill_path.with_suffix(self.spill_path.suffix + '.corrupt')
+        logger.error(f"{len(lines)} audit log entries {reason}, moved to {corrupt_path}")
+        self.stats['corrupt'] += len(lines)
+        try:
+            with open(corrupt_path, 'a', encoding='utf-8') as corrupt_file:
+                corrupt_file.write('\n'.join(lines) + '\n')
+                corrupt_file.flush()
+                os.fsync(corrupt_file.fileno())
+        except OSError as e:
+            logger.error(f"Audit log quarantine failed, {len(lines)} entries that {reason} were dropped: {e}")
+
+
+class AuditService:
+    """Service class for audit logging"""
+
+    # Configuration (overridable through the environment)
+    FLUSH_INTERVAL_MS = int(os.getenv("AUDIT_FLUSH_INTERVAL_MS", "500"))
+    BATCH_SIZE = int(os.getenv("AUDIT_BATCH_SIZE", "200"))
+    MAX_QUEUE_SIZE = int(os.getenv("AUDIT_MAX_QUEUE_SIZE", "10000"))
+    SPILL_PATH = Path(os.getenv("AUDIT_SPILL_PATH", "logs/audit_spill.jsonl"))
+
+    # Columns never copied into audit entries
+    EXCLUDED_FIELDS = {'password_hash', 'created_at', 'updated_at'}
+
+    writer = AuditLogWriter(FLUSH_INTERVAL_MS, BATCH_SIZE, MAX_QUEUE_SIZE, SPILL_PATH)
+
+    @staticmethod
+    def to_json_value(value):
+        """Convert a column value into something JSON can store"""
+        if isinstance(value, (datetime, date)):
+            return value.isoformat()
+        if isinstance(value, Decimal):
+            return float(value)
+        if isinstance(value, bytes):
+            return value.decode('utf-8', errors='replace')
+        return value
+
+    @staticmethod
+    def entry_from_json(line: str) -> Dict:
+        """Parse a spilled entry back into insertable values"""
+        entry = json.loads(line)
+        if entry.get('created_at'):
+            entry['created_at'] = datetime.fromisoformat(entry['created_at'])
+        return entry
+
+    @staticmethod
+    def snapshot(instance) -> Dict:
+        """Column values of a model instance, JSON-safe and without excluded fields"""
+        mapper = inspect(instance).mapper
+        return {
+            column.key: AuditService.to_json_value(getattr(instance, column.key))
+            for column in mapper.column_attrs
+            if column.key not in AuditService.EXCLUDED_FIELDS
+        }
+
+    @staticmethod
+    def diff(before: Dict, after: Dict) -> Tuple[Dict, Dict]:
+        """Keep only the keys whose values changed"""
+        keys = [key for key in after if before.get(key) != after.get(key)]
+        return {key: before.get(key) for key in keys}, {key: after.get(key) for key in keys}
+
+    @staticmethod
+    def record(
+        action: str,
+        resource_type: str,
+        resource_id: Optional[int] = None,
+        old_values: Optional[Dict] = None,
+        new_values: Optional[Dict] = None,
+        user_id: Optional[int] = None
+    ) -> None:
+        """
+        Queue an audit entry. Call after the audited change has been committed.
+        Never raises: auditing must not fail the request it describes.
+        """
+        try:
+            context = get_request_context()
+            AuditService.writer.submit({
+                'user_id': user_id if user_id is not None else context.get('user_id'),
+                'action': action,
+                'resource_type': resource_type,
+                'resource_id': resource_id,
+                'old_values': old_values,
+                'new_values': new_values,
+                'ip_address': context.get('ip_address'),
+                'user_agent': context.get('user_agent'),
+                'created_at': datetime.now().replace(microsecond=0),
+            })
+        except Exception as e:
+            logger.warning(f"Failed to queue audit entry {action} {resource_type}/{resource_id}: {e}")
+
+    @staticmethod
+    def record_create(resource_type: str, instance, user_id: Optional[int] = None) -> None:
+        """Audit the creation of a model instance"""
+        AuditService.record(
+            f"{resource_type}.create", resource_type, instance.id,
+            new_values=AuditService.snapshot(instance), user_id=user_id
+        )
+
+    @staticmethod
+    def record_update(
+        resource_type: str,
+        resource_id: int,
+        before: Dict,
+        after: Dict,
+        user_id: Optional[int] = None
+    ) -> None:
+        """Audit an update, storing only the changed fields (no-op updates are skipped)"""
+        old_values, new_values = AuditService.diff(before, after)
+        if new_values:
+            AuditService.record(
+                f"{resource_type}.update", resource_type, resource_id,
+                old_values=old_values, new_values=new_values, user_id=user_id
+            )
+
+    @staticmethod
+    def record_delete(resource_type: str, resource_id: int, before: Dict, user_id: Optional[int] = None) -> None:
+        """Audit the deletion of a model instance"""
+        AuditService.record(
+            f"{resource_type}.delete", resource_type, resource_id,
+            old_values=before, user_id=user_id
+        )
+
+    @staticmethod
+    def start() -> None:
+        """Start the background flusher (it also starts lazily on first use)"""
+        AuditService.writer.ensure_started()
+
+    @staticmethod
+    def shutdown(timeout: float = 5.0) -> None:
+        """Flush queued entries and stop the flusher"""
+        AuditService.writer.flush(timeout)
+        AuditService.writer.stop(timeout)
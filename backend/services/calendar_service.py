@@ -0,0 +1,455 @@
+"""
+Calendar Service - Business logic for calendar events and calendar views.
+Events, sprints and task due dates of a project are loaded with one merged
+query into an interval tree, which then answers range queries from memory.
+The same cached entries back an iCal feed with a stable ETag.
+"""
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import select, union_all, literal, cast, null, BigInteger, Boolean, String
+from typing import Optional, List, Dict, Tuple
+from datetime import datetime, timedelta, time
+import hashlib
+import threading
+import time as time_module
+from fastapi import HTTPException, status
+
+from models.calendar import CalendarEvent, EventType, EventPriority, EventStatus
+from models.project import Project, Sprint
+from models.task import Task
+from schemas.calendar import (
+    CalendarEventCreate,
+    CalendarEventUpdate,
+    CalendarEventResponse,
+    CalendarEntry,
+)
+
+
+class IntervalTree:
+    """
+    Static augmented interval tree.
+    Intervals are kept sorted by start in an implicit balanced BST (the middle
+    of every slice is its root); each node stores the max end of its subtree,
+    so overlap queries run in O(log n + k).
+    """
+
+    def __init__(self, intervals: List[Tuple[datetime, datetime, object]]):
+        self.intervals = sorted(intervals, key=lambda interval: interval[0])
+        self.max_end: List[Optional[datetime]] = [None] * len(self.intervals)
+        self._build(0, len(self.intervals) - 1)
+
+    def _build(self, lo: int, hi: int) -> Optional[datetime]:
+        if lo > hi:
+            return None
+        mid = (lo + hi) // 2
+        max_end = self.intervals[mid][1]
+        for child in (self._build(lo, mid - 1), self._build(mid + 1, hi)):
+            if child is not None and child > max_end:
+                max_end = child
+        self.max_end[mid] = max_end
+        return max_end
+
+    def __len__(self) -> int:
+        return len(self.intervals)
+
+    def query(self, start: datetime, end: datetime) -> List[object]:
+        """Return items whose [start, end] overlaps the query range, ordered by start"""
+        found: List[Tuple[datetime, object]] = []
+        stack = [(0, len(self.intervals) - 1)]
+        while stack:
+            lo, hi = stack.pop()
+            if lo > hi:
+                continue
+            mid = (lo + hi) // 2
+            if self.max_end[mid] < start:
+                continue  # Nothing in this subtree ends after the range starts
+            stack.append((lo, mid - 1))
+            item_start, item_end, item = self.intervals[mid]
+            if item_start <= end:
+                if item_end >= start:
+                    found.append((item_start, item))
+                stack.append((mid + 1, hi))
+        found.sort(key=lambda pair: pair[0])
+        return [item for _, item in found]
+
+
+class CalendarService:
+    """Service class for calendar business logic"""
+
+    # Cached project calendars are rebuilt at least this often, so changes made
+    # by other workers or outside the services show up within the TTL
+    CACHE_TTL_SECONDS = 60
+
+    # Per-process cache: project_id -> {'tree', 'etag', 'ics', 'loaded_at'}
+    _cache: Dict[int, Dict] = {}
+    _cache_lock = threading.Lock()
+
+    @staticmethod
+    def invalidate_project(project_id: Optional[int]) -> None:
+        """Drop the cached calendar of a project"""
+        if project_id:
+            with CalendarService._cache_lock:
+                CalendarService._cache.pop(project_id, None)
+
+    @staticmethod
+    def merged_entries_query(
+        project_id: Optional[int] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ):
+        """
+        One UNION ALL over calendar_events, sprints and task due dates,
+        normalized to (source, id, title, start, end, all-day, type, ...).
+        """
+        events = select(
+            literal('event').label('source'),
+            CalendarEvent.id.label('id'),
+            CalendarEvent.title.label('title'),
+            CalendarEvent.start_date.label('start_date'),
+            CalendarEvent.end_date.label('end_date'),
+            CalendarEvent.is_all_day.label('is_all_day'),
+            EventType.key.label('type_key'),
+            CalendarEvent.project_id.label('project_id'),
+            CalendarEvent.sprint_id.label('sprint_id'),
+            CalendarEvent.task_id.label('task_id'),
+            CalendarEvent.updated_at.label('updated_at')
+        ).outerjoin(EventType, EventType.id == CalendarEvent.event_type_id)
+
+        sprints = select(
+            literal('sprint'),
+            Sprint.id,
+            Sprint.name,
+            Sprint.start_date,
+            Sprint.end_date,
+            cast(literal(True), Boolean),
+            cast(literal('sprint'), String),
+            Sprint.project_id,
+            Sprint.id,
+            cast(null(), BigInteger),
+            Sprint.updated_at
+        )
+
+        tasks = select(
+            literal('task'),
+            Task.id,
+            Task.title,
+            Task.due_date,
+            Task.due_date,
+            cast(literal(False), Boolean),
+            cast(literal('task-deadline'), String),
+            Task.project_id,
+            Task.sprint_id,
+            Task.id,
+            Task.updated_at
+        ).where(Task.due_date.isnot(None))
+
+        if project_id:
+            events = events.where(CalendarEvent.project_id == project_id)
+            sprints = sprints.where(Sprint.project_id == project_id)
+            tasks = tasks.where(Task.project_id == project_id)
+
+        # Range predicates are served by idx_events_dates, idx_sprints_dates and idx_tasks_due_date
+        if start is not None:
+            events = events.where(CalendarEvent.end_date >= start)
+            sprints = sprints.where(Sprint.end_date >= start.date())
+            tasks = tasks.where(Task.due_date >= start)
+        if end is not None:
+            events = events.where(CalendarEvent.start_date <= end)
+            sprints = sprints.where(Sprint.start_date <= end.date())
+            tasks = tasks.where(Task.due_date <= end)
+
+        return union_all(events, sprints, tasks)
+
+    @staticmethod
+    def row_to_entry(row) -> CalendarEntry:
+        """Convert a merged-query row into a CalendarEntry"""
+        start_date, end_date = row.start_date, row.end_date
+        if row.source == 'sprint':
+            # Sprint dates are DATE columns; a sprint covers its whole last day
+            if not isinstance(start_date, datetime):
+                start_date = datetime.combine(start_date, time.min)
+            end_day = end_date if not isinstance(end_date, datetime) else end_date.date()
+            end_date = datetime.combine(end_day, time(23, 59, 59))
+        return CalendarEntry(
+            source=row.source,
+            id=row.id,
+            title=row.title,
+            start_date=start_date,
+            end_date=end_date,
+            is_all_day=bool(row.is_all_day),
+            type_key=row.type_key,
+            project_id=row.project_id,
+            sprint_id=row.sprint_id,
+            task_id=row.task_id,
+            updated_at=row.updated_at
+        )
+
+    @staticmethod
+    def compute_etag(entries: List[CalendarEntry]) -> str:
+        """Stable fingerprint of a set of calendar entries"""
+        digest = hashlib.sha1()
+        for entry in sorted(entries, key=lambda e: (e.source, e.id)):
+            digest.update(
+                f"{entry.source}:{entry.id}:{entry.updated_at}:{entry.start_date}:{entry.end_date}:{entry.title}\n".encode()
+            )
+        return f'"{digest.hexdigest()}"'
+
+    @staticmethod
+    def get_project_calendar(project_id: int, db: Session) -> Dict:
+        """Get the cached calendar of a project, rebuilding it on a miss or after the TTL"""
+        now = time_module.monotonic()
+        with CalendarService._cache_lock:
+            cached = CalendarService._cache.get(project_id)
+        if cached and now - cached['loaded_at'] < CalendarService.CACHE_TTL_SECONDS:
+            return cached
+
+        rows = db.execute(CalendarService.merged_entries_query(project_id=project_id)).all()
+        entries = [CalendarService.row_to_entry(row) for row in rows]
+        calendar = {
+            'tree': IntervalTree([(e.start_date, e.end_date, e) for e in entries]),
+            'etag': CalendarService.compute_etag(entries),
+            'ics': None,
+            'loaded_at': now,
+        }
+        with CalendarService._cache_lock:
+            CalendarService._cache[project_id] = calendar
+        return calendar
+
+    @staticmethod
+    def to_server_time(value: Optional[datetime]) -> Optional[datetime]:
+        """Convert a tz-aware datetime to naive server time (stored datetimes are naive)"""
+        if value is None or value.tzinfo is None:
+            return value
+        return value.astimezone().replace(tzinfo=None)
+
+    @staticmethod
+    def validate_range(start: datetime, end: datetime) -> None:
+        """Validate that a query range is not inverted"""
+        if start > end:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Start date cannot be after end date"
+            )
+
+    @staticmethod
+    def list_entries(
+        db: Session,
+        start: datetime,
+        end: datetime,
+        project_id: Optional[int] = None
+    ) -> List[CalendarEntry]:
+        """
+        List events, sprints and task due dates overlapping [start, end].
+        Project views are answered from the project's interval tree; the
+        unscoped view runs the merged query with index-backed range filters.
+        """
+        start, end = CalendarService.to_server_time(start), CalendarService.to_server_time(end)
+        CalendarService.validate_range(start, end)
+        if project_id:
+            calendar = CalendarService.get_project_calendar(project_id, db)
+            return calendar['tree'].query(start, end)
+
+        rows = db.execute(CalendarService.merged_entries_query(start=start, end=end)).all()
+        entries = [CalendarService.row_to_entry(row) for row in rows]
+        entries.sort(key=lambda e: e.start_date)
+        return entries
+
+    @staticmethod
+    def escape_ical(value: Optional[str]) -> str:
+        """Escape a TEXT value for iCalendar (RFC 5545)"""
+        if not value:
+            return ''
+        return (
+            value.replace('\\', '\\\\')
+            .replace(';', '\\;')
+            .replace(',', '\\,')
+            .replace('\r\n', '\\n')
+            .replace('\n', '\\n')
+        )
+
+    @staticmethod
+    def fold_ical_line(line: str) -> str:
+        """Fold a content line at 75 octets (RFC 5545 section 3.1)"""
+        encoded = line.encode('utf-8')
+        if len(encoded) <= 75:
+            return line
+        parts = []
+        current = b''
+        for char in line:
+            char_bytes = char.encode('utf-8')
+            limit = 75 if not parts else 74
+            if len(current) + len(char_bytes) > limit:
+                parts.append(current.decode('utf-8'))
+                current = b''
+            current += char_bytes
+        parts.append(current.decode('utf-8'))
+        return '\r\n '.join(parts)
+
+    @staticmethod
+    def render_ical(project_id: int, entries: List[CalendarEntry]) -> str:
+        """Render calendar entries as an iCalendar document"""
+        stamp_format = '%Y%m%dT%H%M%S'
+        lines = [
+            'BEGIN:VCALENDAR',
+            'VERSION:2.0',
+            'PRODID:-//SmartSprint//Project Calendar//EN',
+            'CALSCALE:GREGORIAN',
+            f'X-WR-CALNAME:SmartSprint project {project_id}',
+        ]
+        for entry in entries:
+            lines.append('BEGIN:VEVENT')
+            lines.append(f'UID:{entry.source}-{entry.id}@smartsprint')
+            lines.append(f'DTSTAMP:{(entry.updated_at or datetime.now()).strftime(stamp_format)}')
+            if entry.is_all_day:
+                lines.append(f'DTSTART;VALUE=DATE:{entry.start_date.strftime("%Y%m%d")}')
+                # DTEND is exclusive for all-day events
+                lines.append(f'DTEND;VALUE=DATE:{(entry.end_date.date() + timedelta(days=1)).strftime("%Y%m%d")}')
+            else:
+                lines.append(f'DTSTART:{entry.start_date.strftime(stamp_format)}')
+                lines.append(f'DTEND:{entry.end_date.strftime(stamp_format)}')
+            lines.append(f'SUMMARY:{CalendarService.escape_ical(entry.title)}')
+            if entry.type_key:
+                lines.append(f'CATEGORIES:{CalendarService.escape_ical(entry.type_key)}')
+            lines.append('END:VEVENT')
+        lines.append('END:VCALENDAR')
+        return '\r\n'.join(CalendarService.fold_ical_line(line) for line in lines) + '\r\n'
+
+    @staticmethod
+    def get_project_ical(project_id: int, db: Session) -> Tuple[str, str]:
+        """Return (etag, ics) for a project's calendar feed, rendering at most once per cache entry"""
+        calendar = CalendarService.get_project_calendar(project_id, db)
+        if calendar['ics'] is None:
+            calendar['ics'] = CalendarService.render_ical(project_id, list(calendar['tree'].query(datetime.min, datetime.max)))
+        return calendar['etag'], calendar['ics']
+
+    @staticmethod
+    def get_project_etag(project_id: int, db: Session) -> str:
+        """ETag of a project's calendar feed (served from cache when fresh)"""
+        return CalendarService.get_project_calendar(project_id, db)['etag']
+
+    @staticmethod
+    def validate_project(project_id: int, db: Session) -> None:
+        """Validate project exists"""
+        project = db.query(Project.id).filter(Project.id == project_id).first()
+        if not project:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Project not found"
+            )
+
+    @staticmethod
+    def validate_lookup_key(model, key: Optional[str], label: str, db: Session) -> Optional[int]:
+        """Validate a lookup key (event type/priority/status) and return its id"""
+        if not key:
+            return None
+        row = db.query(model).filter(model.key == key).first()
+        if not row:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"{label} '{key}' not found"
+            )
+        return row.id
+
+    @staticmethod
+    def build_event_response(event: CalendarEvent) -> CalendarEventResponse:
+        """Build CalendarEventResponse with lookup keys"""
+        return CalendarEventResponse(
+            id=event.id,
+            title=event.title,
+            description=event.description,
+            event_type_key=event.event_type.key if event.event_type else None,
+            event_type_name=event.event_type.name if event.event_type else None,
+            start_date=event.start_date,
+            end_date=event.end_date,
+            is_all_day=bool(event.is_all_day),
+            priority_key=event.priority.key if event.priority else None,
+            status_key=event.status.key if event.status else None,
+            project_id=event.project_id,
+            sprint_id=event.sprint_id,
+            task_id=event.task_id,
+            created_by=event.created_by,
+            created_at=event.created_at,
+            updated_at=event.updated_at
+        )
+
+    @staticmethod
+    def get_event_by_id(event_id: int, db: Session) -> CalendarEvent:
+        """Get a calendar event by ID, raising HTTPException if not found"""
+        event = db.query(CalendarEvent).options(
+            joinedload(CalendarEvent.event_type),
+            joinedload(CalendarEvent.priority),
+            joinedload(CalendarEvent.status)
+        ).filter(CalendarEvent.id == event_id).first()
+        if not event:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Calendar event not found"
+            )
+        return event
+
+    @staticmethod
+    def create_event(payload: CalendarEventCreate, db: Session) -> CalendarEvent:
+        """Create a calendar event with validation"""
+        start_date = CalendarService.to_server_time(payload.start_date)
+        end_date = CalendarService.to_server_time(payload.end_date)
+        CalendarService.validate_range(start_date, end_date)
+        event_type_id = CalendarService.validate_lookup_key(EventType, payload.event_type_key, "Event type", db)
+        priority_id = CalendarService.validate_lookup_key(EventPriority, payload.priority_key, "Event priority", db)
+        status_id = CalendarService.validate_lookup_key(EventStatus, payload.status_key, "Event status", db)
+        if payload.project_id:
+            CalendarService.validate_project(payload.project_id, db)
+
+        event = CalendarEvent(
+            title=payload.title,
+            description=payload.description,
+            event_type_id=event_type_id,
+            start_date=start_date,
+            end_date=end_date,
+            is_all_day=payload.is_all_day,
+            priority_id=priority_id,
+            status_id=status_id,
+            project_id=payload.project_id,
+            sprint_id=payload.sprint_id,
+            task_id=payload.task_id,
+            created_by=payload.created_by
+        )
+        db.add(event)
+        db.commit()
+        CalendarService.invalidate_project(event.project_id)
+        return CalendarService.get_event_by_id(event.id, db)
+
+    @staticmethod
+    def update_event(event_id: int, payload: CalendarEventUpdate, db: Session) -> CalendarEvent:
+        """Update a calendar event with validation"""
+        event = CalendarService.get_event_by_id(event_id, db)
+
+        if payload.title is not None:
+            event.title = payload.title
+        if payload.description is not None:
+            event.description = payload.description
+        if payload.event_type_key is not None:
+            event.event_type_id = CalendarService.validate_lookup_key(EventType, payload.event_type_key, "Event type", db)
+        if payload.priority_key is not None:
+            event.priority_id = CalendarService.validate_lookup_key(EventPriority, payload.priority_key, "Event priority", db)
+        if payload.status_key is not None:
+            event.status_id = CalendarService.validate_lookup_key(EventStatus, payload.status_key, "Event status", db)
+        if payload.start_date is not None:
+            event.start_date = CalendarService.to_server_time(payload.start_date)
+        if payload.end_date is not None:
+            event.end_date = CalendarService.to_server_time(payload.end_date)
+        if payload.is_all_day is not None:
+            event.is_all_day = payload.is_all_day
+
+        CalendarService.validate_range(event.start_date, event.end_date)
+
+        db.commit()
+        CalendarService.invalidate_project(event.project_id)
+        return CalendarService.get_event_by_id(event_id, db)
+
+    @staticmethod
+    def delete_event(event_id: int, db: Session) -> None:
+        """Delete a calendar event"""
+        event = CalendarService.get_event_by_id(event_id, db)
+        project_id = event.project_id
+        db.delete(event)
+        db.commit()
+        CalendarService.invalidate_project(project_id)
@@ -0,0 +1,263 @@
+"""
+Comment Service - Business logic for threaded task comments.
+A task's whole comment tree is fetched with one query and assembled in
+memory; authors are resolved with one bulk query per page.
+"""
+from sqlalchemy.orm import Session
+from sqlalchemy import select
+from typing import Optional, List, Dict
+from datetime import datetime
+from fastapi import HTTPException, status
+
+from models.task import Task, Comment
+from models.user import User
+from schemas.comment import (
+    CommentCreate,
+    CommentUpdate,
+    CommentAuthor,
+    CommentResponse,
+    CommentThreadPage,
+)
+
+
+class CommentService:
+    """Service class for comment business logic"""
+
+    DEFAULT_PAGE_SIZE = 20
+
+    @staticmethod
+    def validate_task(task_id: int, db: Session) -> None:
+        """Validate task exists"""
+        task = db.query(Task.id).filter(Task.id == task_id).first()
+        if not task:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Task not found"
+            )
+
+    @staticmethod
+    def load_task_comments(task_id: int, db: Session) -> Dict[int, Dict]:
+        """Load every comment of a task as plain rows keyed by id (single query)"""
+        rows = db.execute(
+            select(
+                Comment.id,
+                Comment.task_id,
+                Comment.parent_comment_id,
+                Comment.content,
+                Comment.author_id,
+                Comment.is_edited,
+                Comment.edited_at,
+                Comment.created_at,
+                Comment.updated_at
+            ).where(Comment.task_id == task_id).order_by(Comment.id)
+        ).mappings().all()
+        return {row['id']: dict(row) for row in rows}
+
+    @staticmethod
+    def build_children_index(comments: Dict[int, Dict]) -> Dict[Optional[int], List[int]]:
+        """
+        Map parent id -> child ids (ascending). Comments whose parent is missing
+        from the task are treated as top-level so they are never lost.
+        """
+        children: Dict[Optional[int], List[int]] = {None: []}
+        for comment_id, comment in comments.items():
+            parent_id = comment['parent_comment_id']
+            if parent_id not in comments:
+                parent_id = None
+            children.setdefault(parent_id, []).append(comment_id)
+        return children
+
+    @staticmethod
+    def collect_subtree(root_ids: List[int], children: Dict[Optional[int], List[int]]) -> List[int]:
+        """Return the ids of the given roots and all of their descendants"""
+        collected = []
+        stack = list(root_ids)
+        while stack:
+            comment_id = stack.pop()
+            collected.append(comment_id)
+            stack.extend(children.get(comment_id, []))
+        return collected
+
+    @staticmethod
+    def load_authors(author_ids, db: Session) -> Dict[int, CommentAuthor]:
+        """Resolve comment authors with one query"""
+        author_ids = {author_id for author_id in author_ids if author_id is not None}
+        if not author_ids:
+            return {}
+        rows = db.query(User.id, User.first_name, User.last_name, User.avatar_url).filter(
+            User.id.in_(author_ids)
+        ).all()
+        return {
+            row.id: CommentAuthor(
+                id=row.id,
+                first_name=row.first_name,
+                last_name=row.last_name,
+                avatar_url=row.avatar_url
+            )
+            for row in rows
+        }
+
+    @staticmethod
+    def build_threads(
+        root_ids: List[int],
+        comments: Dict[int, Dict],
+        children: Dict[Optional[int], List[int]],
+        db: Session
+    ) -> List[CommentResponse]:
+        """
+        Assemble CommentResponse trees for the given roots without recursion.
+        Replies always have larger ids than their parent, so building in
+        descending id order guarantees children exist before their parent.
+        """
+        subtree_ids = CommentService.collect_subtree(root_ids, children)
+        authors = CommentService.load_authors((comments[i]['author_id'] for i in subtree_ids), db)
+
+        built: Dict[int, CommentResponse] = {}
+        for comment_id in sorted(subtree_ids, reverse=True):
+            comment = comments[comment_id]
+            replies = [built[child_id] for child_id in children.get(comment_id, []) if child_id in built]
+            built[comment_id] = CommentResponse(
+                id=comment['id'],
+                task_id=comment['task_id'],
+                parent_comment_id=comment['parent_comment_id'],
+                content=comment['content'],
+                author_id=comment['author_id'],
+                author=authors.get(comment['author_id']),
+                is_edited=bool(comment['is_edited']),
+                edited_at=comment['edited_at'],
+                created_at=comment['created_at'],
+                updated_at=comment['updated_at'],
+                replies_count=sum(1 + reply.replies_count for reply in replies),
+                replies=replies
+            )
+        return [built[root_id] for root_id in root_ids]
+
+    @staticmethod
+    def list_threads(
+        task_id: int,
+        db: Session,
+        cursor: Optional[int] = None,
+        limit: int = DEFAULT_PAGE_SIZE
+    ) -> CommentThreadPage:
+        """
+        Get a page of top-level comment threads of a task, oldest first.
+        The cursor is the id of the last thread of the previous page.
+        """
+        CommentService.validate_task(task_id, db)
+        comments = CommentService.load_task_comments(task_id, db)
+        children = CommentService.build_children_index(comments)
+
+        roots = children[None]
+        if cursor is not None:
+            roots = [root_id for root_id in roots if root_id > cursor]
+        page_roots = roots[:limit]
+        next_cursor = page_roots[-1] if len(roots) > limit else None
+
+        return CommentThreadPage(
+            task_id=task_id,
+            total_threads=len(children[None]),
+            total_comments=len(comments),
+            threads=CommentService.build_threads(page_roots, comments, children, db),
+            next_cursor=next_cursor
+        )
+
+    @staticmethod
+    def get_comment_by_id(comment_id: int, db: Session) -> Comment:
+        """Get a comment by ID, raising HTTPException if not found"""
+        comment = db.query(Comment).filter(Comment.id == comment_id).first()
+        if not comment:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Comment not found"
+            )
+        return comment
+
+    @staticmethod
+    def get_thread(comment_id: int, db: Session) -> CommentResponse:
+        """Get a comment with all of its nested replies"""
+        comment = CommentService.get_comment_by_id(comment_id, db)
+        comments = CommentService.load_task_comments(comment.task_id, db)
+        children = CommentService.build_children_index(comments)
+        return CommentService.build_threads([comment_id], comments, children, db)[0]
+
+    @staticmethod
+    def create_comment(task_id: int, payload: CommentCreate, db: Session) -> CommentResponse:
+        """Create a comment or a reply on a task"""
+        CommentService.validate_task(task_id, db)
+
+        if payload.parent_comment_id is not None:
+            parent = db.query(Comment.task_id).filter(Comment.id == payload.parent_comment_id).first()
+            if not parent:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Parent comment with id {payload.parent_comment_id} not found"
+                )
+            if parent.task_id != task_id:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Parent comment belongs to a different task"
+                )
+
+        if payload.author_id is not None:
+            author = db.query(User.id).filter(User.id == payload.author_id).first()
+            if not author:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Author with id {payload.author_id} not found"
+                )
+
+        comment = Comment(
+            content=payload.content,
+            task_id=task_id,
+            parent_comment_id=payload.parent_comment_id,
+            author_id=payload.author_id
+        )
+        db.add(comment)
+        db.commit()
+        db.refresh(comment)
+        return CommentService.build_comment_response(comment, db)
+
+    @staticmethod
+    def build_comment_response(comment: Comment, db: Session) -> CommentResponse:
+        """Build a CommentResponse for a single comment (without replies)"""
+        authors = CommentService.load_authors([comment.author_id], db)
+        return CommentResponse(
+            id=comment.id,
+            task_id=comment.task_id,
+            parent_comment_id=comment.parent_comment_id,
+            content=comment.content,
+            author_id=comment.author_id,
+            author=authors.get(comment.author_id),
+            is_edited=bool(comment.is_edited),
+            edited_at=comment.edited_at,
+            created_at=comment.created_at,
+            updated_at=comment.updated_at
+        )
+
+    @staticmethod
+    def update_comment(comment_id: int, payload: CommentUpdate, db: Session) -> CommentResponse:
+        """Edit a comment's content"""
+        comment = CommentService.get_comment_by_id(comment_id, db)
+        if payload.content != comment.content:
+            comment.content = payload.content
+            comment.is_edited = True
+            comment.edited_at = datetime.now()
+            db.commit()
+            db.refresh(comment)
+        return CommentService.build_comment_response(comment, db)
+
+    @staticmethod
+    def delete_comment(comment_id: int, db: Session) -> None:
+        """Delete a comment together with all of its replies"""
+        comment = CommentService.get_comment_by_id(comment_id, db)
+        comments = CommentService.load_task_comments(comment.task_id, db)
+        children = CommentService.build_children_index(comments)
+        subtree_ids = CommentService.collect_subtree([comment_id], children)
+
+        # fk_comments_parent has no ON DELETE CASCADE: detach the subtree first
+        # so the whole thread can be removed with one DELETE
+        db.query(Comment).filter(Comment.id.in_(subtree_ids)).update(
+            {Comment.parent_comment_id: None}, synchronize_session=False
+        )
+        db.query(Comment).filter(Comment.id.in_(subtree_ids)).delete(synchronize_session=False)
+        db.commit()
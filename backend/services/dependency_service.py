@@ -0,0 +1,377 @@
+"""
+Dependency Service - Business logic for task dependencies.
+Keeps an in-memory adjacency index per project for cycle detection, topological
+ordering and critical-path scheduling, all in O(V+E). Analyses are cached per
+project and invalidated whenever a dependency or a task of the project changes;
+invalidations are relayed to the other workers over the event bus.
+"""
+from sqlalchemy.orm import Session, joinedload
+from typing import Optional, List, Dict, Set, Tuple
+from collections import defaultdict, deque
+import threading
+import time
+from fastapi import HTTPException, status
+
+import database_connection
+from models.project import Project
+from models.task import Task, TaskDependency, DependencyType
+from schemas.dependency import (
+    TaskDependencyCreate,
+    TaskDependencyResponse,
+    TaskScheduleEntry,
+    DependencyGraphResponse,
+)
+from services.event_service import EventService
+from services.sprint_analytics_service import SprintAnalyticsService
+
+
+class DependencyGraph:
+    """
+    Directed graph of blocking dependencies within one project.
+    An edge (a -> b) means task b cannot start before task a finishes.
+    """
+
+    def __init__(self, titles: Dict[int, str], durations: Dict[int, float], done: Set[int]):
+        self.titles = titles
+        self.durations = durations
+        self.done = done
+        self.successors: Dict[int, List[int]] = defaultdict(list)
+        self.predecessors: Dict[int, List[int]] = defaultdict(list)
+        self.edges_count = 0
+
+    def add_edge(self, before: int, after: int) -> None:
+        self.successors[before].append(after)
+        self.predecessors[after].append(before)
+        self.edges_count += 1
+
+    def reaches(self, source: int, target: int) -> bool:
+        """Iterative DFS: is there a path source -> ... -> target?"""
+        stack = [source]
+        seen = {source}
+        while stack:
+            node = stack.pop()
+            if node == target:
+                return True
+            for nxt in self.successors.get(node, ()):
+                if nxt not in seen:
+                    seen.add(nxt)
+                    stack.append(nxt)
+        return False
+
+    def would_create_cycle(self, before: int, after: int) -> bool:
+        """Adding before -> after closes a cycle iff after already reaches before"""
+        return before == after or self.reaches(after, before)
+
+    def topological_order(self) -> Tuple[List[int], bool]:
+        """Kahn's algorithm. Returns (order, has_cycle); cyclic nodes are left out"""
+        in_degree = {node: len(self.predecessors.get(node, ())) for node in self.titles}
+        queue = deque(sorted(node for node, degree in in_degree.items() if degree == 0))
+        order: List[int] = []
+        while queue:
+            node = queue.popleft()
+            order.append(node)
+            for nxt in self.successors.get(node, ()):
+                in_degree[nxt] -= 1
+                if in_degree[nxt] == 0:
+                    queue.append(nxt)
+        return order, len(order) != len(self.titles)
+
+    def analyze(self, project_id: int) -> DependencyGraphResponse:
+        """Forward/backward pass over the topological order (critical path method)"""
+        order, has_cycle = self.topological_order()
+
+        earliest_start: Dict[int, float] = {}
+        earliest_finish: Dict[int, float] = {}
+        for node in order:
+            start = max((earliest_finish[p] for p in self.predecessors.get(node, ()) if p in earliest_finish), default=0.0)
+            earliest_start[node] = start
+            earliest_finish[node] = start + self.durations.get(node, 0.0)
+
+        project_duration = max(earliest_finish.values(), default=0.0)
+
+        latest_start: Dict[int, float] = {}
+        latest_finish: Dict[int, float] = {}
+        for node in reversed(order):
+            finish = min((latest_start[s] for s in self.successors.get(node, ()) if s in latest_start), default=project_duration)
+            latest_finish[node] = finish
+            latest_start[node] = finish - self.durations.get(node, 0.0)
+
+        critical = {node for node in order if abs(latest_start[node] - earliest_start[node]) < 1e-9}
+
+        # Walk one critical chain from a critical source to the latest-finishing sink
+        critical_path: List[int] = []
+        current = next(
+            (node for node in order if node in critical and earliest_start[node] == 0
+             and not any(p in critical for p in self.predecessors.get(node, ()))),
+            None
+        )
+        while current is not None:
+            critical_path.append(current)
+            current = next(
+                (s for s in self.successors.get(current, ())
+                 if s in critical and abs(earliest_start[s] - earliest_finish[current]) < 1e-9),
+                None
+            )
+
+        # A task is blocked while any of its predecessors is not done
+        blocked = sorted(
+            node for node in self.titles
+            if node not in self.done and any(p not in self.done for p in self.predecessors.get(node, ()))
+        )
+        blocked_set = set(blocked)
+
+        schedule = [
+            TaskScheduleEntry(
+                task_id=node,
+                title=self.titles[node],
+                duration_hours=round(self.durations.get(node, 0.0), 2),
+                earliest_start=round(earliest_start[node], 2),
+                earliest_finish=round(earliest_finish[node], 2),
+                latest_start=round(latest_start[node], 2),
+                latest_finish=round(latest_finish[node], 2),
+                slack=round(latest_start[node] - earliest_start[node], 2),
+                is_critical=node in critical,
+                is_blocked=node in blocked_set,
+                is_done=node in self.done
+            )
+            for node in order
+        ]
+
+        return DependencyGraphResponse(
+            project_id=project_id,
+            tasks_count=len(self.titles),
+            dependencies_count=self.edges_count,
+            has_cycle=has_cycle,
+            project_duration_hours=round(project_duration, 2),
+            topological_order=order,
+            critical_path=critical_path,
+            blocked_task_ids=blocked,
+            schedule=schedule
+        )
+
+
+class DependencyService:
+    """Service class for task dependency business logic"""
+
+    # Dependency types that constrain ordering; others are informational
+    BLOCKING_TYPE_KEYS = {'blocks'}
+
+    # Cached analyses are rebuilt at least this often, in case an invalidation
+    # from another worker was lost (or the event bus is disabled)
+    CACHE_TTL_SECONDS = 60
+
+    # Per-process cache: project_id -> (analysis, loaded_at). A project's
+    # generation is bumped by every invalidation; an analysis is only stored
+    # if no invalidation happened while it was being built.
+    _cache: Dict[int, Tuple[DependencyGraphResponse, float]] = {}
+    _generations: Dict[int, int] = defaultdict(int)
+    _cache_lock = threading.Lock()
+
+    @staticmethod
+    def invalidate_project(project_id: Optional[int]) -> None:
+        """Drop the cached analysis of a project here and in the other workers (call on any task or dependency change)"""
+        if project_id:
+            DependencyService.apply_invalidation({'project_id': project_id})
+            EventService.broker.send_to_peers('dependencies', {'project_id': project_id})
+
+    @staticmethod
+    def apply_invalidation(message: Dict) -> None:
+        """Drop a cached analysis in this process only (no re-broadcast)"""
+        project_id = message.get('project_id')
+        with DependencyService._cache_lock:
+            DependencyService._generations[project_id] += 1
+            DependencyService._cache.pop(project_id, None)
+
+    @staticmethod
+    def build_graph(project_id: int, db: Session, locking: bool = False) -> DependencyGraph:
+        """
+        Load a project's tasks and blocking dependencies (two queries).
+        With `locking`, both are locking reads: they see the latest committed
+        rows rather than the transaction's snapshot (used by write paths).
+        """
+        done_status_id = SprintAnalyticsService.get_done_status_id(db)
+        tasks = db.query(
+            Task.id,
+            Task.title,
+            Task.status_id,
+            Task.estimated_hours
+        ).filter(Task.project_id == project_id)
+        if locking:
+            tasks = tasks.with_for_update(read=True)
+        tasks = tasks.all()
+
+        titles = {t.id: t.title for t in tasks}
+        durations = {t.id: float(t.estimated_hours or 0) for t in tasks}
+        done = {t.id for t in tasks if done_status_id is not None and t.status_id == done_status_id}
+        graph = DependencyGraph(titles, durations, done)
+
+        edges = db.query(
+            TaskDependency.depends_on_task_id,
+            TaskDependency.task_id
+        ).join(
+            Task, Task.id == TaskDependency.task_id
+        ).outerjoin(
+            DependencyType, DependencyType.id == TaskDependency.dependency_type_id
+        ).filter(
+            Task.project_id == project_id,
+            (TaskDependency.dependency_type_id.is_(None)) |
+            (DependencyType.key.in_(DependencyService.BLOCKING_TYPE_KEYS))
+        )
+        if locking:
+            edges = edges.with_for_update(read=True)
+        edges = edges.all()
+
+        for before, after in edges:
+            if before in titles and after in titles:
+                graph.add_edge(before, after)
+        return graph
+
+    @staticmethod
+    def get_project_analysis(project_id: int) -> DependencyGraphResponse:
+        """Topological order, critical path and blocked tasks of a project (cached)"""
+        with DependencyService._cache_lock:
+            cached = DependencyService._cache.get(project_id)
+            generation = DependencyService._generations[project_id]
+        if cached and time.monotonic() - cached[1] < DependencyService.CACHE_TTL_SECONDS:
+            return cached[0]
+
+        # Built on a session of its own: the caller's transaction may hold a
+        # snapshot taken before the invalidation that `generation` reflects
+        database_connection.ensure_engine()
+        db = database_connection.SessionLocal()
+        try:
+            loaded_at = time.monotonic()
+            analysis = DependencyService.build_graph(project_id, db).analyze(project_id)
+        finally:
+            db.close()
+        with DependencyService._cache_lock:
+            if DependencyService._generations[project_id] == generation:
+                DependencyService._cache[project_id] = (analysis, loaded_at)
+        return analysis
+
+    @staticmethod
+    def validate_dependency_type_key(dependency_type_key: Optional[str], db: Session) -> Optional[DependencyType]:
+        """Validate dependency_type_key and return the dependency type"""
+        if not dependency_type_key:
+            return None
+        dependency_type = db.query(DependencyType).filter(DependencyType.key == dependency_type_key).first()
+        if not dependency_type:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Dependency type '{dependency_type_key}' not found"
+            )
+        return dependency_type
+
+    @staticmethod
+    def build_dependency_response(dependency: TaskDependency) -> TaskDependencyResponse:
+        """Build TaskDependencyResponse from a dependency with loaded relationships"""
+        return TaskDependencyResponse(
+            id=dependency.id,
+            task_id=dependency.task_id,
+            depends_on_task_id=dependency.depends_on_task_id,
+            depends_on_task_title=dependency.depends_on_task.title if dependency.depends_on_task else None,
+            dependency_type_key=dependency.dependency_type.key if dependency.dependency_type else None,
+            dependency_type_name=dependency.dependency_type.name if dependency.dependency_type else None,
+            created_at=dependency.created_at
+        )
+
+    @staticmethod
+    def list_task_dependencies(task_id: int, db: Session) -> List[TaskDependency]:
+        """List the dependencies of a task"""
+        DependencyService.get_task(task_id, db)
+        return db.query(TaskDependency).options(
+            joinedload(TaskDependency.depends_on_task),
+            joinedload(TaskDependency.dependency_type)
+        ).filter(TaskDependency.task_id == task_id).order_by(TaskDependency.id).all()
+
+    @staticmethod
+    def get_task(task_id: int, db: Session) -> Task:
+        """Get a task by ID, raising HTTPException if not found"""
+        task = db.query(Task).filter(Task.id == task_id).first()
+        if not task:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Task not found"
+            )
+        return task
+
+    @staticmethod
+    def create_dependency(task_id: int, payload: TaskDependencyCreate, db: Session) -> TaskDependency:
+        """Create a dependency, rejecting cross-project links, duplicates and cycles"""
+        task = DependencyService.get_task(task_id, db)
+        depends_on = db.query(Task).filter(Task.id == payload.depends_on_task_id).first()
+        if not depends_on:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Task with id {payload.depends_on_task_id} not found"
+            )
+        if task.id == depends_on.id:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="A task cannot depend on itself"
+            )
+        if task.project_id is None or task.project_id != depends_on.project_id:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Dependencies are only allowed between tasks of the same project"
+            )
+
+        dependency_type = DependencyService.validate_dependency_type_key(payload.dependency_type_key, db)
+
+        existing = db.query(TaskDependency.id).filter(
+            TaskDependency.task_id == task.id,
+            TaskDependency.depends_on_task_id == depends_on.id
+        ).first()
+        if existing:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Dependency already exists"
+            )
+
+        is_blocking = dependency_type is None or dependency_type.key in DependencyService.BLOCKING_TYPE_KEYS
+        if is_blocking:
+            # Never trust the cache here: it may predate an edge added by another
+            # worker. The project lock serializes concurrent inserts, and the
+            # graph is read from the committed rows inside this transaction.
+            db.query(Project.id).filter(Project.id == task.project_id).with_for_update().scalar()
+            graph = DependencyService.build_graph(task.project_id, db, locking=True)
+            if graph.would_create_cycle(depends_on.id, task.id):
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail="Dependency would create a cycle"
+                )
+
+        dependency = TaskDependency(
+            task_id=task.id,
+            depends_on_task_id=depends_on.id,
+            dependency_type_id=dependency_type.id if dependency_type else None
+        )
+        db.add(dependency)
+        db.commit()
+        DependencyService.invalidate_project(task.project_id)
+
+        return db.query(TaskDependency).options(
+            joinedload(TaskDependency.depends_on_task),
+            joinedload(TaskDependency.dependency_type)
+        ).filter(TaskDependency.id == dependency.id).first()
+
+    @staticmethod
+    def delete_dependency(task_id: int, dependency_id: int, db: Session) -> None:
+        """Delete a dependency of a task"""
+        dependency = db.query(TaskDependency).filter(
+            TaskDependency.id == dependency_id,
+            TaskDependency.task_id == task_id
+        ).first()
+        if not dependency:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Dependency not found"
+            )
+        project_id = db.query(Task.project_id).filter(Task.id == task_id).scalar()
+        db.delete(dependency)
+        db.commit()
+        DependencyService.invalidate_project(project_id)
+
+
+# Relay cache invalidations to the other workers over the event bus (no-op when it is disabled)
+EventService.broker.on_channel('dependencies', DependencyService.apply_invalidation)
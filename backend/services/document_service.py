@@ -12,6 +12,8 @@ from models.document import Document
 from models.project import Project
 from models.user import User
 from schemas.document import DocumentResponse, DocumentUpdate
+from services.audit_service import AuditService
+from services.sync_service import SyncService
 
 
 class DocumentService:
@@ -206,25 +208,29 @@ class DocumentService:
                 detail=f"Failed to create document record: {str(e)}"
             )
         
+        AuditService.record_create("document", document, user_id=uploaded_by)
         return document
     
     @staticmethod
     def update_document(document_id: int, payload: DocumentUpdate, db: Session) -> Document:
         """Update document metadata"""
         document = DocumentService.get_document_by_id(document_id, db)
+        audit_before = AuditService.snapshot(document)
         
         if payload.title is not None:
             document.title = payload.title
         if payload.description is not None:
             document.description = payload.description
         
+        audit_after = AuditService.snapshot(document)
         db.commit()
         db.refresh(document)
+        AuditService.record_update("document", document_id, audit_before, audit_after)
         return document
     
     @staticmethod
     def delete_document(document_id: int, db: Session) -> None:
-        """Delete a document and its file"""
+        """Delete a document, its file and its versions"""
         document = DocumentService.get_document_by_id(document_id, db)
         
         # Delete physical file
@@ -238,7 +244,20 @@ class DocumentService:
             import logging
             logging.warning(f"Failed to delete file {document.file_path}: {e}")
         
-        # Delete from database
+        # Delete from database, with the versions and their chunk references
+        from services.document_version_service import DocumentVersionService
+        audit_before = AuditService.snapshot(document)
+        released_chunks = DocumentVersionService.delete_versions(document_id, db)
         db.delete(document)
+        SyncService.record_deletion(db, "document", document_id, document.project_id)
         db.commit()
+        AuditService.record_delete("document", document_id, audit_before)
+
+        # Chunk files shared with other documents' versions stay
+        try:
+            DocumentVersionService.remove_unused_chunks(released_chunks, db)
+        except Exception as e:
+            db.rollback()
+            import logging
+            logging.warning(f"Failed to remove unused chunks of document {document_id}: {e}")
 
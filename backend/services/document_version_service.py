@@ -0,0 +1,475 @@
+"""
+Document Version Service - Versioned document content with chunk-level dedup.
+Each uploaded version is cut into content-defined chunks: boundaries are
+placed where a rolling hash of the last few bytes matches a pattern, so an
+edit only changes the chunks around it and the rest of the file cuts into
+the same chunks as before. Chunks are stored once under CHUNK_DIR, named by
+their sha256, and shared by every version containing them:
+
+- document_version_chunks lists the chunks of each version in order;
+- document_chunks counts the versions referencing each chunk, so chunk files
+  are removed once no version needs them.
+
+A reference is committed before its chunk file is written and a chunk file
+is only removed while its row is locked with no references left, so a
+concurrent upload never loses a chunk it counts on. The first revision of a
+document moves its original upload into the store as version 1. Versions are
+read back chunk by chunk, so streaming a 150 MB version holds one chunk in
+memory at a time.
+"""
+from sqlalchemy import select, update, delete, insert, func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from typing import Optional, Dict, List, Iterable, Iterator, Tuple, BinaryIO
+from pathlib import Path
+import hashlib
+import logging
+import math
+import os
+import uuid
+
+import numpy as np
+from fastapi import HTTPException, status, UploadFile
+
+import database_connection
+from models.document import Document, DocumentVersion, DocumentChunk, DocumentVersionChunk
+from schemas.document import DocumentVersionResponse
+from services.audit_service import AuditService
+from services.document_service import DocumentService
+
+logger = logging.getLogger(__name__)
+
+
+class ContentDefinedChunker:
+    """
+    Cuts a byte stream into chunks of min_size..max_size bytes, about avg_size
+    on average. The rolling hash of a position is the sum of per-byte random
+    values over the last WINDOW bytes, scrambled by a multiplication; it is
+    computed for a whole buffer at once with numpy. Boundaries never fall
+    within min_size (> WINDOW) of a chunk start, so they depend on the content
+    only, not on how the stream was read.
+    """
+
+    WINDOW = 48
+    MULTIPLIER = np.uint32(0x9E3779B1)
+    # Fixed per-byte values; changing them would re-chunk every file differently
+    BYTE_VALUES = np.array(
+        [int.from_bytes(hashlib.sha256(b'document-chunk-%d' % value).digest()[:4], 'big') for value in range(256)],
+        dtype=np.uint32
+    )
+
+    def __init__(self, min_size: int, avg_size: int, max_size: int, read_size: int = 1024 * 1024):
+        self.min_size = max(min_size, self.WINDOW)
+        self.max_size = max(max_size, self.min_size + 1)
+        # A position is a boundary with probability 2**-bits, past min_size
+        self.bits = max(1, min(31, round(math.log2(max(avg_size - self.min_size, 2)))))
+        self.read_size = read_size
+        self.buffer_size = max(4 * 1024 * 1024, 2 * self.max_size)
+
+    def boundaries(self, data: bytearray) -> np.ndarray:
+        """Offsets after which the rolling hash matches, in increasing order"""
+        values = self.BYTE_VALUES[np.frombuffer(data, dtype=np.uint8)]
+        sums = np.cumsum(values, dtype=np.uint32)  # Wraps around, as the hash should
+        window = values  # Reused in place
+        window[:self.WINDOW] = sums[:self.WINDOW]
+        np.subtract(sums[self.WINDOW:], sums[:-self.WINDOW], out=window[self.WINDOW:])
+        window *= self.MULTIPLIER
+        # Top `bits` bits all zero
+        return np.flatnonzero(window < np.uint32(1 << (32 - self.bits))) + 1
+
+    def cut_points(self, data: bytearray, final: bool) -> List[int]:
+        """Chunk ends in data (which starts at a chunk start); the last cut is data's end only when final"""
+        candidates = self.boundaries(data)
+        cuts, start, length = [], 0, len(data)
+        while start < length:
+            lowest, highest = start + self.min_size, start + self.max_size
+            if highest > length and not final:
+                break  # The next cut may lie beyond the data read so far
+            index = np.searchsorted(candidates, lowest)
+            if index < len(candidates) and candidates[index] <= min(highest, length):
+                end = int(candidates[index])
+            else:
+                end = min(highest, length)
+            cuts.append(end)
+            start = end
+        return cuts
+
+    def chunks(self, stream: BinaryIO) -> Iterator[bytes]:
+        buffer = bytearray()
+        eof = False
+        while not eof or buffer:
+            while not eof and len(buffer) < self.buffer_size:
+                data = stream.read(self.read_size)
+                if data:
+                    buffer += data
+                else:
+                    eof = True
+            start = 0
+            for end in self.cut_points(buffer, final=eof):
+                yield bytes(buffer[start:end])
+                start = end
+            del buffer[:start]
+
+
+class StoredContent:
+    """Chunks of one ingested file, and the chunk references it holds"""
+
+    def __init__(self):
+        self.chunks: List[Tuple[str, int]] = []  # (sha256, size) in file order
+        self.referenced: Dict[str, int] = {}  # Distinct chunks -> size
+        self.size = 0
+        self.stored_bytes = 0
+        self.content_hash: Optional[str] = None
+
+
+class DocumentVersionService:
+    """Service class for document versions and their chunk store"""
+
+    # Configuration (overridable through the environment)
+    CHUNK_DIR = Path(os.getenv("DOCUMENT_CHUNK_DIR", "uploads/chunks"))
+    CHUNK_MIN_SIZE = int(os.getenv("DOCUMENT_CHUNK_MIN_SIZE", str(32 * 1024)))
+    CHUNK_AVG_SIZE = int(os.getenv("DOCUMENT_CHUNK_AVG_SIZE", str(128 * 1024)))
+    CHUNK_MAX_SIZE = int(os.getenv("DOCUMENT_CHUNK_MAX_SIZE", str(1024 * 1024)))
+    REFERENCE_BATCH_SIZE = 500
+    REFERENCE_BATCH_BYTES = 16 * 1024 * 1024
+    READ_PAGE_SIZE = 1000
+
+    # ---- Chunk store -----------------------------------------------------
+
+    @staticmethod
+    def chunk_path(chunk_hash: str) -> Path:
+        return DocumentVersionService.CHUNK_DIR / chunk_hash[:2] / chunk_hash
+
+    @staticmethod
+    def write_chunk(chunk_hash: str, data: bytes) -> bool:
+        """Store a chunk file unless it exists; returns whether it was written"""
+        path = DocumentVersionService.chunk_path(chunk_hash)
+        if path.exists():
+            return False
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = path.with_name(f"{path.name}.{uuid.uuid4().hex}.tmp")
+        try:
+            with open(temporary, 'wb') as output:
+                output.write(data)
+            os.replace(temporary, path)  # Atomic: readers never see a partial chunk
+        except Exception:
+            temporary.unlink(missing_ok=True)
+            raise
+        return True
+
+    @staticmethod
+    def acquire_chunks(sizes: Dict[str, int], db: Session) -> None:
+        """Add one reference to each chunk, creating the missing rows (committed)"""
+        hashes = list(sizes)
+        while True:
+            try:
+                existing = set(db.execute(
+                    select(DocumentChunk.hash).where(DocumentChunk.hash.in_(hashes)).with_for_update()
+                ).scalars())
+                if existing:
+                    db.execute(
+                        update(DocumentChunk)
+                        .where(DocumentChunk.hash.in_(existing))
+                        .values(ref_count=DocumentChunk.ref_count + 1)
+                        .execution_options(synchronize_session=False)
+                    )
+                missing = [chunk_hash for chunk_hash in hashes if chunk_hash not in existing]
+                if missing:
+                    db.execute(insert(DocumentChunk), [
+                        {'hash': chunk_hash, 'size': sizes[chunk_hash], 'ref_count': 1} for chunk_hash in missing
+                    ])
+                db.commit()
+                return
+            except IntegrityError:
+                db.rollback()  # A concurrent upload created one of the rows first; count it as existing
+
+    @staticmethod
+    def release_chunks(counts: Dict[str, int], db: Session) -> None:
+        """Drop references to chunks (count per chunk); the caller commits"""
+        by_count: Dict[int, List[str]] = {}
+        for chunk_hash, count in counts.items():
+            by_count.setdefault(count, []).append(chunk_hash)
+        for count, hashes in by_count.items():
+            for start in range(0, len(hashes), DocumentVersionService.REFERENCE_BATCH_SIZE):
+                db.execute(
+                    update(DocumentChunk)
+                    .where(DocumentChunk.hash.in_(hashes[start:start + DocumentVersionService.REFERENCE_BATCH_SIZE]))
+                    .values(ref_count=DocumentChunk.ref_count - count)
+                    .execution_options(synchronize_session=False)
+                )
+
+    @staticmethod
+    def remove_unused_chunks(hashes: Iterable[str], db: Session) -> int:
+        """Delete the files and rows of the given chunks that no version references any more"""
+        hashes = list(hashes)
+        removed = 0
+        for start in range(0, len(hashes), DocumentVersionService.REFERENCE_BATCH_SIZE):
+            unused = db.execute(
+                select(DocumentChunk.hash).where(
+                    DocumentChunk.hash.in_(hashes[start:start + DocumentVersionService.REFERENCE_BATCH_SIZE]),
+                    DocumentChunk.ref_count <= 0
+                ).with_for_update()
+            ).scalars().all()
+            # Files go while the rows are locked: an upload re-acquiring a chunk waits and then rewrites it
+            for chunk_hash in unused:
+                DocumentVersionService.chunk_path(chunk_hash).unlink(missing_ok=True)
+            if unused:
+                db.execute(delete(DocumentChunk).where(DocumentChunk.hash.in_(unused)))
+            db.commit()
+            removed += len(unused)
+        return removed
+
+    @staticmethod
+    def discard(content: StoredContent, db: Session) -> None:
+        """Give back the references of content that did not become a version"""
+        if not content.referenced:
+            return
+        try:
+            db.rollback()
+            DocumentVersionService.release_chunks(dict.fromkeys(content.referenced, 1), db)
+            db.commit()
+            DocumentVersionService.remove_unused_chunks(content.referenced, db)
+        except Exception as e:
+            db.rollback()
+            logger.warning(f"Could not release the chunks of a failed document upload: {e}")
+
+    @staticmethod
+    def ingest(stream: BinaryIO, db: Session, max_size: Optional[int] = None) -> StoredContent:
+        """Chunk a file into the store; the returned content holds one reference per distinct chunk"""
+        chunker = ContentDefinedChunker(
+            DocumentVersionService.CHUNK_MIN_SIZE,
+            DocumentVersionService.CHUNK_AVG_SIZE,
+            DocumentVersionService.CHUNK_MAX_SIZE
+        )
+        content = StoredContent()
+        digest = hashlib.sha256()
+        pending: Dict[str, bytes] = {}  # First seen in this file, not referenced yet
+        pending_bytes = 0
+
+        def reference_pending():
+            DocumentVersionService.acquire_chunks({h: len(data) for h, data in pending.items()}, db)
+            content.referenced.update((chunk_hash, len(data)) for chunk_hash, data in pending.items())
+            for chunk_hash, data in pending.items():
+                # Written after the reference is committed, so it cannot be removed under us
+                if DocumentVersionService.write_chunk(chunk_hash, data):
+                    content.stored_bytes += len(data)
+            pending.clear()
+
+        try:
+            for chunk in chunker.chunks(stream):
+                content.size += len(chunk)
+                if max_size is not None and content.size > max_size:
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail=f"File size exceeds maximum limit of {max_size / (1024*1024):.0f}MB"
+                    )
+                digest.update(chunk)
+                chunk_hash = hashlib.sha256(chunk).hexdigest()
+                content.chunks.append((chunk_hash, len(chunk)))
+                if chunk_hash not in content.referenced and chunk_hash not in pending:
+                    pending[chunk_hash] = chunk
+                    pending_bytes += len(chunk)
+                    if (len(pending) >= DocumentVersionService.REFERENCE_BATCH_SIZE
+                            or pending_bytes >= DocumentVersionService.REFERENCE_BATCH_BYTES):
+                        reference_pending()
+                        pending_bytes = 0
+            if pending:
+                reference_pending()
+        except Exception:
+            DocumentVersionService.discard(content, db)
+            raise
+        content.content_hash = digest.hexdigest()
+        return content
+
+    # ---- Versions --------------------------------------------------------
+
+    @staticmethod
+    def build_version_response(version: DocumentVersion) -> DocumentVersionResponse:
+        return DocumentVersionResponse.model_validate(version)
+
+    @staticmethod
+    def list_versions(document_id: int, db: Session) -> List[DocumentVersion]:
+        """Versions of a document, newest first"""
+        DocumentService.get_document_by_id(document_id, db)
+        return db.query(DocumentVersion).filter(
+            DocumentVersion.document_id == document_id
+        ).order_by(DocumentVersion.version_number.desc()).all()
+
+    @staticmethod
+    def get_version(document_id: int, version_number: int, db: Session) -> DocumentVersion:
+        version = db.query(DocumentVersion).filter(
+            DocumentVersion.document_id == document_id,
+            DocumentVersion.version_number == version_number
+        ).first()
+        if not version:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Document version not found"
+            )
+        return version
+
+    @staticmethod
+    def create_version(document_id: int, version_number: int, content: StoredContent, db: Session, **values) -> DocumentVersion:
+        """Insert a version row and its chunk list; the caller commits"""
+        version = DocumentVersion(
+            document_id=document_id,
+            version_number=version_number,
+            file_size=content.size,
+            content_hash=content.content_hash,
+            chunk_count=len(content.chunks),
+            stored_bytes=content.stored_bytes,
+            **values
+        )
+        db.add(version)
+        db.flush()
+        rows = [
+            {'version_id': version.id, 'seq': seq, 'chunk_hash': chunk_hash, 'chunk_size': size}
+            for seq, (chunk_hash, size) in enumerate(content.chunks)
+        ]
+        for start in range(0, len(rows), DocumentVersionService.READ_PAGE_SIZE):
+            db.execute(insert(DocumentVersionChunk), rows[start:start + DocumentVersionService.READ_PAGE_SIZE])
+        return version
+
+    @staticmethod
+    def upload_version(
+        document_id: int,
+        file: UploadFile,
+        change_description: Optional[str],
+        uploaded_by: Optional[int],
+        db: Session
+    ) -> DocumentVersion:
+        """Store an uploaded file as the document's next version and make it the current content"""
+        document = DocumentService.get_document_by_id(document_id, db)
+        DocumentService.validate_file(file)
+
+        # A document that has no versions yet keeps its original upload as a plain file
+        original = None
+        has_versions = db.query(DocumentVersion.id).filter(DocumentVersion.document_id == document_id).first()
+        if not has_versions and document.file_path and Path(document.file_path).is_file():
+            with open(document.file_path, 'rb') as source:
+                original = DocumentVersionService.ingest(source, db)
+
+        try:
+            revision = DocumentVersionService.ingest(file.file, db, DocumentService.MAX_FILE_SIZE)
+            if revision.size == 0:
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Uploaded file is empty")
+        except Exception:
+            if original is not None:
+                DocumentVersionService.discard(original, db)
+            raise
+
+        legacy_path = None
+        superseded = None
+        try:
+            # Serialises version numbering with concurrent uploads of the same document
+            document = db.query(Document).filter(Document.id == document_id).with_for_update().first()
+            if not document:
+                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Document not found")
+            latest = db.query(func.max(DocumentVersion.version_number)).filter(
+                DocumentVersion.document_id == document_id
+            ).scalar() or 0
+
+            if original is not None and latest == 0:
+                DocumentVersionService.create_version(
+                    document_id, 1, original, db,
+                    file_name=document.file_name,
+                    mime_type=document.mime_type,
+                    uploaded_by=document.uploaded_by,
+                    uploaded_at=document.created_at
+                )
+                latest = 1
+                legacy_path = document.file_path
+            elif original is not None:
+                superseded, original = original, None  # Another upload moved it first
+
+            version = DocumentVersionService.create_version(
+                document_id, latest + 1, revision, db,
+                file_name=file.filename,
+                mime_type=file.content_type,
+                change_description=change_description,
+                uploaded_by=uploaded_by
+            )
+            audit_before = AuditService.snapshot(document)
+            document.file_name = file.filename
+            document.file_path = None
+            document.file_size = revision.size
+            document.mime_type = file.content_type
+            # Text extracted from the previous version no longer applies
+            document.is_processed = 0
+            document.extracted_text = None
+            document.text_extracted_at = None
+            audit_after = AuditService.snapshot(document)
+            db.commit()
+            db.refresh(version)
+        except Exception:
+            db.rollback()
+            DocumentVersionService.discard(revision, db)
+            for content in (original, superseded):
+                if content is not None:
+                    DocumentVersionService.discard(content, db)
+            raise
+
+        if superseded is not None:
+            DocumentVersionService.discard(superseded, db)
+        if legacy_path:
+            try:
+                Path(legacy_path).unlink(missing_ok=True)
+            except Exception as e:
+                logger.warning(f"Failed to delete file {legacy_path}: {e}")
+
+        AuditService.record_create("document_version", version, user_id=uploaded_by)
+        AuditService.record_update("document", document_id, audit_before, audit_after)
+        return version
+
+    @staticmethod
+    def delete_versions(document_id: int, db: Session) -> List[str]:
+        """
+        Delete a document's versions and drop their chunk references; the caller
+        commits, then passes the returned hashes to remove_unused_chunks.
+        """
+        version_ids = select(DocumentVersion.id).where(DocumentVersion.document_id == document_id)
+        counts = dict(db.execute(
+            select(DocumentVersionChunk.chunk_hash, func.count(func.distinct(DocumentVersionChunk.version_id)))
+            .where(DocumentVersionChunk.version_id.in_(version_ids))
+            .group_by(DocumentVersionChunk.chunk_hash)
+        ).all())
+        db.execute(
+            delete(DocumentVersionChunk).where(DocumentVersionChunk.version_id.in_(version_ids))
+            .execution_options(synchronize_session=False)
+        )
+        db.execute(
+            delete(DocumentVersion).where(DocumentVersion.document_id == document_id)
+            .execution_options(synchronize_session=False)
+        )
+        DocumentVersionService.release_chunks(counts, db)
+        return list(counts)
+
+    @staticmethod
+    def iter_content(version_id: int) -> Iterator[bytes]:
+        """
+        Bytes of a version, one chunk per item. Uses its own session and only
+        holds a connection while it reads the next page of the chunk list.
+        """
+        db = database_connection.SessionLocal()
+        try:
+            next_seq = 0
+            while True:
+                page = db.execute(
+                    select(DocumentVersionChunk.seq, DocumentVersionChunk.chunk_hash)
+                    .where(DocumentVersionChunk.version_id == version_id, DocumentVersionChunk.seq >= next_seq)
+                    .order_by(DocumentVersionChunk.seq)
+                    .limit(DocumentVersionService.READ_PAGE_SIZE)
+                ).all()
+                db.close()
+                if not page:
+                    return
+                for seq, chunk_hash in page:
+                    with open(DocumentVersionService.chunk_path(chunk_hash), 'rb') as chunk:
+                        yield chunk.read()
+                next_seq = page[-1].seq + 1
+        except Exception as e:
+            # Headers are already sent; all we can do is cut the stream short
+            logger.error(f"Reading document version {version_id} failed: {e}")
+            raise
+        finally:
+            db.close()
@@ -0,0 +1,296 @@
+"""
+Event Service - In-process change broker with optional cross-worker fan-out.
+Service write paths publish small change events (what changed, and the new
+field values); SSE subscribers receive the events of the projects they watch.
+
+With EVENT_BROKER_BACKEND=unix, every worker process on the host binds a
+datagram socket in EVENT_BUS_DIR and forwards each published event to the
+sockets of the other workers, so a client connected to worker A also sees
+writes handled by worker B. The default backend is in-process only.
+"""
+from collections import deque
+from datetime import datetime
+from typing import Optional, Dict, Callable, Set, Tuple
+import asyncio
+import itertools
+import json
+import logging
+import os
+import socket
+import threading
+import uuid
+
+logger = logging.getLogger(__name__)
+
+
+class Subscription:
+    """One SSE client: a bounded asyncio queue bound to the client's event loop"""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, project_id: Optional[int], max_queue_size: int):
+        self.loop = loop
+        self.project_id = project_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue_size)
+
+    def matches(self, event: Dict) -> bool:
+        if self.project_id is None:
+            return True
+        return self.project_id in (event.get('project_id'), event.get('previous_project_id'))
+
+    def offer(self, event: Dict) -> None:
+        """Runs on the subscriber's loop. A client that fell too far behind is told to resync."""
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait({'id': event['id'], 'type': 'resync'})
+
+
+class UnixDatagramBus:
+    """Same-host fan-out between worker processes over Unix datagram sockets"""
+
+    MAX_DATAGRAM_SIZE = 64 * 1024
+
+    def __init__(self, directory: str, on_message: Callable[[Dict], None]):
+        self.directory = directory
+        self.on_message = on_message
+        self.path: Optional[str] = None
+        self._socket: Optional[socket.socket] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        self.path = os.path.join(self.directory, f"{os.getpid()}.sock")
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self._socket.bind(self.path)
+        self._thread = threading.Thread(target=self._receive, name="event-bus-receiver", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        sock, self._socket = self._socket, None
+        if sock is not None:
+            sock.close()
+        if self.path and os.path.exists(self.path):
+            os.unlink(self.path)
+
+    def send(self, message: Dict) -> None:
+        if self._socket is None:
+            return
+        payload = json.dumps(message, default=str).encode('utf-8')
+        if len(payload) > self.MAX_DATAGRAM_SIZE:
+            logger.warning("Event too large for the event bus, not forwarded to other workers")
+            return
+        for name in os.listdir(self.directory):
+            peer = os.path.join(self.directory, name)
+            if peer == self.path or not name.endswith('.sock'):
+                continue
+            try:
+                self._socket.sendto(payload, peer)
+            except (ConnectionRefusedError, FileNotFoundError):
+                # The worker behind this socket is gone
+                try:
+                    os.unlink(peer)
+                except OSError:
+                    pass
+            except OSError as e:
+                logger.warning(f"Event bus send to {peer} failed: {e}")
+
+    def _receive(self) -> None:
+        while self._socket is not None:
+            try:
+                payload = self._socket.recv(self.MAX_DATAGRAM_SIZE)
+            except OSError:
+                return
+            try:
+                self.on_message(json.loads(payload))
+            except Exception as e:
+                logger.warning(f"Event bus message dropped: {e}")
+
+
+class EventBroker:
+    """Fan-out of change events to SSE subscribers, with a short replay buffer"""
+
+    def __init__(self, replay_size: int, subscriber_queue_size: int):
+        self.subscriber_queue_size = subscriber_queue_size
+        self._subscribers: Set[Subscription] = set()
+        self._replay: deque = deque(maxlen=replay_size)  # (sequence, event)
+        self._sequence = itertools.count(1)
+        self._epoch: Optional[str] = None
+        self._epoch_pid: Optional[int] = None
+        self._lock = threading.Lock()
+        self._bus: Optional[UnixDatagramBus] = None
+        self._bus_pid: Optional[int] = None
+        self._channel_handlers: Dict[str, Callable[[Dict], None]] = {}
+
+    # ---- Cross-worker bus ----------------------------------------------
+
+    def start_bus(self, directory: str) -> None:
+        """Join the same-host event bus (once per process)"""
+        if self._bus is not None and self._bus_pid == os.getpid():
+            return
+        self._bus = UnixDatagramBus(directory, self._receive_remote)
+        self._bus.start()
+        self._bus_pid = os.getpid()
+
+    def stop_bus(self) -> None:
+        if self._bus is not None and self._bus_pid == os.getpid():
+            self._bus.stop()
+        self._bus = None
+        self._bus_pid = None
+
+    def on_channel(self, channel: str, handler: Callable[[Dict], None]) -> None:
+        """Handle messages of a non-SSE channel (e.g. session revocations) arriving from other workers"""
+        self._channel_handlers[channel] = handler
+
+    def send_to_peers(self, channel: str, message: Dict) -> None:
+        """Forward a message to the other workers (no-op without the bus)"""
+        if self._bus is not None and self._bus_pid == os.getpid():
+            self._bus.send({'channel': channel, 'message': message})
+
+    def _receive_remote(self, envelope: Dict) -> None:
+        channel = envelope.get('channel')
+        if channel == 'changes':
+            self.dispatch(envelope['message'])
+            return
+        handler = self._channel_handlers.get(channel)
+        if handler is not None:
+            handler(envelope['message'])
+
+    # ---- Subscribers ---------------------------------------------------
+
+    def _ensure_epoch(self) -> str:
+        """
+        Event ids are '<epoch>-<sequence>' and only mean something to the
+        process that numbered them. A forked worker starts a new epoch.
+        """
+        if self._epoch_pid != os.getpid():
+            self._epoch = uuid.uuid4().hex[:12]
+            self._epoch_pid = os.getpid()
+            self._sequence = itertools.count(1)
+            self._replay.clear()
+        return self._epoch
+
+    @staticmethod
+    def parse_event_id(event_id: str) -> Optional[Tuple[str, int]]:
+        epoch, _, sequence = event_id.strip().rpartition('-')
+        if not epoch or not sequence.isdigit():
+            return None
+        return epoch, int(sequence)
+
+    def subscribe(
+        self,
+        project_id: Optional[int],
+        last_event_id: Optional[str] = None
+    ) -> Subscription:
+        """Register a subscriber on the running loop, replaying missed events if possible"""
+        subscription = Subscription(asyncio.get_running_loop(), project_id, self.subscriber_queue_size)
+        with self._lock:
+            epoch = self._ensure_epoch()
+            if last_event_id is not None:
+                parsed = self.parse_event_id(last_event_id)
+                buffered = list(self._replay)
+                first = buffered[0][0] if buffered else 1
+                last = buffered[-1][0] if buffered else 0
+                if parsed is not None and parsed[0] == epoch and first <= parsed[1] + 1 and parsed[1] <= last:
+                    for sequence, event in buffered:
+                        if sequence > parsed[1] and subscription.matches(event):
+                            subscription.offer(event)
+                else:
+                    # Numbered by another worker (or an earlier process), or too
+                    # old for the replay buffer: the client must refetch
+                    last_id = buffered[-1][1]['id'] if buffered else f"{epoch}-0"
+                    subscription.offer({'id': last_id, 'type': 'resync'})
+            self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    # ---- Publishing ----------------------------------------------------
+
+    def dispatch(self, event: Dict) -> Dict:
+        """Deliver an event to this process's subscribers (thread-safe, never blocks)"""
+        with self._lock:
+            epoch = self._ensure_epoch()
+            sequence = next(self._sequence)
+            event = {**event, 'id': f"{epoch}-{sequence}"}
+            self._replay.append((sequence, event))
+            targets = [s for s in self._subscribers if s.matches(event)]
+        for subscription in targets:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.offer, event)
+            except RuntimeError:
+                # Subscriber's loop has closed
+                self.unsubscribe(subscription)
+        return event
+
+    def publish(self, event: Dict) -> None:
+        """Deliver locally and forward to the other workers"""
+        self.dispatch(event)
+        self.send_to_peers('changes', event)
+
+
+class EventService:
+    """Service class for change events"""
+
+    # Configuration (overridable through the environment)
+    BACKEND = os.getenv("EVENT_BROKER_BACKEND", "local")  # 'local' or 'unix'
+    BUS_DIR = os.getenv("EVENT_BUS_DIR", "/tmp/smartsprint-events")
+    REPLAY_SIZE = int(os.getenv("EVENT_REPLAY_SIZE", "1000"))
+    SUBSCRIBER_QUEUE_SIZE = int(os.getenv("EVENT_SUBSCRIBER_QUEUE_SIZE", "256"))
+    HEARTBEAT_SECONDS = 15
+
+    broker = EventBroker(REPLAY_SIZE, SUBSCRIBER_QUEUE_SIZE)
+
+    @staticmethod
+    def start() -> None:
+        """Join the cross-worker bus when configured"""
+        if EventService.BACKEND == 'unix':
+            try:
+                EventService.broker.start_bus(EventService.BUS_DIR)
+            except OSError as e:
+                logger.warning(f"Event bus unavailable, events stay in-process: {e}")
+
+    @staticmethod
+    def shutdown() -> None:
+        EventService.broker.stop_bus()
+
+    @staticmethod
+    def publish(
+        event_type: str,
+        resource_type: str,
+        resource_id: int,
+        project_id: Optional[int],
+        data: Optional[Dict] = None,
+        previous_project_id: Optional[int] = None
+    ) -> None:
+        """
+        Publish a change event. Call after the change has been committed.
+        Never raises: streaming is best effort and must not fail the write.
+        """
+        try:
+            event = {
+                'type': event_type,
+                'resource_type': resource_type,
+                'resource_id': resource_id,
+                'project_id': project_id,
+                'data': data or {},
+                'timestamp': datetime.now().isoformat(timespec='seconds'),
+            }
+            if previous_project_id is not None and previous_project_id != project_id:
+                event['previous_project_id'] = previous_project_id
+            EventService.broker.publish(event)
+        except Exception as e:
+            logger.warning(f"Failed to publish {event_type} event: {e}")
+
+    @staticmethod
+    def format_sse(event: Dict) -> str:
+        """Serialize an event as an SSE frame"""
+        return f"id: {event['id']}\nevent: {event['type']}\ndata: {json.dumps(event, default=str)}\n\n"
@@ -0,0 +1,159 @@
+"""
+Idempotency Service - Store of the responses of POSTs sent with an Idempotency-Key.
+A key is claimed by inserting its row (the unique key_hash makes exactly one
+request win), completed with the response once the request has been handled,
+and replayed to every retry until it expires after TTL_HOURS. Keys whose
+request failed are deleted so that the retry runs again; keys held by a
+request that never finished (a crashed worker) can be taken over once their
+lock expires after LOCK_SECONDS.
+"""
+from sqlalchemy import select, update, delete
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from typing import Optional, Dict, List, Tuple
+from datetime import datetime, timedelta
+import logging
+import os
+
+import database_connection
+from models.idempotency_key import IdempotencyKey
+
+logger = logging.getLogger(__name__)
+
+
+class IdempotencyService:
+    """Claims, completes and replays idempotency keys (each call on its own session)"""
+
+    # Configuration (overridable through the environment)
+    TTL_HOURS = int(os.getenv("IDEMPOTENCY_TTL_HOURS", "24"))
+    LOCK_SECONDS = int(os.getenv("IDEMPOTENCY_LOCK_SECONDS", "300"))
+    PURGE_BATCH_SIZE = 1000
+
+    @staticmethod
+    def _session() -> Session:
+        database_connection.ensure_engine()
+        return database_connection.SessionLocal()
+
+    @staticmethod
+    def begin(key_hash: str, request_hash: str, owner: str) -> Tuple[str, Optional[Dict]]:
+        """
+        Claim the key for `owner` (a random id of the calling request). Returns
+        ('started', None) when the caller holds the key and runs the request,
+        ('completed', response) with the stored response to replay,
+        ('in_progress', None) while another request holds the key, or
+        ('mismatch', None) when the key was used for a different request.
+        """
+        now = datetime.now().replace(microsecond=0)
+        db = IdempotencyService._session()
+        try:
+            db.add(IdempotencyKey(
+                key_hash=key_hash,
+                request_hash=request_hash,
+                owner=owner,
+                status='in_progress',
+                locked_until=now + timedelta(seconds=IdempotencyService.LOCK_SECONDS),
+                expires_at=now + timedelta(hours=IdempotencyService.TTL_HOURS)
+            ))
+            try:
+                db.commit()
+                return 'started', None
+            except IntegrityError:
+                db.rollback()
+
+            record = db.execute(
+                select(IdempotencyKey).where(IdempotencyKey.key_hash == key_hash)
+            ).scalar_one_or_none()
+            if record is None:
+                return 'in_progress', None  # Deleted in between; the caller asks again
+
+            expired = record.expires_at <= now
+            if not expired and record.request_hash != request_hash:
+                return 'mismatch', None
+            if not expired and record.status == 'completed':
+                return 'completed', {
+                    'status': record.response_status,
+                    'headers': record.response_headers or [],
+                    'body': record.response_body or b'',
+                }
+            if expired or record.locked_until <= now:
+                if IdempotencyService._take_over(db, record, request_hash, owner, now):
+                    return 'started', None
+            return 'in_progress', None
+        finally:
+            db.close()
+
+    @staticmethod
+    def _take_over(db: Session, record: IdempotencyKey, request_hash: str, owner: str, now: datetime) -> bool:
+        """Re-claim an expired key or a stale lock; only one of several racing callers succeeds"""
+        result = db.execute(
+            update(IdempotencyKey)
+            .where(IdempotencyKey.id == record.id, IdempotencyKey.owner == record.owner)
+            .values(
+                request_hash=request_hash,
+                owner=owner,
+                status='in_progress',
+                response_status=None,
+                response_headers=None,
+                response_body=None,
+                locked_until=now + timedelta(seconds=IdempotencyService.LOCK_SECONDS),
+                expires_at=now + timedelta(hours=IdempotencyService.TTL_HOURS)
+            )
+        )
+        db.commit()
+        if result.rowcount == 1:
+            logger.info(f"Took over idempotency key {record.key_hash[:12]} (expired or abandoned)")
+        return result.rowcount == 1
+
+    @staticmethod
+    def complete(key_hash: str, owner: str, status_code: int, headers: List[List[str]], body: bytes) -> bool:
+        """Store the response of the request holding the key"""
+        db = IdempotencyService._session()
+        try:
+            result = db.execute(
+                update(IdempotencyKey)
+                .where(
+                    IdempotencyKey.key_hash == key_hash,
+                    IdempotencyKey.owner == owner,
+                    IdempotencyKey.status == 'in_progress'
+                )
+                .values(
+                    status='completed',
+                    response_status=status_code,
+                    response_headers=headers,
+                    response_body=body
+                )
+            )
+            db.commit()
+            return result.rowcount == 1
+        finally:
+            db.close()
+
+    @staticmethod
+    def abandon(key_hash: str, owner: str) -> None:
+        """Release the key without a response, so the next attempt runs the request"""
+        db = IdempotencyService._session()
+        try:
+            db.execute(
+                delete(IdempotencyKey).where(IdempotencyKey.key_hash == key_hash, IdempotencyKey.owner == owner)
+            )
+            db.commit()
+        finally:
+            db.close()
+
+    @staticmethod
+    def purge_expired() -> int:
+        """Delete one batch of expired keys; returns the number of rows deleted"""
+        db = IdempotencyService._session()
+        try:
+            expired_ids = db.execute(
+                select(IdempotencyKey.id)
+                .where(IdempotencyKey.expires_at <= datetime.now())
+                .limit(IdempotencyService.PURGE_BATCH_SIZE)
+            ).scalars().all()
+            if not expired_ids:
+                return 0
+            db.execute(delete(IdempotencyKey).where(IdempotencyKey.id.in_(expired_ids)))
+            db.commit()
+            return len(expired_ids)
+        finally:
+            db.close()
@@ -0,0 +1,570 @@
+"""
+Import Service - Background bulk imports of tasks from CSV, NDJSON or JSON files.
+The upload is written to disk and an import_jobs row is queued; a worker
+thread then streams the file record by record, validates each one against
+TaskCreate and resolves status, priority, type, sprint and user references
+from maps preloaded once per job. Valid rows are inserted BATCH_SIZE at a time
+with multi-row INSERTs, one transaction per batch together with their
+assignees, history rows, burndown deltas and the job's progress counters.
+Rejected rows go to a per-job error file (row number, reason, original record).
+"""
+from sqlalchemy import insert, select, update
+from sqlalchemy.orm import Session
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, List, Dict, Tuple, Iterator, Any
+from datetime import datetime
+from pathlib import Path
+from fastapi import HTTPException, UploadFile, status
+from pydantic import ValidationError
+import csv
+import io
+import json
+import logging
+import os
+import re
+import threading
+import uuid
+import orjson
+
+import database_connection
+from models.import_job import ImportJob
+from models.project import Sprint
+from models.task import Task, TaskStatus, TaskPriority, TaskType, TaskAssignee, TaskHistory
+from models.user import User
+from schemas.import_job import ImportJobResponse
+from schemas.task import TaskCreate
+from services.project_service import ProjectService
+from services.sprint_analytics_service import SprintAnalyticsService, BURNDOWN_FIELDS
+from services.dependency_service import DependencyService
+from services.calendar_service import CalendarService
+from services.audit_service import AuditService
+from services.event_service import EventService
+
+logger = logging.getLogger(__name__)
+
+# Record fields understood by the importer: TaskCreate's, with users also
+# resolvable by email. project_id and created_by come from the job.
+RECORD_FIELDS = (set(TaskCreate.model_fields) - {'project_id', 'created_by'}) | {'assignee_emails', 'reviewer_email'}
+LIST_FIELDS = {'assignee_ids', 'assignee_emails'}
+LIST_SEPARATOR = re.compile(r'[;,]')
+
+MAX_HOURS = 999.99  # DECIMAL(5,2)
+MAX_DESCRIPTION_BYTES = 65535  # TEXT
+
+
+class ImportInterrupted(Exception):
+    """Raised inside a running job when the server shuts down"""
+
+
+class ImportLookups:
+    """Reference maps for one job, loaded once instead of per row"""
+
+    def __init__(self, project_id: int, db: Session):
+        self.statuses = dict(db.query(TaskStatus.key, TaskStatus.id).all())
+        self.priorities = dict(db.query(TaskPriority.key, TaskPriority.id).all())
+        self.task_types = dict(db.query(TaskType.key, TaskType.id).all())
+        self.sprint_ids = {row.id for row in db.query(Sprint.id).filter(Sprint.project_id == project_id)}
+        self.user_ids = set()
+        self.user_emails = {}
+        for row in db.query(User.id, User.email):
+            self.user_ids.add(row.id)
+            if row.email:
+                self.user_emails[row.email.lower()] = row.id
+
+
+class ImportErrorFile:
+    """CSV of rejected rows, created on the first error"""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.count = 0
+        self._file = None
+        self._writer = None
+
+    def add(self, row_number: int, error: str, record: Any) -> None:
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, 'w', encoding='utf-8', newline='')
+            self._writer = csv.writer(self._file)
+            self._writer.writerow(['row', 'error', 'record'])
+        self._writer.writerow([row_number, error, json.dumps(record, default=str, ensure_ascii=False)])
+        self.count += 1
+
+    def flush(self) -> None:
+        if self._file is not None:
+            self._file.flush()
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class ImportService:
+    """Service class for bulk task imports"""
+
+    # Configuration (overridable through the environment)
+    IMPORT_DIR = Path(os.getenv("IMPORT_DIR", "uploads/imports"))
+    BATCH_SIZE = int(os.getenv("IMPORT_BATCH_SIZE", "5000"))
+    MAX_CONCURRENT_JOBS = int(os.getenv("IMPORT_MAX_CONCURRENT_JOBS", "2"))
+    MAX_FILE_SIZE = int(os.getenv("IMPORT_MAX_FILE_SIZE", str(500 * 1024 * 1024)))  # 500MB
+    UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+    FORMATS_BY_EXTENSION = {
+        '.csv': 'csv',
+        '.ndjson': 'ndjson',
+        '.jsonl': 'ndjson',
+        '.json': 'json',
+    }
+
+    _executor: Optional[ThreadPoolExecutor] = None
+    _executor_pid: Optional[int] = None
+    _executor_lock = threading.Lock()
+    _stop_event = threading.Event()
+
+    # ---- Jobs ------------------------------------------------------------
+
+    @staticmethod
+    def resolve_format(file_name: str, file_format: Optional[str]) -> str:
+        """Explicit format, else the one implied by the file extension"""
+        if file_format:
+            return file_format
+        resolved = ImportService.FORMATS_BY_EXTENSION.get(Path(file_name or '').suffix.lower())
+        if resolved is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Cannot tell the file format. Use a {', '.join(ImportService.FORMATS_BY_EXTENSION)} file or pass format="
+            )
+        return resolved
+
+    @staticmethod
+    async def create_job(
+        project_id: int,
+        file: UploadFile,
+        file_format: Optional[str],
+        created_by: Optional[int],
+        db: Session
+    ) -> ImportJob:
+        """Store the upload and queue an import job for it"""
+        ProjectService.get_project_by_id(project_id, db)
+        file_format = ImportService.resolve_format(file.filename, file_format)
+
+        ImportService.IMPORT_DIR.mkdir(parents=True, exist_ok=True)
+        file_path = ImportService.IMPORT_DIR / f"{uuid.uuid4()}{Path(file.filename or '').suffix}"
+        total_bytes = 0
+        try:
+            with open(file_path, 'wb') as buffer:
+                while True:
+                    chunk = await file.read(ImportService.UPLOAD_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    total_bytes += len(chunk)
+                    if total_bytes > ImportService.MAX_FILE_SIZE:
+                        raise HTTPException(
+                            status_code=status.HTTP_400_BAD_REQUEST,
+                            detail=f"File size exceeds maximum limit of {ImportService.MAX_FILE_SIZE / (1024*1024):.0f}MB"
+                        )
+                    buffer.write(chunk)
+            if total_bytes == 0:
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Uploaded file is empty")
+
+            job = ImportJob(
+                project_id=project_id,
+                status='queued',
+                file_format=file_format,
+                file_name=(file.filename or file_path.name)[:255],
+                file_path=str(file_path.absolute()),
+                total_bytes=total_bytes,
+                created_by=created_by
+            )
+            db.add(job)
+            db.commit()
+            db.refresh(job)
+        except Exception:
+            file_path.unlink(missing_ok=True)
+            raise
+
+        ImportService.submit(job.id)
+        return job
+
+    @staticmethod
+    def submit(job_id: int) -> None:
+        """Run a job on the import pool (recreated after a fork, where threads do not survive)"""
+        with ImportService._executor_lock:
+            if ImportService._executor is None or ImportService._executor_pid != os.getpid():
+                ImportService._executor = ThreadPoolExecutor(
+                    max_workers=ImportService.MAX_CONCURRENT_JOBS, thread_name_prefix="task-import"
+                )
+                ImportService._executor_pid = os.getpid()
+                ImportService._stop_event.clear()
+            ImportService._executor.submit(ImportService.run_job, job_id)
+
+    @staticmethod
+    def shutdown() -> None:
+        """Stop running jobs after their current batch; queued jobs fail without starting"""
+        ImportService._stop_event.set()
+        executor = ImportService._executor
+        if executor is not None and ImportService._executor_pid == os.getpid():
+            executor.shutdown(wait=False)
+            ImportService._executor = None
+
+    @staticmethod
+    def get_job_by_id(job_id: int, db: Session) -> ImportJob:
+        """Get an import job by ID, raising HTTPException if not found"""
+        job = db.query(ImportJob).filter(ImportJob.id == job_id).first()
+        if not job:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Import job not found"
+            )
+        return job
+
+    @staticmethod
+    def list_project_jobs(project_id: int, db: Session) -> List[ImportJob]:
+        """Import jobs of a project, newest first"""
+        return db.query(ImportJob).filter(
+            ImportJob.project_id == project_id
+        ).order_by(ImportJob.created_at.desc(), ImportJob.id.desc()).all()
+
+    @staticmethod
+    def get_error_file(job_id: int, db: Session) -> Path:
+        """Path of a job's error file, raising HTTPException if it has none"""
+        job = ImportService.get_job_by_id(job_id, db)
+        if not job.error_file_path or not Path(job.error_file_path).exists():
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Import job has no error file"
+            )
+        return Path(job.error_file_path)
+
+    @staticmethod
+    def build_job_response(job: ImportJob) -> ImportJobResponse:
+        """Build ImportJobResponse with progress and throughput"""
+        if job.status == 'completed':
+            progress = 100
+        elif job.total_bytes:
+            progress = min(int(job.processed_bytes * 100 / job.total_bytes), 99)
+        else:
+            progress = 0
+
+        rows_per_second = None
+        if job.started_at and job.processed_rows:
+            elapsed = ((job.finished_at or datetime.now()) - job.started_at).total_seconds()
+            rows_per_second = round(job.processed_rows / max(elapsed, 0.001), 1)
+
+        return ImportJobResponse(
+            id=job.id,
+            project_id=job.project_id,
+            status=job.status,
+            file_name=job.file_name,
+            file_format=job.file_format,
+            progress_percentage=progress,
+            processed_rows=job.processed_rows or 0,
+            imported_rows=job.imported_rows or 0,
+            failed_rows=job.failed_rows or 0,
+            rows_per_second=rows_per_second,
+            error_file_available=bool(job.error_file_path),
+            error_message=job.error_message,
+            created_by=job.created_by,
+            created_at=job.created_at,
+            started_at=job.started_at,
+            finished_at=job.finished_at
+        )
+
+    # ---- Parsing ---------------------------------------------------------
+
+    @staticmethod
+    def iter_records(path: str, file_format: str) -> Iterator[Tuple[int, Any, Optional[str], int]]:
+        """
+        Yield (row number, record, parse error, bytes read so far) for each record.
+        CSV and NDJSON are streamed; a JSON array is parsed in one go.
+        """
+        with open(path, 'rb') as raw:
+            if file_format == 'csv':
+                reader = csv.DictReader(io.TextIOWrapper(raw, encoding='utf-8-sig', newline=''))
+                for number, record in enumerate(reader, 1):
+                    yield number, record, None, raw.tell()
+            elif file_format == 'ndjson':
+                number = 0
+                for line in raw:
+                    if not line.strip():
+                        continue
+                    number += 1
+                    try:
+                        yield number, orjson.loads(line), None, raw.tell()
+                    except orjson.JSONDecodeError as e:
+                        yield number, line.decode('utf-8', errors='replace').rstrip('\r\n'), f"Invalid JSON: {e}", raw.tell()
+            else:
+                try:
+                    records = orjson.loads(raw.read())
+                except orjson.JSONDecodeError as e:
+                    raise ValueError(f"Invalid JSON file: {e}")
+                if not isinstance(records, list):
+                    raise ValueError("A JSON import file must contain an array of task objects")
+                size = raw.tell()
+                for number, record in enumerate(records, 1):
+                    yield number, record, None, size
+
+    @staticmethod
+    def normalize_record(record: Any) -> Dict[str, Any]:
+        """Known fields of a record, with blank values dropped and list cells split"""
+        if not isinstance(record, dict):
+            raise ValueError("Record must be an object")
+        payload = {}
+        for name, value in record.items():
+            if not isinstance(name, str):
+                continue  # Surplus CSV cells
+            key = name.strip().lower()
+            if key not in RECORD_FIELDS or value is None:
+                continue
+            if isinstance(value, str):
+                value = value.strip()
+                if not value:
+                    continue
+                if key in LIST_FIELDS:
+                    value = [item.strip() for item in LIST_SEPARATOR.split(value) if item.strip()]
+            elif key in LIST_FIELDS and not isinstance(value, list):
+                value = [value]
+            payload[key] = value
+        return payload
+
+    @staticmethod
+    def build_row(
+        record: Any,
+        lookups: ImportLookups,
+        job: ImportJob
+    ) -> Tuple[Dict[str, Any], List[int]]:
+        """
+        Validate a record and map it to tasks column values plus assignee ids.
+        Raises ValueError listing every problem with the record.
+        """
+        payload = ImportService.normalize_record(record)
+        try:
+            task = TaskCreate.model_validate({key: value for key, value in payload.items() if key in TaskCreate.model_fields})
+        except ValidationError as e:
+            raise ValueError('; '.join(
+                f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in e.errors()
+            ))
+
+        errors = []
+
+        def lookup(mapping: Dict[str, int], key: Optional[str], label: str) -> Optional[int]:
+            if not key:
+                return None
+            if key not in mapping:
+                errors.append(f"{label} '{key}' not found")
+            return mapping.get(key)
+
+        def user_id(value: Any, label: str) -> Optional[int]:
+            if isinstance(value, str) and '@' in value:
+                found = lookups.user_emails.get(value.lower())
+            else:
+                try:
+                    found = int(value)
+                except (TypeError, ValueError):
+                    found = None
+                if found not in lookups.user_ids:
+                    found = None
+            if found is None:
+                errors.append(f"{label} '{value}' not found")
+            return found
+
+        status_id = lookup(lookups.statuses, task.status_key, "Task status")
+        priority_id = lookup(lookups.priorities, task.priority_key, "Task priority")
+        task_type_id = lookup(lookups.task_types, task.task_type_key, "Task type")
+
+        if task.sprint_id and task.sprint_id not in lookups.sprint_ids:
+            errors.append(f"Sprint with id {task.sprint_id} not found in project {job.project_id}")
+
+        reviewer_id = None
+        if task.reviewer_id:
+            reviewer_id = user_id(task.reviewer_id, "Reviewer")
+        elif payload.get('reviewer_email'):
+            reviewer_id = user_id(payload['reviewer_email'], "Reviewer")
+
+        assignee_ids = []
+        for value in list(task.assignee_ids or []) + list(payload.get('assignee_emails') or []):
+            found = user_id(value, "Assignee")
+            if found is not None and found not in assignee_ids:
+                assignee_ids.append(found)
+
+        if task.estimated_hours is not None and not 0 <= task.estimated_hours <= MAX_HOURS:
+            errors.append(f"estimated_hours: must be between 0 and {MAX_HOURS}")
+        if task.description and len(task.description.encode('utf-8')) > MAX_DESCRIPTION_BYTES:
+            errors.append(f"description: longer than {MAX_DESCRIPTION_BYTES} bytes")
+
+        if errors:
+            raise ValueError('; '.join(errors))
+
+        return {
+            'title': task.title,
+            'description': task.description,
+            'project_id': job.project_id,
+            'sprint_id': task.sprint_id,
+            'status_id': status_id,
+            'priority_id': priority_id,
+            'task_type_id': task_type_id,
+            'assignee_id': assignee_ids[0] if assignee_ids else None,
+            'reviewer_id': reviewer_id,
+            'due_date': task.due_date,
+            'estimated_hours': task.estimated_hours,
+            'progress_percentage': task.progress_percentage or 0,
+            'created_by': job.created_by,
+            'import_job_id': job.id,
+        }, assignee_ids
+
+    # ---- Writing ---------------------------------------------------------
+
+    @staticmethod
+    def write_batch(
+        job: ImportJob,
+        rows: List[Tuple[Dict[str, Any], List[int]]],
+        last_task_id: int,
+        done_status_id: Optional[int],
+        db: Session
+    ) -> Tuple[int, List[int]]:
+        """
+        Insert a batch of validated rows (not committed). Returns the new
+        highest task id of the job and the ids of the inserted tasks.
+        """
+        if not rows:
+            return last_task_id, []
+
+        # Burndown first: a sprint's first burndown row is seeded from the
+        # tasks already in the database, which must not include this batch yet
+        deltas: Dict[int, Dict[str, float]] = {}
+        for values, _ in rows:
+            if values['sprint_id']:
+                delta = deltas.setdefault(values['sprint_id'], {field: 0 for field in BURNDOWN_FIELDS})
+                for field, value in SprintAnalyticsService.contribution(values, done_status_id).items():
+                    delta[field] += value
+        for sprint_id, delta in deltas.items():
+            SprintAnalyticsService.apply_delta(sprint_id, delta, db)
+        db.flush()
+
+        db.execute(insert(Task), [values for values, _ in rows])
+
+        # Auto-increment ids follow row order within the job; read them back by job
+        task_ids = db.execute(
+            select(Task.id).where(Task.import_job_id == job.id, Task.id > last_task_id).order_by(Task.id)
+        ).scalars().all()
+        if len(task_ids) != len(rows):
+            raise RuntimeError(f"Inserted {len(rows)} tasks but read back {len(task_ids)} ids")
+
+        assignee_rows = [
+            {'task_id': task_id, 'user_id': user_id, 'assigned_by': job.created_by}
+            for task_id, (_, assignee_ids) in zip(task_ids, rows)
+            for user_id in assignee_ids
+        ]
+        if assignee_rows:
+            db.execute(insert(TaskAssignee), assignee_rows)
+        db.execute(insert(TaskHistory), [
+            {'task_id': task_id, 'sprint_id': values['sprint_id'], 'field_name': 'created', 'changed_by': job.created_by}
+            for task_id, (values, _) in zip(task_ids, rows)
+        ])
+        return task_ids[-1], task_ids
+
+    @staticmethod
+    def save_progress(job: ImportJob, db: Session, **values) -> None:
+        """Write job counters/state (part of the surrounding transaction)"""
+        db.execute(update(ImportJob).where(ImportJob.id == job.id).values(**values))
+        for name, value in values.items():
+            setattr(job, name, value)
+
+    @staticmethod
+    def run_job(job_id: int) -> None:
+        """Import a queued job's file; runs on the import pool"""
+        db = database_connection.SessionLocal()
+        job = None
+        errors = None
+        try:
+            job = db.query(ImportJob).filter(ImportJob.id == job_id).first()
+            if job is None or job.status != 'queued':
+                return
+            if ImportService._stop_event.is_set():
+                raise ImportInterrupted()
+            ImportService.save_progress(job, db, status='running', started_at=datetime.now().replace(microsecond=0))
+            db.commit()
+
+            lookups = ImportLookups(job.project_id, db)
+            done_status_id = SprintAnalyticsService.get_done_status_id(db)
+            errors = ImportErrorFile(ImportService.IMPORT_DIR / f"job-{job.id}-errors.csv")
+            rows: List[Tuple[Dict[str, Any], List[int]]] = []
+            counts = {'processed_rows': 0, 'imported_rows': 0, 'failed_rows': 0, 'processed_bytes': 0}
+            last_task_id = 0
+            pending = 0
+
+            def flush_batch():
+                nonlocal last_task_id, pending
+                last_task_id, task_ids = ImportService.write_batch(job, rows, last_task_id, done_status_id, db)
+                counts['imported_rows'] += len(task_ids)
+                errors.flush()
+                ImportService.save_progress(
+                    job, db, **counts,
+                    error_file_path=str(errors.path.absolute()) if errors.count else None
+                )
+                db.commit()
+                if task_ids:
+                    DependencyService.invalidate_project(job.project_id)
+                    CalendarService.invalidate_project(job.project_id)
+                    EventService.publish("tasks.imported", "import_job", job.id, job.project_id, {
+                        'imported': len(task_ids),
+                        'first_task_id': task_ids[0],
+                        'last_task_id': task_ids[-1],
+                    })
+                rows.clear()
+                pending = 0
+
+            for number, record, parse_error, position in ImportService.iter_records(job.file_path, job.file_format):
+                counts['processed_rows'] += 1
+                counts['processed_bytes'] = position
+                pending += 1
+                try:
+                    if parse_error:
+                        raise ValueError(parse_error)
+                    rows.append(ImportService.build_row(record, lookups, job))
+                except ValueError as e:
+                    errors.add(number, str(e), record)
+                    counts['failed_rows'] += 1
+                if pending >= ImportService.BATCH_SIZE:
+                    if ImportService._stop_event.is_set():
+                        raise ImportInterrupted()
+                    flush_batch()
+
+            counts['processed_bytes'] = job.total_bytes
+            flush_batch()
+            ImportService.save_progress(job, db, status='completed', finished_at=datetime.now().replace(microsecond=0))
+            db.commit()
+            logger.info(
+                f"Import job {job.id}: {counts['imported_rows']} tasks imported, "
+                f"{counts['failed_rows']} rows rejected"
+            )
+            AuditService.record(
+                "task.import", "import_job", job.id,
+                new_values={'project_id': job.project_id, 'file_name': job.file_name, **counts},
+                user_id=job.created_by
+            )
+        except Exception as e:
+            db.rollback()
+            if isinstance(e, ImportInterrupted):
+                message = "Interrupted by server shutdown"
+            else:
+                message = str(e) or type(e).__name__
+                logger.error(f"Import job {job_id} failed: {message}")
+            if job is not None:
+                try:
+                    ImportService.save_progress(
+                        job, db, status='failed', error_message=message,
+                        finished_at=datetime.now().replace(microsecond=0),
+                        error_file_path=str(errors.path.absolute()) if errors and errors.count else job.error_file_path
+                    )
+                    db.commit()
+                except Exception as save_error:
+                    db.rollback()
+                    logger.error(f"Import job {job_id} state could not be saved: {save_error}")
+        finally:
+            if errors is not None:
+                errors.close()
+            if job is not None and job.status in ('completed', 'failed'):
+                Path(job.file_path).unlink(missing_ok=True)
+            db.close()
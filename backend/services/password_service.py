@@ -0,0 +1,167 @@
+"""
+Password Service - bcrypt hashing on a dedicated, bounded process pool.
+bcrypt costs ~100 ms of CPU per call; running it on request threads would let
+a burst of logins starve every other endpoint. Work is sent to a small
+process pool instead, the number of waiting requests is capped, and callers
+beyond the cap are rejected immediately with 503 + Retry-After.
+"""
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Optional, Tuple
+import logging
+import multiprocessing
+import os
+import secrets
+import threading
+from fastapi import HTTPException, status
+from passlib.context import CryptContext
+
+logger = logging.getLogger(__name__)
+
+# Created lazily in each worker process (and in-process when the pool is disabled)
+_crypt_context: Optional[CryptContext] = None
+
+
+def _get_crypt_context() -> CryptContext:
+    global _crypt_context
+    if _crypt_context is None:
+        _crypt_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+    return _crypt_context
+
+
+def _hash_password(password: str) -> str:
+    """Runs in a pool worker"""
+    return _get_crypt_context().hash(password)
+
+
+def _verify_password(password: str, password_hash: str) -> Tuple[bool, bool]:
+    """Runs in a pool worker; returns (matches, hash_needs_update)"""
+    context = _get_crypt_context()
+    matches = context.verify(password, password_hash)
+    return matches, matches and context.needs_update(password_hash)
+
+
+def _warm_up() -> int:
+    """Runs in a pool worker; loads bcrypt so the first real call is not slower"""
+    _get_crypt_context()
+    return os.getpid()
+
+
+class PasswordService:
+    """Service class for password hashing and verification"""
+
+    # Configuration (overridable through the environment)
+    # POOL_SIZE=0 hashes in-process (scripts, single-threaded tools)
+    POOL_SIZE = int(os.getenv("PASSWORD_POOL_SIZE", str(min(2, os.cpu_count() or 1))))
+    # Requests allowed to wait for or occupy a worker before new ones are rejected
+    MAX_PENDING = int(os.getenv("PASSWORD_MAX_PENDING", str(max(1, POOL_SIZE) * 8)))
+    TIMEOUT_SECONDS = float(os.getenv("PASSWORD_TIMEOUT_SECONDS", "10"))
+    RETRY_AFTER_SECONDS = 1
+
+    _pool: Optional[ProcessPoolExecutor] = None
+    _pool_pid: Optional[int] = None
+    _pool_lock = threading.Lock()
+    _pending = threading.BoundedSemaphore(MAX_PENDING)
+    stats = {'completed': 0, 'rejected': 0, 'timed_out': 0}
+
+    @staticmethod
+    def get_pool() -> Optional[ProcessPoolExecutor]:
+        """Get (or create) this process's pool; a forked child never reuses its parent's"""
+        if PasswordService.POOL_SIZE <= 0:
+            return None
+        pid = os.getpid()
+        if PasswordService._pool is not None and PasswordService._pool_pid == pid:
+            return PasswordService._pool
+        with PasswordService._pool_lock:
+            if PasswordService._pool is None or PasswordService._pool_pid != pid:
+                # spawn: forking a threaded server process is unsafe
+                PasswordService._pool = ProcessPoolExecutor(
+                    max_workers=PasswordService.POOL_SIZE,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+                PasswordService._pool_pid = pid
+        return PasswordService._pool
+
+    @staticmethod
+    def start() -> None:
+        """Start the pool and load bcrypt in every worker"""
+        pool = PasswordService.get_pool()
+        if pool is None:
+            return
+        try:
+            futures = [pool.submit(_warm_up) for _ in range(PasswordService.POOL_SIZE)]
+            for future in futures:
+                future.result(timeout=30)
+        except Exception as e:
+            logger.warning(f"Password pool warm-up failed: {e}")
+
+    @staticmethod
+    def shutdown() -> None:
+        """Stop the pool's worker processes"""
+        with PasswordService._pool_lock:
+            pool = PasswordService._pool
+            if pool is not None and PasswordService._pool_pid == os.getpid():
+                pool.shutdown(wait=False, cancel_futures=True)
+            PasswordService._pool = None
+            PasswordService._pool_pid = None
+
+    @staticmethod
+    def overloaded() -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Authentication service is busy, please retry shortly",
+            headers={"Retry-After": str(PasswordService.RETRY_AFTER_SECONDS)}
+        )
+
+    @staticmethod
+    def run(function, *args):
+        """Run a hashing function on the pool, rejecting at once when saturated"""
+        pool = PasswordService.get_pool()
+        if pool is None:
+            return function(*args)
+
+        if not PasswordService._pending.acquire(blocking=False):
+            PasswordService.stats['rejected'] += 1
+            raise PasswordService.overloaded()
+        try:
+            future = pool.submit(function, *args)
+            try:
+                result = future.result(timeout=PasswordService.TIMEOUT_SECONDS)
+            except FutureTimeoutError:
+                future.cancel()
+                PasswordService.stats['timed_out'] += 1
+                raise PasswordService.overloaded()
+            PasswordService.stats['completed'] += 1
+            return result
+        finally:
+            PasswordService._pending.release()
+
+    @staticmethod
+    def is_hash(value: Optional[str]) -> bool:
+        """Whether a stored value is a recognized password hash (vs. legacy plaintext)"""
+        return bool(value) and _get_crypt_context().identify(value) is not None
+
+    @staticmethod
+    def hash_password(password: str) -> str:
+        """Hash a password with bcrypt"""
+        return PasswordService.run(_hash_password, password)
+
+    @staticmethod
+    def verify_password(password: str, stored_hash: Optional[str]) -> Tuple[bool, Optional[str]]:
+        """
+        Verify a password against the stored value.
+        Returns (matches, new_hash); new_hash is set when the stored value should
+        be replaced (legacy plaintext rows or outdated bcrypt parameters).
+        """
+        if not stored_hash:
+            return False, None
+
+        if not PasswordService.is_hash(stored_hash):
+            # Rows created before hashing was introduced hold the plaintext password
+            if secrets.compare_digest(password.encode('utf-8'), stored_hash.encode('utf-8')):
+                return True, PasswordService.hash_password(password)
+            return False, None
+
+        matches, needs_update = PasswordService.run(_verify_password, password, stored_hash)
+        if needs_update:
+            return True, PasswordService.hash_password(password)
+        return matches, None
@@ -0,0 +1,276 @@
+"""
+Portfolio Analytics Service - Vectorized analytics across projects.
+Pulls project and task columns in bulk into NumPy arrays and computes grouped
+aggregates per project and per company, without loading ORM objects.
+"""
+import numpy as np
+from sqlalchemy.orm import Session
+from sqlalchemy import select
+from typing import Optional, Dict, List
+from datetime import datetime, date
+from fastapi import HTTPException, status
+
+from models.project import Project, ProjectStatus
+from models.task import Task
+from models.company import Company
+from schemas.analytics import (
+    PortfolioMetrics,
+    ProjectPortfolioRow,
+    CompanyPortfolioSummary,
+    PortfolioResponse,
+)
+from services.sprint_analytics_service import SprintAnalyticsService
+
+
+# Per-project accumulators filled from the task stream
+TASK_ACCUMULATORS = (
+    'tasks_count',
+    'done_tasks_count',
+    'overdue_tasks_count',
+    'estimated_hours',
+    'actual_hours',
+    'progress_sum',
+)
+
+
+class PortfolioAnalyticsService:
+    """Service class for portfolio analytics"""
+
+    # Rows fetched per round trip while streaming tasks
+    TASK_CHUNK_SIZE = 50000
+
+    @staticmethod
+    def to_float_array(values) -> np.ndarray:
+        """Convert a column of Decimal/int/None values to float64 (None -> NaN)"""
+        return np.array(values, dtype=np.float64)
+
+    @staticmethod
+    def load_projects(
+        db: Session,
+        company_id: Optional[int] = None,
+        status_id: Optional[int] = None
+    ) -> Dict[str, np.ndarray]:
+        """Load the project columns needed for the portfolio, sorted by id"""
+        query = select(
+            Project.id,
+            Project.name,
+            Project.company_id,
+            Project.status_id,
+            Project.budget,
+            Project.start_date,
+            Project.end_date
+        ).order_by(Project.id)
+        if company_id:
+            query = query.where(Project.company_id == company_id)
+        if status_id:
+            query = query.where(Project.status_id == status_id)
+
+        rows = db.execute(query).all()
+        if not rows:
+            return {}
+
+        ids, names, company_ids, status_ids, budgets, starts, ends = zip(*rows)
+        return {
+            'id': np.array(ids, dtype=np.int64),
+            'name': np.array(names, dtype=object),
+            'company_id': np.array([c if c is not None else -1 for c in company_ids], dtype=np.int64),
+            'status_id': np.array([s if s is not None else -1 for s in status_ids], dtype=np.int64),
+            'budget': np.nan_to_num(PortfolioAnalyticsService.to_float_array(budgets)),
+            'start_date': np.array(starts, dtype='datetime64[D]'),
+            'end_date': np.array(ends, dtype='datetime64[D]'),
+        }
+
+    @staticmethod
+    def aggregate_tasks(
+        db: Session,
+        project_ids: np.ndarray,
+        company_id: Optional[int] = None,
+        status_id: Optional[int] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Stream task columns in chunks and accumulate per-project sums.
+        Memory stays bounded by the chunk size, not by the number of tasks.
+        """
+        n = len(project_ids)
+        totals = {name: np.zeros(n, dtype=np.float64) for name in TASK_ACCUMULATORS}
+        if n == 0:
+            return totals
+
+        done_status_id = SprintAnalyticsService.get_done_status_id(db)
+        now = np.datetime64(datetime.now(), 's')
+
+        query = select(
+            Task.project_id,
+            Task.status_id,
+            Task.estimated_hours,
+            Task.actual_hours,
+            Task.progress_percentage,
+            Task.due_date
+        ).where(Task.project_id.isnot(None))
+        if company_id or status_id:
+            # Same filters as the project load, evaluated inside MySQL
+            scope = select(Project.id)
+            if company_id:
+                scope = scope.where(Project.company_id == company_id)
+            if status_id:
+                scope = scope.where(Project.status_id == status_id)
+            query = query.where(Task.project_id.in_(scope))
+
+        result = db.execute(query.execution_options(yield_per=PortfolioAnalyticsService.TASK_CHUNK_SIZE))
+        for chunk in result.partitions():
+            columns = list(zip(*chunk))
+            task_project_ids = np.array(columns[0], dtype=np.int64)
+
+            # Map each task's project id onto its row in the sorted project arrays
+            index = np.searchsorted(project_ids, task_project_ids)
+            index = np.clip(index, 0, n - 1)
+            known = project_ids[index] == task_project_ids
+            if not known.all():
+                index = index[known]
+                columns = [np.asarray(column, dtype=object)[known] for column in columns]
+
+            status_ids = PortfolioAnalyticsService.to_float_array(columns[1])
+            is_done = status_ids == done_status_id if done_status_id is not None else np.zeros(len(index), dtype=bool)
+            estimated = np.nan_to_num(PortfolioAnalyticsService.to_float_array(columns[2]))
+            actual = np.nan_to_num(PortfolioAnalyticsService.to_float_array(columns[3]))
+            progress = np.nan_to_num(PortfolioAnalyticsService.to_float_array(columns[4]))
+            progress = np.where(is_done, 100.0, np.clip(progress, 0, 100))
+            due = np.array(columns[5], dtype='datetime64[s]')
+            overdue = ~np.isnat(due) & (due < now) & ~is_done
+
+            totals['tasks_count'] += np.bincount(index, minlength=n)
+            totals['done_tasks_count'] += np.bincount(index, weights=is_done, minlength=n)
+            totals['overdue_tasks_count'] += np.bincount(index, weights=overdue, minlength=n)
+            totals['estimated_hours'] += np.bincount(index, weights=estimated, minlength=n)
+            totals['actual_hours'] += np.bincount(index, weights=actual, minlength=n)
+            totals['progress_sum'] += np.bincount(index, weights=progress, minlength=n)
+
+        return totals
+
+    @staticmethod
+    def group_sum(values: Dict[str, np.ndarray], group_index: np.ndarray, groups: int) -> Dict[str, np.ndarray]:
+        """Sum every per-project array into per-group arrays"""
+        return {
+            name: np.bincount(group_index, weights=array, minlength=groups)
+            for name, array in values.items()
+        }
+
+    @staticmethod
+    def build_metrics(values: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """Derive ratios from summed accumulators (vectorized over all rows)"""
+        tasks = values['tasks_count']
+        estimated = values['estimated_hours']
+        with np.errstate(divide='ignore', invalid='ignore'):
+            overdue_ratio = np.where(tasks > 0, values['overdue_tasks_count'] / tasks, 0.0)
+            avg_progress = np.where(tasks > 0, values['progress_sum'] / tasks, 0.0)
+            hours_ratio = np.where(estimated > 0, values['actual_hours'] / estimated, np.nan)
+        return {
+            'overdue_ratio': overdue_ratio,
+            'avg_progress': avg_progress,
+            'hours_ratio': hours_ratio,
+        }
+
+    @staticmethod
+    def metrics_at(values: Dict[str, np.ndarray], derived: Dict[str, np.ndarray], i: int) -> Dict:
+        """Extract the metrics of row i as plain Python values"""
+        hours_ratio = derived['hours_ratio'][i]
+        return {
+            'projects_count': int(values['projects_count'][i]),
+            'tasks_count': int(values['tasks_count'][i]),
+            'done_tasks_count': int(values['done_tasks_count'][i]),
+            'overdue_tasks_count': int(values['overdue_tasks_count'][i]),
+            'overdue_ratio': round(float(derived['overdue_ratio'][i]), 4),
+            'estimated_hours': round(float(values['estimated_hours'][i]), 2),
+            'actual_hours': round(float(values['actual_hours'][i]), 2),
+            'hours_ratio': None if np.isnan(hours_ratio) else round(float(hours_ratio), 4),
+            'budget': round(float(values['budget'][i]), 2),
+            'avg_progress': round(float(derived['avg_progress'][i]), 2),
+        }
+
+    @staticmethod
+    def get_portfolio(
+        db: Session,
+        company_id: Optional[int] = None,
+        status_key: Optional[str] = None,
+        include_projects: bool = True
+    ) -> PortfolioResponse:
+        """Compute portfolio analytics, optionally scoped to one company and project status"""
+        status_id = None
+        if status_key:
+            status_id = db.query(ProjectStatus.id).filter(ProjectStatus.key == status_key).scalar()
+            if status_id is None:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Project status '{status_key}' not found"
+                )
+        projects = PortfolioAnalyticsService.load_projects(db, company_id, status_id)
+
+        if not projects:
+            return PortfolioResponse(
+                generated_at=datetime.now(),
+                company_id=company_id,
+                status_key=status_key,
+                totals=PortfolioMetrics()
+            )
+
+        n = len(projects['id'])
+        values = PortfolioAnalyticsService.aggregate_tasks(db, projects['id'], company_id, status_id)
+        values['budget'] = projects['budget']
+        values['projects_count'] = np.ones(n, dtype=np.float64)
+
+        # Per-company and overall sums
+        company_keys, company_index = np.unique(projects['company_id'], return_inverse=True)
+        company_values = PortfolioAnalyticsService.group_sum(values, company_index, len(company_keys))
+        total_values = PortfolioAnalyticsService.group_sum(values, np.zeros(n, dtype=np.int64), 1)
+
+        company_names = dict(
+            db.query(Company.id, Company.name).filter(Company.id.in_([int(c) for c in company_keys if c >= 0])).all()
+        )
+        company_derived = PortfolioAnalyticsService.build_metrics(company_values)
+        companies: List[CompanyPortfolioSummary] = []
+        for i, key in enumerate(company_keys):
+            key = int(key)
+            companies.append(CompanyPortfolioSummary(
+                company_id=key if key >= 0 else None,
+                company_name=company_names.get(key),
+                **PortfolioAnalyticsService.metrics_at(company_values, company_derived, i)
+            ))
+
+        total_derived = PortfolioAnalyticsService.build_metrics(total_values)
+        totals = PortfolioMetrics(**PortfolioAnalyticsService.metrics_at(total_values, total_derived, 0))
+
+        project_rows: List[ProjectPortfolioRow] = []
+        if include_projects:
+            project_derived = PortfolioAnalyticsService.build_metrics(values)
+
+            # Schedule: share of each project's date range already elapsed
+            today = np.datetime64(date.today(), 'D')
+            starts, ends = projects['start_date'], projects['end_date']
+            span = (ends - starts).astype('timedelta64[D]').astype(np.float64)
+            elapsed = (today - starts).astype('timedelta64[D]').astype(np.float64)
+            has_range = ~np.isnat(starts) & ~np.isnat(ends) & (span > 0)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                time_elapsed = np.where(has_range, np.clip(elapsed / span, 0, 1) * 100, np.nan)
+            schedule_variance = project_derived['avg_progress'] - time_elapsed
+
+            status_keys = dict(db.query(ProjectStatus.id, ProjectStatus.key).all())
+            for i in range(n):
+                project_company_id = int(projects['company_id'][i])
+                project_rows.append(ProjectPortfolioRow(
+                    project_id=int(projects['id'][i]),
+                    project_name=projects['name'][i],
+                    company_id=project_company_id if project_company_id >= 0 else None,
+                    status_key=status_keys.get(int(projects['status_id'][i])),
+                    time_elapsed_percentage=None if np.isnan(time_elapsed[i]) else round(float(time_elapsed[i]), 2),
+                    schedule_variance=None if np.isnan(schedule_variance[i]) else round(float(schedule_variance[i]), 2),
+                    **PortfolioAnalyticsService.metrics_at(values, project_derived, i)
+                ))
+
+        return PortfolioResponse(
+            generated_at=datetime.now(),
+            company_id=company_id,
+            status_key=status_key,
+            totals=totals,
+            companies=companies,
+            projects=project_rows
+        )
@@ -2,9 +2,9 @@
 Project Service - Business logic for project management.
 Handles all project-related operations, validation, and data transformation.
 """
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import func, text
-from typing import Optional, List
+from sqlalchemy.orm import Session, joinedload, load_only
+from sqlalchemy import func, text, bindparam
+from typing import Optional, List, Dict, Set, Any
 from datetime import datetime, date
 from fastapi import HTTPException, status
 
@@ -13,10 +13,35 @@ from models.task import Task
 from models.user import User
 from models.company import Company
 from schemas.project import ProjectCreate, ProjectUpdate, ProjectResponse
+from services.audit_service import AuditService
+from services.event_service import EventService
+from services.sync_service import SyncService
+from serialization import resolve_sources
 
 
 class ProjectService:
     """Service class for project business logic"""
+
+    # ProjectResponse field -> (Project columns it reads, relationship to eager-load), for ?fields=
+    RESPONSE_FIELD_SOURCES = {
+        'id': ((Project.id,), None),
+        'name': ((Project.name,), None),
+        'description': ((Project.description,), None),
+        'company_id': ((Project.company_id,), None),
+        'company_name': ((Project.company_id,), None),
+        'project_manager_id': ((Project.project_manager_id,), None),
+        'project_manager_name': ((Project.project_manager_id,), None),
+        'status_key': ((Project.status_id,), Project.status),
+        'status_name': ((Project.status_id,), Project.status),
+        'start_date': ((Project.start_date,), None),
+        'end_date': ((Project.end_date,), None),
+        'budget': ((Project.budget,), None),
+        'tasks_count': ((), None),
+        'sprints_count': ((), None),
+        'members_count': ((), None),
+        'created_at': ((Project.created_at,), None),
+        'updated_at': ((Project.updated_at,), None),
+    }
     
     @staticmethod
     def parse_date(date_str: Optional[str]) -> Optional[date]:
@@ -88,6 +113,64 @@ class ProjectService:
             updated_at=project.updated_at
         )
     
+    @staticmethod
+    def build_project_field_rows(projects: List[Project], db: Session, fields: Set[str]) -> List[Dict[str, Any]]:
+        """
+        Build ProjectResponse-shaped dicts holding only the requested fields.
+        Names and counts are resolved with one query each, and only when requested.
+        """
+        project_ids = [project.id for project in projects]
+
+        def count_by_project(column) -> Dict[int, int]:
+            if not project_ids:
+                return {}
+            return dict(db.query(column, func.count()).filter(column.in_(project_ids)).group_by(column).all())
+
+        tasks_counts = count_by_project(Task.project_id) if 'tasks_count' in fields else {}
+        sprints_counts = count_by_project(Sprint.project_id) if 'sprints_count' in fields else {}
+        members_counts = {}
+        if 'members_count' in fields and project_ids:
+            members_counts = dict(db.execute(
+                text(
+                    "SELECT project_id, COUNT(*) FROM user_projects "
+                    "WHERE project_id IN :project_ids GROUP BY project_id"
+                ).bindparams(bindparam("project_ids", expanding=True)),
+                {"project_ids": project_ids}
+            ).fetchall())
+
+        company_names, manager_names = {}, {}
+        if 'company_name' in fields:
+            company_ids = {project.company_id for project in projects if project.company_id}
+            if company_ids:
+                company_names = dict(db.query(Company.id, Company.name).filter(Company.id.in_(company_ids)).all())
+        if 'project_manager_name' in fields:
+            manager_ids = {project.project_manager_id for project in projects if project.project_manager_id}
+            if manager_ids:
+                manager_names = {
+                    row.id: f"{row.first_name} {row.last_name}"
+                    for row in db.query(User.id, User.first_name, User.last_name).filter(User.id.in_(manager_ids))
+                }
+
+        computed = {
+            'company_name': lambda project: company_names.get(project.company_id),
+            'project_manager_name': lambda project: manager_names.get(project.project_manager_id),
+            'status_key': lambda project: project.status.key if project.status else None,
+            'status_name': lambda project: project.status.name if project.status else None,
+            'start_date': lambda project: project.start_date.isoformat() if project.start_date else None,
+            'end_date': lambda project: project.end_date.isoformat() if project.end_date else None,
+            'budget': lambda project: float(project.budget) if project.budget else None,
+            'tasks_count': lambda project: tasks_counts.get(project.id, 0),
+            'sprints_count': lambda project: sprints_counts.get(project.id, 0),
+            'members_count': lambda project: members_counts.get(project.id, 0),
+        }
+        return [
+            {
+                name: computed[name](project) if name in computed else getattr(project, name)
+                for name in fields
+            }
+            for project in projects
+        ]
+    
     @staticmethod
     def get_project_by_id(project_id: int, db: Session) -> Project:
         """Get a project by ID, raising HTTPException if not found"""
@@ -111,14 +194,22 @@ class ProjectService:
         project_manager_id: Optional[int] = None,
         status_key: Optional[str] = None,
         skip: int = 0,
-        limit: int = 100
+        limit: int = 100,
+        fields: Optional[Set[str]] = None
     ) -> List[Project]:
-        """List projects with optional filtering"""
-        query = db.query(Project).options(
-            joinedload(Project.status),
-            joinedload(Project.company),
-            joinedload(Project.project_manager)
-        )
+        """List projects with optional filtering (loading only what `fields` needs, when given)"""
+        if fields is None:
+            query = db.query(Project).options(
+                joinedload(Project.status),
+                joinedload(Project.company),
+                joinedload(Project.project_manager)
+            )
+        else:
+            columns, relationships = resolve_sources(fields, ProjectService.RESPONSE_FIELD_SOURCES)
+            query = db.query(Project).options(
+                load_only(*columns),
+                *[joinedload(relationship) for relationship in relationships]
+            )
         
         if company_id:
             query = query.filter(Project.company_id == company_id)
@@ -200,6 +291,8 @@ class ProjectService:
         db.add(project)
         db.commit()
         db.refresh(project)
+        AuditService.record_create("project", project)
+        EventService.publish("project.created", "project", project.id, project.id, AuditService.snapshot(project))
         
         # Reload with relationships
         return db.query(Project).options(
@@ -212,6 +305,7 @@ class ProjectService:
     def update_project(project_id: int, payload: ProjectUpdate, db: Session) -> Project:
         """Update a project with validation"""
         project = ProjectService.get_project_by_id(project_id, db)
+        audit_before = AuditService.snapshot(project)
         
         # Update basic fields
         if payload.name is not None:
@@ -251,8 +345,13 @@ class ProjectService:
         if payload.budget is not None:
             project.budget = payload.budget
         
+        audit_after = AuditService.snapshot(project)
         db.commit()
         db.refresh(project)
+        AuditService.record_update("project", project_id, audit_before, audit_after)
+        changes = AuditService.diff(audit_before, audit_after)[1]
+        if changes:
+            EventService.publish("project.updated", "project", project_id, project_id, changes)
         
         # Reload with relationships
         return db.query(Project).options(
@@ -265,6 +364,10 @@ class ProjectService:
     def delete_project(project_id: int, db: Session) -> None:
         """Delete a project"""
         project = ProjectService.get_project_by_id(project_id, db)
+        audit_before = AuditService.snapshot(project)
         db.delete(project)
+        SyncService.record_deletion(db, "project", project_id, project_id)
         db.commit()
+        AuditService.record_delete("project", project_id, audit_before)
+        EventService.publish("project.deleted", "project", project_id, project_id)
 
@@ -0,0 +1,245 @@
+"""
+Session Service - Token sessions stored in user_sessions.
+Issued tokens are random bearer tokens; only their SHA-256 is stored.
+Verified sessions are kept in a bounded in-memory cache with a short TTL,
+so authenticating a request needs no query in the common case. Revocations
+evict the cache immediately and are broadcast to registered listeners
+(other workers via the event bus); the cache TTL bounds staleness everywhere else.
+"""
+from sqlalchemy.orm import Session
+from typing import Optional, Dict, List, Callable, NamedTuple, Tuple
+from datetime import datetime, timedelta
+from collections import OrderedDict
+import hashlib
+import logging
+import os
+import secrets
+import threading
+import time
+from fastapi import HTTPException, status
+
+from models.user import User, UserSession
+from middleware.request_context import get_request_context
+from services.event_service import EventService
+
+logger = logging.getLogger(__name__)
+
+
+class AuthenticatedSession(NamedTuple):
+    session_id: int
+    user_id: int
+    expires_at: datetime
+    company_id: Optional[int] = None
+
+
+class SessionCache:
+    """Bounded LRU of verified sessions keyed by token hash, with a per-entry TTL"""
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[AuthenticatedSession, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, token_hash: str) -> Optional[AuthenticatedSession]:
+        now = time.monotonic()
+        with self._lock:
+            cached = self._entries.get(token_hash)
+            if cached is None:
+                self.misses += 1
+                return None
+            session, cached_until = cached
+            if cached_until <= now or session.expires_at <= datetime.now():
+                del self._entries[token_hash]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(token_hash)
+            self.hits += 1
+            return session
+
+    def put(self, token_hash: str, session: AuthenticatedSession) -> None:
+        with self._lock:
+            self._entries[token_hash] = (session, time.monotonic() + self.ttl_seconds)
+            self._entries.move_to_end(token_hash)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def evict(self, token_hashes: List[str] = (), user_id: Optional[int] = None) -> None:
+        with self._lock:
+            for token_hash in token_hashes:
+                self._entries.pop(token_hash, None)
+            if user_id is not None:
+                for token_hash in [h for h, (s, _) in self._entries.items() if s.user_id == user_id]:
+                    del self._entries[token_hash]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SessionService:
+    """Service class for token sessions"""
+
+    # Configuration (overridable through the environment)
+    SESSION_TTL_HOURS = int(os.getenv("SESSION_TTL_HOURS", "24"))
+    CACHE_TTL_SECONDS = int(os.getenv("SESSION_CACHE_TTL_SECONDS", "60"))
+    CACHE_MAX_ENTRIES = int(os.getenv("SESSION_CACHE_MAX_ENTRIES", "10000"))
+
+    cache = SessionCache(CACHE_MAX_ENTRIES, CACHE_TTL_SECONDS)
+
+    # Callbacks receiving revocation events {'token_hashes': [...], 'user_id': ...}
+    _revocation_listeners: List[Callable[[Dict], None]] = []
+
+    @staticmethod
+    def hash_token(token: str) -> str:
+        """SHA-256 hex digest of a bearer token"""
+        return hashlib.sha256(token.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def issue_session(user: User, db: Session) -> Tuple[str, UserSession]:
+        """Create a session for an authenticated user and return (token, session)"""
+        token = secrets.token_urlsafe(32)
+        token_hash = SessionService.hash_token(token)
+        context = get_request_context()
+        user_session = UserSession(
+            user_id=user.id,
+            token_hash=token_hash,
+            expires_at=datetime.now().replace(microsecond=0) + timedelta(hours=SessionService.SESSION_TTL_HOURS),
+            ip_address=context.get('ip_address'),
+            user_agent=context.get('user_agent'),
+            is_active=True
+        )
+        db.add(user_session)
+        db.commit()
+        db.refresh(user_session)
+
+        SessionService.cache.put(
+            token_hash,
+            AuthenticatedSession(user_session.id, user_session.user_id, user_session.expires_at, user.company_id)
+        )
+        return token, user_session
+
+    @staticmethod
+    def verify_token(token: str, db: Session) -> AuthenticatedSession:
+        """
+        Resolve a bearer token to its session, raising 401 if it is unknown,
+        expired or revoked. Served from the cache when possible; a miss costs
+        one lookup and refreshes last_accessed_at.
+        """
+        token_hash = SessionService.hash_token(token)
+        cached = SessionService.cache.get(token_hash)
+        if cached is not None:
+            return cached
+
+        now = datetime.now()
+        row = db.query(UserSession, User.company_id).join(User, User.id == UserSession.user_id).filter(
+            UserSession.token_hash == token_hash,
+            UserSession.is_active == True,
+            UserSession.expires_at > now,
+            User.is_active == True
+        ).first()
+        if not row:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid or expired session",
+                headers={"WWW-Authenticate": "Bearer"}
+            )
+        user_session, company_id = row
+
+        user_session.last_accessed_at = now.replace(microsecond=0)
+        db.commit()
+
+        session = AuthenticatedSession(user_session.id, user_session.user_id, user_session.expires_at, company_id)
+        SessionService.cache.put(token_hash, session)
+        return session
+
+    @staticmethod
+    def cached_tenant(token: str) -> Optional[str]:
+        """
+        Tenant of a token this process has already verified ("company:<id>",
+        or "user:<id>" without a company), without touching the database.
+        None for unknown tokens. Used for admission control.
+        """
+        session = SessionService.cache.get(SessionService.hash_token(token))
+        if session is None:
+            return None
+        if session.company_id is not None:
+            return f"company:{session.company_id}"
+        return f"user:{session.user_id}"
+
+    @staticmethod
+    def get_session_by_id(session_id: int, db: Session) -> UserSession:
+        """Get a session by ID, raising HTTPException if not found"""
+        user_session = db.query(UserSession).filter(UserSession.id == session_id).first()
+        if not user_session:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Session not found"
+            )
+        return user_session
+
+    @staticmethod
+    def list_user_sessions(user_id: int, db: Session) -> List[UserSession]:
+        """Active, unexpired sessions of a user (newest first)"""
+        return db.query(UserSession).filter(
+            UserSession.user_id == user_id,
+            UserSession.is_active == True,
+            UserSession.expires_at > datetime.now()
+        ).order_by(UserSession.id.desc()).all()
+
+    @staticmethod
+    def revoke_session(session_id: int, db: Session) -> None:
+        """Revoke one session"""
+        user_session = SessionService.get_session_by_id(session_id, db)
+        user_session.is_active = False
+        token_hash = user_session.token_hash
+        db.commit()
+        SessionService.broadcast_revocation({'token_hashes': [token_hash], 'user_id': None})
+
+    @staticmethod
+    def revoke_user_sessions(user_id: int, db: Session) -> int:
+        """Revoke every active session of a user; returns how many were revoked"""
+        token_hashes = [
+            token_hash for (token_hash,) in db.query(UserSession.token_hash).filter(
+                UserSession.user_id == user_id,
+                UserSession.is_active == True
+            ).all()
+        ]
+        if token_hashes:
+            db.query(UserSession).filter(
+                UserSession.user_id == user_id,
+                UserSession.is_active == True
+            ).update({UserSession.is_active: False}, synchronize_session=False)
+            db.commit()
+        SessionService.broadcast_revocation({'token_hashes': token_hashes, 'user_id': user_id})
+        return len(token_hashes)
+
+    @staticmethod
+    def add_revocation_listener(listener: Callable[[Dict], None]) -> None:
+        """Register a callback that forwards revocations (e.g. to other workers)"""
+        SessionService._revocation_listeners.append(listener)
+
+    @staticmethod
+    def apply_revocation(event: Dict) -> None:
+        """Evict revoked sessions from this process's cache (no re-broadcast)"""
+        SessionService.cache.evict(event.get('token_hashes') or [], event.get('user_id'))
+
+    @staticmethod
+    def broadcast_revocation(event: Dict) -> None:
+        """Apply a revocation locally and notify every listener"""
+        SessionService.apply_revocation(event)
+        for listener in list(SessionService._revocation_listeners):
+            try:
+                listener(event)
+            except Exception as e:
+                logger.warning(f"Session revocation listener failed: {e}")
+
+
+# Relay revocations to the other workers over the event bus (no-op when it is disabled)
+SessionService.add_revocation_listener(lambda event: EventService.broker.send_to_peers('sessions', event))
+EventService.broker.on_channel('sessions', SessionService.apply_revocation)
@@ -0,0 +1,415 @@
+"""
+Sprint Analytics Service - Burndown and velocity analytics for sprints.
+Maintains the task change log and keeps per-sprint daily burndown rows and
+velocity up to date incrementally, so reads never rescan a sprint's tasks.
+"""
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from typing import Optional, List, Dict, Tuple
+from datetime import date, timedelta
+from fastapi import HTTPException, status
+
+import database_connection
+from models.project import Project, Sprint, SprintBurndown
+from models.task import Task, TaskStatus, TaskHistory
+from schemas.sprint import (
+    BurndownPoint,
+    SprintBurndownResponse,
+    SprintVelocityEntry,
+    ProjectVelocityResponse,
+)
+
+
+# Task fields whose changes are written to task_history
+TRACKED_FIELDS = (
+    'sprint_id',
+    'status_id',
+    'estimated_hours',
+    'actual_hours',
+    'progress_percentage',
+)
+
+# Burndown counters that a single task contributes to
+BURNDOWN_FIELDS = (
+    'scope_hours',
+    'remaining_hours',
+    'completed_hours',
+    'tasks_total',
+    'tasks_done',
+)
+
+
+class SprintAnalyticsService:
+    """Service class for sprint burndown and velocity analytics"""
+
+    DONE_STATUS_KEY = 'done'
+    DEFAULT_VELOCITY_WINDOW = 3
+
+    _done_status_id: Optional[int] = None
+
+    @staticmethod
+    def get_done_status_id(db: Session) -> Optional[int]:
+        """Resolve (and cache) the id of the 'done' task status"""
+        if SprintAnalyticsService._done_status_id is None:
+            done = db.query(TaskStatus.id).filter(
+                TaskStatus.key == SprintAnalyticsService.DONE_STATUS_KEY
+            ).scalar()
+            SprintAnalyticsService._done_status_id = done
+        return SprintAnalyticsService._done_status_id
+
+    @staticmethod
+    def snapshot_task(task: Optional[Task]) -> Optional[Dict]:
+        """Capture the tracked fields of a task before it is modified"""
+        if task is None:
+            return None
+        return {field: getattr(task, field) for field in TRACKED_FIELDS}
+
+    @staticmethod
+    def normalize_value(value) -> Optional[str]:
+        """Normalize a tracked value for comparison and storage in task_history"""
+        if value is None:
+            return None
+        if isinstance(value, int):
+            return str(value)
+        try:
+            return f"{float(value):g}"
+        except (TypeError, ValueError):
+            return str(value)
+
+    @staticmethod
+    def contribution(state: Optional[Dict], done_status_id: Optional[int]) -> Dict[str, float]:
+        """Compute what a single task state contributes to its sprint's burndown"""
+        if not state or not state.get('sprint_id'):
+            return {field: 0 for field in BURNDOWN_FIELDS}
+
+        estimate = float(state.get('estimated_hours') or 0)
+        is_done = done_status_id is not None and state.get('status_id') == done_status_id
+        progress = min(max(state.get('progress_percentage') or 0, 0), 100)
+
+        return {
+            'scope_hours': estimate,
+            'remaining_hours': 0.0 if is_done else estimate * (100 - progress) / 100,
+            'completed_hours': estimate if is_done else 0.0,
+            'tasks_total': 1,
+            'tasks_done': 1 if is_done else 0,
+        }
+
+    @staticmethod
+    def compute_baseline(
+        sprint_id: int,
+        db: Session,
+        exclude_task_id: Optional[int] = None
+    ) -> Dict[str, float]:
+        """
+        Compute burndown counters for a sprint from its tasks.
+        Only used once per sprint, to seed the first burndown row.
+        Column queries read committed rows, never pending in-memory changes.
+        """
+        done_status_id = SprintAnalyticsService.get_done_status_id(db)
+        query = db.query(
+            Task.sprint_id,
+            Task.status_id,
+            Task.estimated_hours,
+            Task.progress_percentage
+        ).filter(Task.sprint_id == sprint_id)
+        if exclude_task_id:
+            query = query.filter(Task.id != exclude_task_id)
+
+        totals = {field: 0 for field in BURNDOWN_FIELDS}
+        for row in query.all():
+            state = {
+                'sprint_id': row.sprint_id,
+                'status_id': row.status_id,
+                'estimated_hours': row.estimated_hours,
+                'progress_percentage': row.progress_percentage,
+            }
+            for field, value in SprintAnalyticsService.contribution(state, done_status_id).items():
+                totals[field] += value
+        return totals
+
+    @staticmethod
+    def get_or_open_day(
+        sprint_id: int,
+        day: date,
+        db: Session,
+        exclude_task_id: Optional[int] = None,
+        before: Optional[Dict] = None
+    ) -> SprintBurndown:
+        """
+        Get the burndown row for a sprint and day, opening it if needed.
+        A new row carries forward the most recent earlier row; the very first
+        row of a sprint is seeded from a one-off baseline scan, which also
+        resets the sprint's velocity to the hours completed so far.
+        """
+        row = db.query(SprintBurndown).filter(
+            SprintBurndown.sprint_id == sprint_id,
+            SprintBurndown.snapshot_date == day
+        ).first()
+        if row:
+            return row
+
+        previous = db.query(SprintBurndown).filter(
+            SprintBurndown.sprint_id == sprint_id,
+            SprintBurndown.snapshot_date < day
+        ).order_by(SprintBurndown.snapshot_date.desc()).first()
+
+        if previous:
+            counters = {field: getattr(previous, field) for field in BURNDOWN_FIELDS}
+        else:
+            counters = SprintAnalyticsService.compute_baseline(sprint_id, db, exclude_task_id)
+            # The baseline skipped the task being changed; add back its old state
+            if before and before.get('sprint_id') == sprint_id:
+                done_status_id = SprintAnalyticsService.get_done_status_id(db)
+                for field, value in SprintAnalyticsService.contribution(before, done_status_id).items():
+                    counters[field] += value
+
+        row = SprintBurndown(sprint_id=sprint_id, snapshot_date=day, **counters)
+        try:
+            with db.begin_nested():
+                db.add(row)
+                if not previous:
+                    # Velocity only receives later deltas: start it from the hours already completed
+                    db.execute(
+                        update(Sprint)
+                        .where(Sprint.id == sprint_id)
+                        .values(velocity_points=round(counters['completed_hours'], 2))
+                        .execution_options(synchronize_session='fetch')
+                    )
+        except IntegrityError:
+            # A concurrent first write of the day opened the row; a locking
+            # read sees it even if this transaction's snapshot predates it
+            row = db.query(SprintBurndown).filter(
+                SprintBurndown.sprint_id == sprint_id,
+                SprintBurndown.snapshot_date == day
+            ).with_for_update().one()
+        return row
+
+    @staticmethod
+    def apply_delta(
+        sprint_id: int,
+        delta: Dict[str, float],
+        db: Session,
+        exclude_task_id: Optional[int] = None,
+        before: Optional[Dict] = None
+    ) -> None:
+        """Apply a burndown delta to today's row and to the sprint's velocity"""
+        if not any(delta.values()):
+            return
+
+        today = date.today()
+        SprintAnalyticsService.get_or_open_day(
+            sprint_id, today, db, exclude_task_id=exclude_task_id, before=before
+        )
+        # Increment in SQL so that concurrent changes of one sprint never lose a delta
+        db.execute(
+            update(SprintBurndown)
+            .where(SprintBurndown.sprint_id == sprint_id, SprintBurndown.snapshot_date == today)
+            .values({
+                field: getattr(SprintBurndown, field) + (int(value) if field.startswith('tasks_') else round(value, 2))
+                for field, value in delta.items()
+                if value
+            })
+            .execution_options(synchronize_session='fetch')
+        )
+
+        if delta.get('completed_hours'):
+            db.execute(
+                update(Sprint)
+                .where(Sprint.id == sprint_id)
+                .values(velocity_points=Sprint.velocity_points + round(delta['completed_hours'], 2))
+                .execution_options(synchronize_session='fetch')
+            )
+
+    @staticmethod
+    def record_task_change(
+        task_id: int,
+        before: Optional[Dict],
+        after: Optional[Dict],
+        db: Session,
+        changed_by: Optional[int] = None
+    ) -> None:
+        """
+        Record a task change in task_history and update sprint analytics.
+        `before` is None for created tasks, `after` is None for deleted tasks.
+        Must be called before the surrounding commit so everything lands atomically.
+        """
+        # Change log
+        sprint_id = (after or before or {}).get('sprint_id')
+        if before is None:
+            db.add(TaskHistory(task_id=task_id, sprint_id=sprint_id, field_name='created', changed_by=changed_by))
+        elif after is None:
+            db.add(TaskHistory(task_id=task_id, sprint_id=sprint_id, field_name='deleted', changed_by=changed_by))
+        else:
+            for field in TRACKED_FIELDS:
+                old_value = SprintAnalyticsService.normalize_value(before.get(field))
+                new_value = SprintAnalyticsService.normalize_value(after.get(field))
+                if old_value != new_value:
+                    db.add(TaskHistory(
+                        task_id=task_id,
+                        sprint_id=sprint_id,
+                        field_name=field,
+                        old_value=old_value,
+                        new_value=new_value,
+                        changed_by=changed_by
+                    ))
+
+        # Burndown and velocity
+        done_status_id = SprintAnalyticsService.get_done_status_id(db)
+        old_contribution = SprintAnalyticsService.contribution(before, done_status_id)
+        new_contribution = SprintAnalyticsService.contribution(after, done_status_id)
+        old_sprint = (before or {}).get('sprint_id')
+        new_sprint = (after or {}).get('sprint_id')
+
+        if old_sprint and old_sprint == new_sprint:
+            delta = {f: new_contribution[f] - old_contribution[f] for f in BURNDOWN_FIELDS}
+            SprintAnalyticsService.apply_delta(old_sprint, delta, db, exclude_task_id=task_id, before=before)
+            return
+
+        if old_sprint:
+            delta = {f: -old_contribution[f] for f in BURNDOWN_FIELDS}
+            SprintAnalyticsService.apply_delta(old_sprint, delta, db, exclude_task_id=task_id, before=before)
+        if new_sprint:
+            SprintAnalyticsService.apply_delta(new_sprint, new_contribution, db, exclude_task_id=task_id, before=before)
+
+    @staticmethod
+    def get_sprint_by_id(sprint_id: int, db: Session) -> Sprint:
+        """Get a sprint by ID, raising HTTPException if not found"""
+        sprint = db.query(Sprint).filter(Sprint.id == sprint_id).first()
+        if not sprint:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Sprint not found"
+            )
+        return sprint
+
+    @staticmethod
+    def seed_burndown(sprint_id: int, day: date) -> Tuple[SprintBurndown, float]:
+        """
+        Open a sprint's first burndown row on a session of its own, keeping
+        reads free of writes. Returns the row and the sprint's seeded velocity.
+        """
+        database_connection.ensure_engine()
+        db = database_connection.SessionLocal()
+        try:
+            row = SprintAnalyticsService.get_or_open_day(sprint_id, day, db)
+            db.commit()
+            db.refresh(row)
+            db.expunge(row)
+            velocity = db.query(Sprint.velocity_points).filter(Sprint.id == sprint_id).scalar()
+            return row, float(velocity or 0)
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    @staticmethod
+    def get_burndown(sprint_id: int, db: Session) -> SprintBurndownResponse:
+        """Build the daily burndown series for a sprint from precomputed rows"""
+        sprint = SprintAnalyticsService.get_sprint_by_id(sprint_id, db)
+        today = date.today()
+        last_day = min(sprint.end_date, today)
+        velocity_points = float(sprint.velocity_points or 0)
+
+        rows = db.query(SprintBurndown).filter(
+            SprintBurndown.sprint_id == sprint_id,
+            SprintBurndown.snapshot_date <= last_day
+        ).order_by(SprintBurndown.snapshot_date.asc()).all()
+
+        if not rows and sprint.start_date <= today:
+            # Sprint predates the analytics engine: seed it once
+            seeded, velocity_points = SprintAnalyticsService.seed_burndown(sprint_id, last_day)
+            rows = [seeded]
+
+        points: List[BurndownPoint] = []
+        carried = None
+        index = 0
+        day = sprint.start_date
+        while day <= last_day:
+            while index < len(rows) and rows[index].snapshot_date <= day:
+                carried = rows[index]
+                index += 1
+            if carried is None and rows:
+                # No snapshot yet on this day: nothing had changed since sprint start
+                carried = rows[0]
+            if carried is not None:
+                points.append(BurndownPoint(
+                    date=day,
+                    scope_hours=float(carried.scope_hours or 0),
+                    remaining_hours=float(carried.remaining_hours or 0),
+                    completed_hours=float(carried.completed_hours or 0),
+                    tasks_total=carried.tasks_total or 0,
+                    tasks_done=carried.tasks_done or 0
+                ))
+            day += timedelta(days=1)
+
+        # Ideal line: straight from the initial scope down to zero at sprint end
+        if points:
+            total_days = max((sprint.end_date - sprint.start_date).days, 1)
+            initial_scope = points[0].scope_hours
+            for point in points:
+                elapsed = (point.date - sprint.start_date).days
+                point.ideal_remaining_hours = round(initial_scope * (1 - elapsed / total_days), 2)
+
+        return SprintBurndownResponse(
+            sprint_id=sprint.id,
+            sprint_name=sprint.name,
+            start_date=sprint.start_date,
+            end_date=sprint.end_date,
+            capacity_hours=float(sprint.capacity_hours or 0),
+            velocity_points=velocity_points,
+            points=points
+        )
+
+    @staticmethod
+    def get_project_velocity(
+        project_id: int,
+        db: Session,
+        window: int = DEFAULT_VELOCITY_WINDOW
+    ) -> ProjectVelocityResponse:
+        """Rolling velocity across a project's sprints, read from precomputed sprint totals"""
+        project = db.query(Project.id).filter(Project.id == project_id).first()
+        if not project:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Project not found"
+            )
+
+        window = max(window, 1)
+        sprints = db.query(
+            Sprint.id,
+            Sprint.name,
+            Sprint.start_date,
+            Sprint.end_date,
+            Sprint.capacity_hours,
+            Sprint.velocity_points
+        ).filter(Sprint.project_id == project_id).order_by(Sprint.start_date.asc()).all()
+
+        entries: List[SprintVelocityEntry] = []
+        velocities: List[float] = []
+        for sprint in sprints:
+            velocity = float(sprint.velocity_points or 0)
+            velocities.append(velocity)
+            recent = velocities[-window:]
+            entries.append(SprintVelocityEntry(
+                sprint_id=sprint.id,
+                sprint_name=sprint.name,
+                start_date=sprint.start_date,
+                end_date=sprint.end_date,
+                capacity_hours=float(sprint.capacity_hours or 0),
+                velocity_points=velocity,
+                rolling_velocity=round(sum(recent) / len(recent), 2)
+            ))
+
+        # Average over the last `window` sprints that have already finished
+        today = date.today()
+        finished = [e.velocity_points for e in entries if e.end_date < today][-window:]
+        average_velocity = round(sum(finished) / len(finished), 2) if finished else 0
+
+        return ProjectVelocityResponse(
+            project_id=project_id,
+            window=window,
+            average_velocity=average_velocity,
+            sprints=entries
+        )
@@ -0,0 +1,185 @@
+"""
+Sync Service - Delta sync of tasks, projects, sprints and documents.
+Each resource is read with a keyset range scan on (updated_at, id), so the
+cost of a sync is proportional to what changed, not to the dataset size.
+Deletions are recorded as tombstones in the same transaction as the delete;
+a task moved to another project leaves a tombstone in the project it left.
+"""
+from sqlalchemy.orm import Session
+from sqlalchemy import select, func, tuple_, and_
+from typing import Optional, Dict, List, Tuple
+from datetime import datetime, timedelta
+import base64
+import json
+import os
+import time
+from fastapi import HTTPException, status
+
+from models.task import Task
+from models.project import Project, Sprint
+from models.document import Document
+from models.sync import SyncTombstone
+from schemas.sync import SyncResponse, SyncTombstoneResponse
+
+
+# Resource name -> (model, excluded columns)
+SYNC_RESOURCES = {
+    'tasks': (Task, {'import_job_id'}),
+    'projects': (Project, set()),
+    'sprints': (Sprint, set()),
+    'documents': (Document, {'extracted_text', 'file_path'}),
+}
+
+SYNC_EPOCH = datetime(1970, 1, 1)
+
+
+class SyncService:
+    """Service class for delta sync"""
+
+    # Configuration (overridable through the environment)
+    # Rows committed later than their updated_at by up to this much are still picked up
+    SAFETY_SECONDS = int(os.getenv("SYNC_SAFETY_SECONDS", "5"))
+    TOMBSTONE_RETENTION_DAYS = int(os.getenv("SYNC_TOMBSTONE_RETENTION_DAYS", "30"))
+    DEFAULT_LIMIT = 500
+    PURGE_INTERVAL_SECONDS = 3600
+
+    _last_purge = 0.0
+
+    @staticmethod
+    def record_deletion(db: Session, resource_type: str, resource_id: int, project_id: Optional[int]) -> None:
+        """Add a tombstone; call before committing the delete so both land together"""
+        db.add(SyncTombstone(resource_type=resource_type, resource_id=resource_id, project_id=project_id))
+
+    @staticmethod
+    def encode_token(cursors: Dict[str, Tuple[datetime, int]]) -> str:
+        payload = {name: [ts.isoformat(), row_id] for name, (ts, row_id) in cursors.items()}
+        return base64.urlsafe_b64encode(json.dumps(payload, separators=(',', ':')).encode()).decode().rstrip('=')
+
+    @staticmethod
+    def decode_token(token: str) -> Dict[str, Tuple[datetime, int]]:
+        try:
+            padded = token + '=' * (-len(token) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            return {name: (datetime.fromisoformat(ts), int(row_id)) for name, (ts, row_id) in payload.items()}
+        except (ValueError, TypeError, json.JSONDecodeError):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid sync token"
+            )
+
+    @staticmethod
+    def get_db_now(db: Session) -> datetime:
+        """Database clock (updated_at is stamped by the database, not by this process)"""
+        now = db.execute(select(func.now())).scalar()
+        if isinstance(now, str):
+            now = datetime.fromisoformat(now)
+        return now.replace(tzinfo=None, microsecond=0)
+
+    @staticmethod
+    def scan(
+        db: Session,
+        model,
+        timestamp_column,
+        cursor: Tuple[datetime, int],
+        limit: int,
+        project_id: Optional[int],
+        excluded: set = frozenset()
+    ) -> List[Dict]:
+        """Keyset range scan: rows with (timestamp, id) > cursor, oldest first"""
+        columns = [column for column in model.__table__.columns if column.key not in excluded]
+        query = select(*columns).where(
+            tuple_(timestamp_column, model.id) > tuple_(cursor[0], cursor[1])
+        ).order_by(timestamp_column, model.id).limit(limit + 1)
+        if project_id is not None:
+            scope_column = model.id if model is Project else model.project_id
+            query = query.where(scope_column == project_id)
+        return [dict(row) for row in db.execute(query).mappings().all()]
+
+    @staticmethod
+    def purge_tombstones(db: Session) -> int:
+        """Delete tombstones older than the retention window"""
+        horizon = SyncService.get_db_now(db) - timedelta(days=SyncService.TOMBSTONE_RETENTION_DAYS)
+        deleted = db.query(SyncTombstone).filter(SyncTombstone.deleted_at < horizon).delete(synchronize_session=False)
+        db.commit()
+        return deleted
+
+    @staticmethod
+    def maybe_purge_tombstones(db: Session) -> None:
+        if time.monotonic() - SyncService._last_purge < SyncService.PURGE_INTERVAL_SECONDS:
+            return
+        SyncService._last_purge = time.monotonic()
+        SyncService.purge_tombstones(db)
+
+    @staticmethod
+    def get_changes(
+        db: Session,
+        since: Optional[str] = None,
+        project_id: Optional[int] = None,
+        limit: int = DEFAULT_LIMIT
+    ) -> SyncResponse:
+        """
+        Return rows changed and deleted after the watermark in `since`
+        (everything when omitted), at most `limit` rows per resource.
+        Rows may be repeated across calls near the watermark; clients upsert by id.
+        """
+        cursors = SyncService.decode_token(since) if since else {}
+        SyncService.maybe_purge_tombstones(db)
+
+        now = SyncService.get_db_now(db)
+        if cursors:
+            # Only the tombstone cursor matters here: row cursors of a paged
+            # sync may legitimately point at rows older than the horizon
+            horizon = now - timedelta(days=SyncService.TOMBSTONE_RETENTION_DAYS)
+            if 'deleted' not in cursors or cursors['deleted'][0] < horizon:
+                # Deletions older than the horizon may have been purged
+                return SyncResponse(reset_required=True, server_time=now)
+
+        safe_cursor = (now - timedelta(seconds=SyncService.SAFETY_SECONDS), 0)
+        next_cursors: Dict[str, Tuple[datetime, int]] = {}
+        results: Dict[str, List[Dict]] = {}
+        has_more = False
+
+        for name, (model, excluded) in SYNC_RESOURCES.items():
+            cursor = cursors.get(name, (SYNC_EPOCH, 0))
+            rows = SyncService.scan(db, model, model.updated_at, cursor, limit, project_id, excluded)
+            if len(rows) > limit:
+                rows = rows[:limit]
+                next_cursors[name] = (rows[-1]['updated_at'], rows[-1]['id'])
+                has_more = True
+            else:
+                next_cursors[name] = safe_cursor
+            results[name] = rows
+
+        # A full sync has nothing to delete yet: it only needs the deletions
+        # made while it pages through the rows
+        cursor = cursors.get('deleted', safe_cursor)
+        tombstone_query = select(SyncTombstone).where(
+            tuple_(SyncTombstone.deleted_at, SyncTombstone.id) > tuple_(cursor[0], cursor[1])
+        ).order_by(SyncTombstone.deleted_at, SyncTombstone.id).limit(limit + 1)
+        live_task = select(Task.id).where(Task.id == SyncTombstone.resource_id)
+        if project_id is not None:
+            tombstone_query = tombstone_query.where(SyncTombstone.project_id == project_id)
+            live_task = live_task.where(Task.project_id == project_id)
+        # A move tombstone is not a deletion for clients that still see the
+        # task (unscoped syncs, or the task has moved back into the project)
+        tombstone_query = tombstone_query.where(
+            ~and_(SyncTombstone.resource_type == 'task', live_task.exists())
+        )
+        tombstones = db.execute(tombstone_query).scalars().all()
+        if len(tombstones) > limit:
+            tombstones = tombstones[:limit]
+            next_cursors['deleted'] = (tombstones[-1].deleted_at, tombstones[-1].id)
+            has_more = True
+        else:
+            next_cursors['deleted'] = safe_cursor
+
+        return SyncResponse(
+            next_token=SyncService.encode_token(next_cursors),
+            has_more=has_more,
+            server_time=now,
+            tasks=results['tasks'],
+            projects=results['projects'],
+            sprints=results['sprints'],
+            documents=results['documents'],
+            deleted=[SyncTombstoneResponse.model_validate(t) for t in tombstones]
+        )
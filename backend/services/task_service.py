@@ -1,17 +1,55 @@
 
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session, joinedload, load_only
 from sqlalchemy import func
-from typing import Optional, List
+from typing import Optional, List, Dict, Set, Any
 from fastapi import HTTPException, status
 
 from models.task import Task, TaskStatus, TaskPriority, TaskType, TaskAssignee, TaskLink, Comment
 from models.project import Project, Sprint
 from models.user import User
 from schemas.task import TaskCreate, TaskUpdate, TaskResponse, TaskAssigneeResponse
+from services.sprint_analytics_service import SprintAnalyticsService
+from services.dependency_service import DependencyService
+from services.calendar_service import CalendarService
+from services.audit_service import AuditService
+from services.event_service import EventService
+from services.sync_service import SyncService
+from serialization import resolve_sources
 
 
 class TaskService:
     """Service class for task business logic"""
+
+    # TaskResponse field -> (Task columns it reads, relationship to eager-load), for ?fields=
+    RESPONSE_FIELD_SOURCES = {
+        'id': ((Task.id,), None),
+        'title': ((Task.title,), None),
+        'description': ((Task.description,), None),
+        'project_id': ((Task.project_id,), None),
+        'project_name': ((Task.project_id,), None),
+        'sprint_id': ((Task.sprint_id,), None),
+        'sprint_name': ((Task.sprint_id,), None),
+        'status_key': ((Task.status_id,), Task.status),
+        'status_name': ((Task.status_id,), Task.status),
+        'priority_key': ((Task.priority_id,), Task.priority),
+        'priority_name': ((Task.priority_id,), Task.priority),
+        'task_type_key': ((Task.task_type_id,), Task.task_type),
+        'task_type_name': ((Task.task_type_id,), Task.task_type),
+        'assignee_id': ((Task.assignee_id,), None),
+        'reviewer_id': ((Task.reviewer_id,), None),
+        'reviewer_name': ((Task.reviewer_id,), None),
+        'assignees': ((), None),
+        'links_count': ((), None),
+        'comments_count': ((), None),
+        'due_date': ((Task.due_date,), None),
+        'estimated_hours': ((Task.estimated_hours,), None),
+        'actual_hours': ((Task.actual_hours,), None),
+        'progress_percentage': ((Task.progress_percentage,), None),
+        'created_by': ((Task.created_by,), None),
+        'creator_name': ((Task.created_by,), None),
+        'created_at': ((Task.created_at,), None),
+        'updated_at': ((Task.updated_at,), None),
+    }
     
     @staticmethod
     def build_task_response(task: Task, db: Session) -> TaskResponse:
@@ -85,6 +123,90 @@ class TaskService:
             updated_at=task.updated_at
         )
     
+    @staticmethod
+    def build_task_field_rows(tasks: List[Task], db: Session, fields: Set[str]) -> List[Dict[str, Any]]:
+        """
+        Build TaskResponse-shaped dicts holding only the requested fields.
+        Names, counts and assignees are resolved with one query each, and only when requested.
+        """
+        task_ids = [task.id for task in tasks]
+
+        def user_names(user_ids) -> Dict[int, str]:
+            user_ids = {user_id for user_id in user_ids if user_id}
+            if not user_ids:
+                return {}
+            return {
+                row.id: f"{row.first_name} {row.last_name}"
+                for row in db.query(User.id, User.first_name, User.last_name).filter(User.id.in_(user_ids))
+            }
+
+        project_names, sprint_names, reviewer_names, creator_names = {}, {}, {}, {}
+        if 'project_name' in fields:
+            project_ids = {task.project_id for task in tasks if task.project_id}
+            if project_ids:
+                project_names = dict(db.query(Project.id, Project.name).filter(Project.id.in_(project_ids)).all())
+        if 'sprint_name' in fields:
+            sprint_ids = {task.sprint_id for task in tasks if task.sprint_id}
+            if sprint_ids:
+                sprint_names = dict(db.query(Sprint.id, Sprint.name).filter(Sprint.id.in_(sprint_ids)).all())
+        if 'reviewer_name' in fields:
+            reviewer_names = user_names(task.reviewer_id for task in tasks)
+        if 'creator_name' in fields:
+            creator_names = user_names(task.created_by for task in tasks)
+
+        links_counts, comments_counts = {}, {}
+        if 'links_count' in fields and task_ids:
+            links_counts = dict(db.query(TaskLink.task_id, func.count(TaskLink.id)).filter(
+                TaskLink.task_id.in_(task_ids)
+            ).group_by(TaskLink.task_id).all())
+        if 'comments_count' in fields and task_ids:
+            comments_counts = dict(db.query(Comment.task_id, func.count(Comment.id)).filter(
+                Comment.task_id.in_(task_ids)
+            ).group_by(Comment.task_id).all())
+
+        assignees: Dict[int, List[Dict[str, Any]]] = {}
+        if 'assignees' in fields and task_ids:
+            rows = db.query(
+                TaskAssignee.id, TaskAssignee.task_id, TaskAssignee.user_id, TaskAssignee.assigned_at,
+                User.first_name, User.last_name, User.email
+            ).outerjoin(User, User.id == TaskAssignee.user_id).filter(
+                TaskAssignee.task_id.in_(task_ids)
+            ).order_by(TaskAssignee.id).all()
+            for row in rows:
+                assignees.setdefault(row.task_id, []).append({
+                    'id': row.id,
+                    'user_id': row.user_id,
+                    'user_name': f"{row.first_name} {row.last_name}" if row.email else None,
+                    'user_email': row.email,
+                    'assigned_at': row.assigned_at,
+                })
+
+        computed = {
+            'project_name': lambda task: project_names.get(task.project_id),
+            'sprint_name': lambda task: sprint_names.get(task.sprint_id),
+            'status_key': lambda task: task.status.key if task.status else None,
+            'status_name': lambda task: task.status.name if task.status else None,
+            'priority_key': lambda task: task.priority.key if task.priority else None,
+            'priority_name': lambda task: task.priority.name if task.priority else None,
+            'task_type_key': lambda task: task.task_type.key if task.task_type else None,
+            'task_type_name': lambda task: task.task_type.name if task.task_type else None,
+            'reviewer_name': lambda task: reviewer_names.get(task.reviewer_id),
+            'creator_name': lambda task: creator_names.get(task.created_by),
+            'assignees': lambda task: assignees.get(task.id, []),
+            'links_count': lambda task: links_counts.get(task.id, 0),
+            'comments_count': lambda task: comments_counts.get(task.id, 0),
+            'estimated_hours': lambda task: float(task.estimated_hours) if task.estimated_hours else None,
+            'actual_hours': lambda task: float(task.actual_hours) if task.actual_hours else None,
+            'progress_percentage': lambda task: task.progress_percentage or 0,
+        }
+        return [
+            {
+                name: computed[name](task) if name in computed else getattr(task, name)
+                for name in fields
+            }
+            for task in tasks
+        ]
+    
     @staticmethod
     def get_task_by_id(task_id: int, db: Session) -> Task:
         """Get a task by ID, raising HTTPException if not found"""
@@ -112,14 +234,22 @@ class TaskService:
         task_type_key: Optional[str] = None,
         assignee_id: Optional[int] = None,
         skip: int = 0,
-        limit: int = 100
+        limit: int = 100,
+        fields: Optional[Set[str]] = None
     ) -> List[Task]:
-        """List tasks with optional filtering"""
-        query = db.query(Task).options(
-            joinedload(Task.status),
-            joinedload(Task.priority),
-            joinedload(Task.task_type)
-        )
+        """List tasks with optional filtering (loading only what `fields` needs, when given)"""
+        if fields is None:
+            query = db.query(Task).options(
+                joinedload(Task.status),
+                joinedload(Task.priority),
+                joinedload(Task.task_type)
+            )
+        else:
+            columns, relationships = resolve_sources(fields, TaskService.RESPONSE_FIELD_SOURCES)
+            query = db.query(Task).options(
+                load_only(*columns),
+                *[joinedload(relationship) for relationship in relationships]
+            )
         
         if project_id:
             query = query.filter(Task.project_id == project_id)
@@ -252,6 +382,7 @@ class TaskService:
         db.add(task)
         db.commit()
         db.refresh(task)
+        created_values = AuditService.snapshot(task)
         
         # Add assignees
         if payload.assignee_ids:
@@ -264,7 +395,18 @@ class TaskService:
                         assigned_by=payload.created_by
                     )
                     db.add(task_assignee)
-            db.commit()
+        
+        # Record history and update sprint analytics
+        SprintAnalyticsService.record_task_change(
+            task.id, None, SprintAnalyticsService.snapshot_task(task), db, changed_by=payload.created_by
+        )
+        db.commit()
+        DependencyService.invalidate_project(task.project_id)
+        CalendarService.invalidate_project(task.project_id)
+        AuditService.record(
+            "task.create", "task", task.id, new_values=created_values, user_id=payload.created_by
+        )
+        EventService.publish("task.created", "task", task.id, task.project_id, created_values)
         
         # Reload with relationships
         return db.query(Task).options(
@@ -278,6 +420,9 @@ class TaskService:
     def update_task(task_id: int, payload: TaskUpdate, db: Session) -> Task:
         """Update a task with validation"""
         task = TaskService.get_task_by_id(task_id, db)
+        before = SprintAnalyticsService.snapshot_task(task)
+        audit_before = AuditService.snapshot(task)
+        previous_project_id = task.project_id
         
         # Update basic fields
         if payload.title is not None:
@@ -342,8 +487,28 @@ class TaskService:
             
             task.assignee_id = payload.assignee_ids[0] if payload.assignee_ids and len(payload.assignee_ids) > 0 else None
         
+        # Record history and update sprint analytics
+        SprintAnalyticsService.record_task_change(
+            task.id, before, SprintAnalyticsService.snapshot_task(task), db
+        )
+        audit_after = AuditService.snapshot(task)
+        if previous_project_id is not None and task.project_id != previous_project_id:
+            # The task left its project: clients syncing that project must drop it
+            SyncService.record_deletion(db, "task", task.id, previous_project_id)
+        
         db.commit()
         db.refresh(task)
+        DependencyService.invalidate_project(previous_project_id)
+        DependencyService.invalidate_project(task.project_id)
+        CalendarService.invalidate_project(previous_project_id)
+        CalendarService.invalidate_project(task.project_id)
+        AuditService.record_update("task", task_id, audit_before, audit_after)
+        changes = AuditService.diff(audit_before, audit_after)[1]
+        if changes:
+            EventService.publish(
+                "task.updated", "task", task_id, task.project_id, changes,
+                previous_project_id=previous_project_id
+            )
         
         # Reload with relationships
         return db.query(Task).options(
@@ -357,8 +522,18 @@ class TaskService:
     def delete_task(task_id: int, db: Session) -> None:
         """Delete a task"""
         task = TaskService.get_task_by_id(task_id, db)
+        SprintAnalyticsService.record_task_change(
+            task.id, SprintAnalyticsService.snapshot_task(task), None, db
+        )
+        project_id = task.project_id
+        audit_before = AuditService.snapshot(task)
         db.delete(task)
+        SyncService.record_deletion(db, "task", task_id, project_id)
         db.commit()
+        DependencyService.invalidate_project(project_id)
+        CalendarService.invalidate_project(project_id)
+        AuditService.record_delete("task", task_id, audit_before)
+        EventService.publish("task.deleted", "task", task_id, project_id)
     
     @staticmethod
     def get_task_statuses(db: Session) -> List[dict]:
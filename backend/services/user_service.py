@@ -1,5 +1,5 @@
-from sqlalchemy.orm import Session, joinedload
-from typing import Optional, List
+from sqlalchemy.orm import Session, joinedload, load_only
+from typing import Optional, List, Dict, Set, Any
 from fastapi import HTTPException, status
 from pydantic import EmailStr
 
@@ -7,9 +7,30 @@ from models.user import User
 from models.role import Role
 from models.company import Company
 from schemas.user import UserCreate, UserUpdate, UserResponse, UserDetailResponse
+from services.audit_service import AuditService
+from services.session_service import SessionService
+from services.password_service import PasswordService
+from serialization import resolve_sources
 
 
-class UserService:    
+class UserService:
+    # UserDetailResponse field -> (User columns it reads, relationship to eager-load), for ?fields=
+    RESPONSE_FIELD_SOURCES = {
+        'id': ((User.id,), None),
+        'email': ((User.email,), None),
+        'first_name': ((User.first_name,), None),
+        'last_name': ((User.last_name,), None),
+        'role_key': ((User.role_id,), User.role),
+        'role_name': ((User.role_id,), User.role),
+        'avatar_url': ((User.avatar_url,), None),
+        'company_id': ((User.company_id,), None),
+        'is_active': ((User.is_active,), None),
+        'email_verified': ((User.email_verified,), None),
+        'last_login': ((User.last_login,), None),
+        'created_at': ((User.created_at,), None),
+        'updated_at': ((User.updated_at,), None),
+    }
+
     @staticmethod
     def validate_email_not_exists(email: str, db: Session, exclude_user_id: Optional[int] = None) -> None:
         query = db.query(User).filter(User.email == email)
@@ -60,9 +81,17 @@ class UserService:
         skip: int = 0,
         limit: int = 100,
         is_active: Optional[bool] = None,
-        role_key: Optional[str] = None
+        role_key: Optional[str] = None,
+        fields: Optional[Set[str]] = None
     ) -> List[User]:
-        query = db.query(User).options(joinedload(User.role))
+        if fields is None:
+            query = db.query(User).options(joinedload(User.role))
+        else:
+            columns, relationships = resolve_sources(fields, UserService.RESPONSE_FIELD_SOURCES)
+            query = db.query(User).options(
+                load_only(*columns),
+                *[joinedload(relationship) for relationship in relationships]
+            )
         
         if is_active is not None:
             query = query.filter(User.is_active == is_active)
@@ -116,6 +145,21 @@ class UserService:
             updated_at=user.updated_at
         )
     
+    @staticmethod
+    def build_user_field_rows(users: List[User], fields: Set[str]) -> List[Dict[str, Any]]:
+        """Build UserDetailResponse-shaped dicts holding only the requested fields"""
+        computed = {
+            'role_key': lambda user: user.role.role_key if user.role else None,
+            'role_name': lambda user: user.role.name if user.role else None,
+        }
+        return [
+            {
+                name: computed[name](user) if name in computed else getattr(user, name)
+                for name in fields
+            }
+            for user in users
+        ]
+    
     @staticmethod
     def build_user_response_with_company(user: User, db: Session) -> UserResponse:  
         role_key = user.role.role_key if user.role else 'other'
@@ -153,7 +197,7 @@ class UserService:
         
         user = User(
             email=payload.email,
-            password_hash=payload.password,  # TODO: Hash password
+            password_hash=PasswordService.hash_password(payload.password),
             first_name=payload.first_name,
             last_name=payload.last_name,
             role_id=role.id,
@@ -165,6 +209,7 @@ class UserService:
         db.add(user)
         db.commit()
         db.refresh(user)
+        AuditService.record_create("user", user)
         
         return db.query(User).options(joinedload(User.role)).filter(User.id == user.id).first()
     
@@ -172,12 +217,19 @@ class UserService:
     def authenticate_user(email: str, password: str, db: Session) -> User:
         user = UserService.get_user_by_email(email, db)
         
-        if user.password_hash != password:
+        matches, new_hash = PasswordService.verify_password(password, user.password_hash)
+        if not matches:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid credentials"
             )
         
+        # Upgrade legacy plaintext / outdated hashes on successful login
+        if new_hash:
+            user.password_hash = new_hash
+            db.commit()
+            db.refresh(user)
+        
         if not user.is_active:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -189,6 +241,7 @@ class UserService:
     @staticmethod
     def update_user(user_id: int, payload: UserUpdate, db: Session) -> User:
         user = UserService.get_user_by_id(user_id, db)
+        audit_before = AuditService.snapshot(user)
         
         if payload.first_name is not None:
             user.first_name = payload.first_name
@@ -209,8 +262,14 @@ class UserService:
             role = UserService.get_role_by_key(payload.role, db)
             user.role_id = role.id
         
+        audit_after = AuditService.snapshot(user)
         db.commit()
         db.refresh(user)
+        AuditService.record_update("user", user_id, audit_before, audit_after)
+        
+        # Deactivated users lose their sessions immediately
+        if payload.is_active is False:
+            SessionService.revoke_user_sessions(user_id, db)
         
         return db.query(User).options(joinedload(User.role)).filter(User.id == user_id).first()
 
@@ -0,0 +1,137 @@
+"""
+Startup helpers - router registry, lazy router loading and the startup report.
+
+In production mode (APP_MODE=production) main.py no longer imports the
+routers (and with them every service, schema, model and numpy) at import
+time: the server starts listening right away, the routers are imported on a
+background thread, and requests other than the health checks wait for them.
+The database pool is prewarmed concurrently on another thread.
+
+Every phase is timed into a StartupReport (logged once startup settles and
+served at /health/startup), including the import time of each router and the
+top-level packages it pulled in first, so cold-start regressions show up.
+"""
+from typing import List, Dict, Any, Iterable
+import importlib
+import logging
+import sys
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Router modules in include order (route matching follows this order)
+ROUTER_MODULES = (
+    "routes.users",
+    "routes.roles",
+    "routes.companies",
+    "routes.permissions",
+    "routes.role_permissions",
+    "routes.user_permissions",
+    "routes.tasks",
+    "routes.projects",
+    "routes.documents",
+    "routes.sprints",
+    "routes.analytics",
+    "routes.dependencies",
+    "routes.calendar",
+    "routes.comments",
+    "routes.auth",
+    "routes.stream",
+    "routes.sync",
+    "routes.imports",
+)
+
+
+class StartupReport:
+    """Timings of the startup phases, relative to the start of the main.py import"""
+
+    def __init__(self, started_at: float):
+        self.started_at = started_at
+        self.phases: List[Dict[str, Any]] = []
+        self.modules: List[Dict[str, Any]] = []
+        self.database = 'pending'  # pending, connected, unavailable
+        self._lock = threading.Lock()
+        self._logged = False
+
+    def record(self, name: str, seconds: float, **detail) -> None:
+        with self._lock:
+            self.phases.append({
+                'phase': name,
+                'ms': round(seconds * 1000, 1),
+                'finished_at_ms': round((time.perf_counter() - self.started_at) * 1000, 1),
+                **detail
+            })
+
+    def record_module(self, name: str, seconds: float, new_packages: List[str]) -> None:
+        with self._lock:
+            self.modules.append({'module': name, 'ms': round(seconds * 1000, 1), 'new_packages': new_packages})
+
+    def as_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'database': self.database,
+                'phases': list(self.phases),
+                'modules': sorted(self.modules, key=lambda entry: entry['ms'], reverse=True),
+            }
+
+    def log(self) -> None:
+        """Log the report once (phases and the slowest module imports)"""
+        with self._lock:
+            if self._logged:
+                return
+            self._logged = True
+        report = self.as_dict()
+        logger.info("Startup report: " + ", ".join(f"{phase['phase']} {phase['ms']}ms" for phase in report['phases']))
+        for entry in report['modules'][:5]:
+            packages = f" (first import of {', '.join(entry['new_packages'][:6])})" if entry['new_packages'] else ""
+            logger.info(f"   {entry['module']}: {entry['ms']}ms{packages}")
+
+
+def top_level_packages(module_names: Iterable[str]) -> List[str]:
+    """Top-level packages among newly imported modules, without the standard library"""
+    stdlib = getattr(sys, 'stdlib_module_names', frozenset())
+    return sorted({
+        name.split('.')[0] for name in module_names
+        if not name.startswith('_') and name.split('.')[0] not in stdlib
+    })
+
+
+class RouterLoader:
+    """Imports the router modules and includes them in the app, exactly once"""
+
+    def __init__(self, app, modules: Iterable[str], report: StartupReport):
+        self.app = app
+        self.modules = tuple(modules)
+        self.report = report
+        self.loaded = threading.Event()
+        self._included = set()
+        self._lock = threading.Lock()
+
+    def load(self) -> None:
+        """Import and include every router (blocks while another thread is loading)"""
+        if self.loaded.is_set():
+            return
+        with self._lock:
+            if self.loaded.is_set():
+                return
+            started = time.perf_counter()
+            try:
+                for name in self.modules:
+                    if name in self._included:
+                        continue  # Retrying after a failed import
+                    before = set(sys.modules)
+                    module_started = time.perf_counter()
+                    module = importlib.import_module(name)
+                    self.app.include_router(module.router)
+                    self._included.add(name)
+                    package = name.split('.')[0]
+                    self.report.record_module(
+                        name, time.perf_counter() - module_started,
+                        [new for new in top_level_packages(set(sys.modules) - before) if new != package]
+                    )
+            except BaseException as e:
+                logger.error(f"❌ Loading routers failed: {e}")
+                raise
+            self.report.record('routers', time.perf_counter() - started, count=len(self.modules))
+            self.loaded.set()
@@ -103,13 +103,15 @@ export const UserProvider: React.FC<UserProviderProps> = ({ children }) => {
   const login = async (email: string, password: string): Promise<{ success: boolean; error?: string }> => {
     // Try backend first
     try {
-      const url = new URL('http://localhost:8000/api/users/login');
-      url.searchParams.set('email', email);
-      url.searchParams.set('password', password);
-
-      const res = await fetch(url.toString(), { method: 'GET' });
+      // Credentials go in the request body, never in the URL
+      const res = await fetch('http://localhost:8000/api/auth/login', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ email, password }),
+      });
       if (res.ok) {
-        const u = await res.json();
+        const session = await res.json();
+        const u = session.user;
         // Map backend user to frontend User shape
         // Handle role_key from backend (from roles table) or role field
         const roleKey = u.role_key || u.role || 'other';
@@ -6,7 +6,7 @@ export type DocumentDto = {
   title: string;
   description: string | null;
   file_name: string;
-  file_path: string;
+  file_path: string | null;
   file_size: number;
   mime_type: string | null;
   project_id: number | null;